@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import deque
+
+
+class ActionDispatcher:
+    """Hilo que ejecuta las acciones del sistema fuera del bucle de frames
+
+    Las acciones (teclas multimedia, cambios de volumen) se encolan y se
+    ejecutan en orden en un hilo propio, así una llamada lenta al backend de
+    audio no congela el seguimiento de gestos. Los cambios de volumen se
+    combinan: solo se aplica el último valor pendiente y se omite si no cambió.
+
+    `observer(name, latency)` (opcional) se llama en el hilo de despacho tras
+    cada acción, con la latencia en segundos desde la petición. Si la acción
+    trae una traza (ActionTrace), se cierra con trace.finish(resultado).
+    """
+
+    def __init__(self, volume_control=None, observer=None):
+        self.volume_control = volume_control
+        self.observer = observer
+        self.commands = deque()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+
+        # Volumen pendiente (valor, momento de la petición, traza) y último valor aplicado
+        self.pending_volume = None
+        self.last_volume = None
+
+        # Estadísticas
+        self.dispatched = 0
+        self.coalesced = 0  # Cambios de volumen descartados por uno más nuevo o repetido
+        self.last_latency = 0.0  # Segundos desde la petición hasta terminar la acción
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def start(self):
+        """Arrancar el hilo de despacho"""
+        self.running = True
+        self.thread = threading.Thread(target=self._dispatch_loop, name="action-dispatcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def submit(self, name, func, *args, trace=None):
+        """Encolar una acción; se ejecuta func(*args) en el hilo de despacho"""
+        with self.condition:
+            self.commands.append((name, func, args, time.perf_counter(), trace))
+            self.condition.notify()
+
+    def set_volume(self, volume, trace=None):
+        """Pedir un cambio de volumen (gana el último valor, se omite si no cambió)"""
+        with self.condition:
+            pending = self.pending_volume
+            if pending is not None:
+                self.coalesced += 1  # Una de las dos peticiones no se ejecutará por separado
+                if pending[0] == volume:
+                    return
+
+            if volume == self.last_volume:
+                self.pending_volume = None
+                if pending is None:
+                    self.coalesced += 1
+                return
+
+            self.pending_volume = (volume, time.perf_counter(), trace)
+            self.condition.notify()
+
+    def queue_depth(self):
+        """Acciones pendientes de ejecutar"""
+        with self.condition:
+            return len(self.commands) + (1 if self.pending_volume is not None else 0)
+
+    def _next_command(self):
+        """Tomar la siguiente acción (las teclas primero, luego el volumen pendiente)"""
+        if self.commands:
+            return self.commands.popleft()
+
+        volume, requested_at, trace = self.pending_volume
+        self.pending_volume = None
+        self.last_volume = volume
+        return "volume", self.volume_control.set_volume, (volume,), requested_at, trace
+
+    def _dispatch_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.commands or self.pending_volume is not None or not self.running
+                )
+                if not self.running and not self.commands and self.pending_volume is None:
+                    return
+                name, func, args, requested_at, trace = self._next_command()
+
+            result = False
+            try:
+                result = func(*args)
+            except Exception as e:
+                print(f"❌ Error ejecutando acción {name}: {e}")
+            if trace is not None:
+                trace.finish(result)
+
+            latency = time.perf_counter() - requested_at
+            with self.condition:
+                self.dispatched += 1
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                self.total_latency += latency
+
+            if self.observer is not None:
+                self.observer(name, latency)
+
+    def stats(self):
+        """Profundidad de cola y latencias de despacho (en milisegundos)"""
+        with self.condition:
+            depth = len(self.commands) + (1 if self.pending_volume is not None else 0)
+            mean = self.total_latency / self.dispatched if self.dispatched else 0.0
+            return {
+                'queue_depth': depth,
+                'dispatched': self.dispatched,
+                'coalesced': self.coalesced,
+                'last_latency_ms': self.last_latency * 1000,
+                'mean_latency_ms': mean * 1000,
+                'max_latency_ms': self.max_latency * 1000,
+            }
+
+    def stop(self, timeout=2.0):
+        """Terminar las acciones pendientes y detener el hilo"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
@@ -0,0 +1,176 @@
+"""
+Trazas de latencia "glass-to-action" por acción
+
+Cada acción (volumen, teclas multimedia) lleva un registro con los instantes
+por los que pasó el frame que la disparó: captura, inferencia terminada,
+clasificación terminada, gesto estable (debounce satisfecho), acción
+encolada y acción enviada al sistema. También guarda el inicio del gesto
+(cuando empezó la palma o la racha de frames estables), así se separa el
+retardo intencional del debounce del costo real del pipeline.
+
+Los registros se escriben como JSON por línea y al salir se resumen con
+percentiles por acción. Para el resumen solo se guardan las últimas
+SUMMARY_WINDOW acciones de cada tipo, así la memoria no crece aunque el
+programa corra días en modo volumen.
+"""
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Tramos del resumen: (nombre, desde, hasta) sobre los campos *_ms del registro (relativos a la captura)
+SUMMARY_SPANS = (
+    ("debounce", "onset_ms", "capture_ms"),
+    ("inferencia", "capture_ms", "inference_ms"),
+    ("clasificacion", "inference_ms", "classified_ms"),
+    ("decision", "classified_ms", "stable_ms"),
+    ("despacho", "stable_ms", "sent_ms"),
+    ("pipeline", "capture_ms", "sent_ms"),
+    ("total", "onset_ms", "sent_ms"),
+)
+
+# Acciones de cada tipo que se conservan para los percentiles del resumen
+SUMMARY_WINDOW = 1000
+
+
+class FrameTrace:
+    """Instantes (perf_counter) del frame en curso"""
+
+    __slots__ = ('frame_id', 'capture', 'inference_done', 'classified')
+
+    def __init__(self, frame_id, capture):
+        self.frame_id = frame_id
+        self.capture = capture
+        self.inference_done = capture
+        self.classified = capture
+
+
+class ActionTrace:
+    """Registro de una acción: instantes del frame que la disparó y de su ejecución"""
+
+    __slots__ = ('tracer', 'action', 'frame_id', 'onset', 'capture', 'inference_done',
+                 'classified', 'stable', 'submitted', 'sent', 'ok')
+
+    def __init__(self, tracer, action, frame, onset, stable, submitted):
+        self.tracer = tracer
+        self.action = action
+        self.frame_id = frame.frame_id
+        self.onset = onset
+        self.capture = frame.capture
+        self.inference_done = frame.inference_done
+        self.classified = frame.classified
+        self.stable = stable
+        self.submitted = submitted
+        self.sent = None
+        self.ok = None
+
+    def finish(self, ok=True):
+        """Marcar la acción como enviada (se llama en el hilo que la ejecutó)"""
+        self.sent = time.perf_counter()
+        self.ok = bool(ok) if ok is not None else True
+        self.tracer.complete(self)
+
+    def to_record(self):
+        """Registro para el log: instantes en ms relativos a la captura del frame"""
+        def ms(t):
+            return round((t - self.capture) * 1000.0, 3)
+
+        return {
+            "time": time.time(),
+            "action": self.action,
+            "frame": self.frame_id,
+            "ok": self.ok,
+            "onset_ms": ms(self.onset),
+            "capture_ms": 0.0,
+            "inference_ms": ms(self.inference_done),
+            "classified_ms": ms(self.classified),
+            "stable_ms": ms(self.stable),
+            "submitted_ms": ms(self.submitted),
+            "sent_ms": ms(self.sent),
+        }
+
+
+class ActionTracer:
+    """Arma las trazas de cada acción y las escribe a un log JSON por línea (opcional)
+
+    El bucle de frames llama begin_frame / mark_inference / mark_classified;
+    las acciones de los gestos llaman mark_stable(debounce) justo antes de disparar y
+    action(name) al encolar. El hilo que ejecuta la acción llama finish().
+    """
+
+    def __init__(self, path=None, window=SUMMARY_WINDOW):
+        self.path = path
+        self.log = open(path, "a") if path else None
+        self.lock = threading.Lock()
+        self.window = window
+        self.spans = {}    # acción -> deque con la duración (ms) de cada tramo de las últimas acciones
+        self.counts = {}   # acción -> acciones completadas en total
+        self.frame = FrameTrace(0, time.perf_counter())
+        self.pending_stable = None  # (instante, inicio del gesto) marcado en este frame
+
+    def begin_frame(self, frame_id, capture_time=None):
+        self.frame = FrameTrace(frame_id, time.perf_counter() if capture_time is None else capture_time)
+        self.pending_stable = None
+
+    def mark_inference(self):
+        self.frame.inference_done = time.perf_counter()
+
+    def mark_classified(self):
+        self.frame.classified = time.perf_counter()
+
+    def mark_stable(self, debounce=0.0):
+        """El debounce del gesto se cumplió en este frame; `debounce` = segundos desde que empezó el gesto"""
+        self.pending_stable = (time.perf_counter(), self.frame.capture - debounce)
+
+    def action(self, name):
+        """Nueva traza para una acción que se va a encolar"""
+        now = time.perf_counter()
+        stable, onset = self.pending_stable or (now, self.frame.capture)
+        return ActionTrace(self, name, self.frame, onset, stable, now)
+
+    def complete(self, trace):
+        record = trace.to_record()
+        spans = tuple(record[end] - record[start] for _, start, end in SUMMARY_SPANS)
+        with self.lock:
+            if trace.action not in self.spans:
+                self.spans[trace.action] = deque(maxlen=self.window)
+                self.counts[trace.action] = 0
+            self.spans[trace.action].append(spans)
+            self.counts[trace.action] += 1
+            if self.log is not None:
+                self.log.write(json.dumps(record) + "\n")
+                self.log.flush()
+
+    def summary(self):
+        """Percentiles (ms) de cada tramo sobre las últimas acciones, por acción"""
+        with self.lock:
+            windows = {action: np.array(spans, dtype=np.float64) for action, spans in self.spans.items()}
+            counts = dict(self.counts)
+
+        summary = {}
+        for action, values in sorted(windows.items()):
+            spans = {}
+            for column, (name, _, _) in enumerate(SUMMARY_SPANS):
+                p50, p90, p99 = np.percentile(values[:, column], (50, 90, 99))
+                spans[name] = {"p50": float(p50), "p90": float(p90), "p99": float(p99),
+                               "max": float(values[:, column].max())}
+            summary[action] = {"count": counts[action], "window": len(values), "spans": spans}
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("📊 Latencia por acción (ms, desde la captura del frame; debounce = desde el inicio del gesto):")
+        for action, data in summary.items():
+            print(f"   {action} ({data['count']} acciones; percentiles de las últimas {data['window']})")
+            for name, s in data["spans"].items():
+                print(f"      {name:<14} p50 {s['p50']:8.1f}   p90 {s['p90']:8.1f}   p99 {s['p99']:8.1f}   máx {s['max']:8.1f}")
+
+    def close(self):
+        with self.lock:
+            if self.log is not None:
+                self.log.close()
+                self.log = None
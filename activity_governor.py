@@ -0,0 +1,107 @@
+"""
+Gobernador de actividad: active, idle y sleep
+
+Casi todo el día nadie hace gestos. Sin manos a la vista durante IDLE_AFTER
+segundos el controlador pasa a idle (menos frames por segundo y menor
+resolución de inferencia); después de SLEEP_AFTER segundos pasa a sleep, donde
+los modelos solo corren si una comparación barata entre frames (64x36 en
+grises) detecta movimiento. En cuanto una mano aparece vuelve a active y el
+siguiente frame ya se procesa a frecuencia y resolución completas.
+
+Subir de estado es inmediato, pero bajar tiene histéresis: cada estado se
+mantiene al menos `min_hold` segundos desde que se entró en él. Una detección
+suelta en idle no hace oscilar la resolución de inferencia (640 <-> 320) cada
+pocos segundos.
+"""
+import cv2
+import numpy as np
+
+ACTIVE = "active"
+IDLE = "idle"
+SLEEP = "sleep"
+
+# Orden de los estados: subir (hacia active) es inmediato, bajar respeta `min_hold`
+LEVELS = {SLEEP: 0, IDLE: 1, ACTIVE: 2}
+
+# Tamaño de la imagen en grises del detector de movimiento y umbral de cambio por píxel (0-255)
+MOTION_SIZE = (64, 36)
+MOTION_PIXEL_THRESHOLD = 25
+
+
+class MotionDetector:
+    """Fracción de píxeles que cambiaron respecto al frame anterior, en buffers reutilizados"""
+
+    def __init__(self, min_fraction=0.01, size=MOTION_SIZE):
+        self.min_fraction = min_fraction
+        self.size = size
+        self.small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self.gray = np.empty((size[1], size[0]), dtype=np.uint8)
+        self.previous = np.empty_like(self.gray)
+        self.diff = np.empty_like(self.gray)
+        self.has_previous = False
+
+    def reset(self):
+        self.has_previous = False
+
+    def detect(self, frame):
+        """True si el frame cambió lo suficiente respecto al anterior"""
+        cv2.resize(frame, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        if not self.has_previous:
+            self.gray, self.previous = self.previous, self.gray
+            self.has_previous = True
+            return False
+
+        cv2.absdiff(self.gray, self.previous, dst=self.diff)
+        cv2.threshold(self.diff, MOTION_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self.diff)
+        changed = cv2.countNonZero(self.diff) / self.diff.size
+        self.gray, self.previous = self.previous, self.gray
+        return changed >= self.min_fraction
+
+
+class ActivityGovernor:
+    """Estado de actividad según cuánto tiempo lleva el controlador sin ver manos"""
+
+    def __init__(self, idle_after=3.0, sleep_after=30.0, motion_detector=None, min_hold=0.0):
+        self.idle_after = idle_after
+        self.sleep_after = sleep_after
+        self.min_hold = min_hold
+        self.motion_detector = motion_detector if motion_detector is not None else MotionDetector()
+        self.state = ACTIVE
+        self.last_hands_time = None
+        self.state_time = None  # Momento en que se entró al estado actual
+        self.skipped_frames = 0  # Frames de sleep sin movimiento (sin inferencia)
+
+    def needs_inference(self, frame):
+        """En sleep solo se ejecutan los modelos si hubo movimiento; en los otros estados siempre"""
+        if self.state != SLEEP:
+            return True
+        if self.motion_detector.detect(frame):
+            return True
+        self.skipped_frames += 1
+        return False
+
+    def update(self, hands_present, timestamp):
+        """Registrar el resultado del frame; devuelve True si cambió el estado"""
+        if hands_present or self.last_hands_time is None:
+            self.last_hands_time = timestamp
+        if self.state_time is None:
+            self.state_time = timestamp
+
+        elapsed = timestamp - self.last_hands_time
+        if elapsed >= self.sleep_after:
+            state = SLEEP
+        elif elapsed >= self.idle_after:
+            state = IDLE
+        else:
+            state = ACTIVE
+
+        if state == self.state:
+            return False
+        if LEVELS[state] < LEVELS[self.state] and timestamp - self.state_time < self.min_hold:
+            return False  # Bajar solo cuando el estado actual se sostuvo lo suficiente
+        if state == SLEEP:
+            self.motion_detector.reset()  # El primer frame de sleep solo sirve de referencia
+        self.state = state
+        self.state_time = timestamp
+        return True
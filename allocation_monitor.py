@@ -0,0 +1,78 @@
+"""
+Contador de memoria reservada por frame (modo debug)
+
+Usa tracemalloc, que también registra los buffers de numpy (y por lo tanto
+las imágenes que devuelve OpenCV). Por cada frame se mide el pico de memoria
+nueva respecto al inicio del frame: si el bucle reutiliza sus buffers el pico
+queda en unos pocos KB (objetos Python de los resultados de MediaPipe); una
+imagen nueva de 1280x720 aparece como ~2.7 MB.
+
+tracemalloc hace más lento todo el programa, por eso solo se activa con
+GestureConfig.DEBUG_ALLOCATIONS (o --debug-allocations).
+"""
+import tracemalloc
+
+import numpy as np
+
+# Reservas por frame a partir de este tamaño cuentan como "frame con reservas" (una imagen chica ya lo supera)
+LARGE_ALLOCATION_BYTES = 64 * 1024
+
+
+class AllocationMonitor:
+    """Pico de memoria reservada durante cada frame, ignorando los primeros `warmup` frames"""
+
+    def __init__(self, warmup=30, threshold=LARGE_ALLOCATION_BYTES):
+        self.warmup = warmup
+        self.threshold = threshold
+        self.frames = 0
+        self.base = 0
+        self.peaks = []        # Pico de cada frame medido (bytes)
+        self.retained = 0      # Memoria que quedó reservada al terminar los frames medidos
+        self.owns_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owns_tracing = True
+        return self
+
+    def begin_frame(self):
+        tracemalloc.reset_peak()
+        self.base = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.frames += 1
+        if self.frames > self.warmup:
+            self.peaks.append(peak - self.base)
+            self.retained += current - self.base
+
+    def summary(self):
+        """Frames medidos, frames con reservas grandes, pico p50/máximo y memoria retenida (bytes)"""
+        if not self.peaks:
+            return None
+        peaks = np.array(self.peaks, dtype=np.int64)
+        return {
+            "frames": len(peaks),
+            "large_frames": int(np.count_nonzero(peaks >= self.threshold)),
+            "p50_bytes": int(np.percentile(peaks, 50)),
+            "max_bytes": int(peaks.max()),
+            "retained_bytes": int(self.retained),
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        if summary is None:
+            return
+        print(f"📊 Memoria por frame ({summary['frames']} frames tras {self.warmup} de arranque): "
+              f"pico p50 {summary['p50_bytes'] / 1024:.1f} KB - máx {summary['max_bytes'] / 1024:.1f} KB - "
+              f"retenida {summary['retained_bytes'] / 1024:.1f} KB")
+        if summary["large_frames"]:
+            print(f"⚠️ {summary['large_frames']} frames reservaron más de {self.threshold // 1024} KB")
+        else:
+            print(f"✅ Ningún frame reservó más de {self.threshold // 1024} KB")
+
+    def stop(self):
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
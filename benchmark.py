@@ -0,0 +1,562 @@
+"""
+Benchmark por etapas del pipeline de frames
+
+Mide por separado cada etapa de HandController.run (captura, flip,
+reducción + cvtColor, hands.process, face_mesh.process, detect_gestures,
+los tres process_*, draw_ui e imshow) y los predicados de GestureDetector
+sobre arrays sintéticos. Genera un reporte JSON con percentiles y lo puede
+comparar con un baseline guardado, marcando las etapas que empeoraron más
+que el umbral.
+
+Uso:
+    python benchmark.py                          # frames y landmarks sintéticos
+    python benchmark.py --video prueba.mp4       # video fijo con inferencia real
+    python benchmark.py --predicates-only        # solo GestureDetector (sin MediaPipe)
+    python benchmark.py --save-baseline base.json
+    python benchmark.py --baseline base.json     # código de salida 1 si hay regresiones
+    python benchmark.py --backend both           # latencia por frame de los grafos separados y de Holistic
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+from allocation_monitor import AllocationMonitor, LARGE_ALLOCATION_BYTES
+from config import GestureConfig
+from gesture_detector import (
+    GestureDetector, NUM_HAND_LANDMARKS, NUM_FACE_KEYPOINTS,
+    FACE_NOSE, FACE_FOREHEAD, FACE_LEFT_EYE, FACE_CHIN, FACE_LEFT_CHEEK, FACE_RIGHT_EYE, FACE_RIGHT_CHEEK
+)
+
+REPORT_VERSION = 1
+SYNTHETIC_FPS = 30.0
+PERCENTILES = (50, 90, 99)
+
+# Regresión: la etapa empeora más de este porcentaje Y más que el mínimo absoluto
+# (el mínimo evita falsas alarmas por ruido en etapas de pocos microsegundos)
+DEFAULT_THRESHOLD = 0.15
+MIN_REGRESSION_MS = 0.01
+
+# Orden de las etapas en el reporte (mismo orden que en HandController.run)
+PIPELINE_STAGES = (
+    "capture", "flip", "prepare_inference", "inference", "holistic_process", "hands_process", "extract_hands",
+    "face_mesh_process", "face_detection_process", "detect_gestures", "process_volume_control",
+    "gesture_engine", "draw_ui", "imshow", "frame",
+)
+
+# Dedos extendidos (índice, medio, anular, meñique) y pulgar extendido de cada pose sintética
+SYNTHETIC_POSES = {
+    "palm": ((True, True, True, True), True),
+    "fist": ((False, False, False, False), False),
+    "cord": ((True, True, False, False), False),
+    "point": ((True, False, False, False), True),
+}
+
+
+class StageTimer:
+    """Acumula duraciones (en segundos) por etapa"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, stage, seconds):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def wrap(self, stage, func):
+        """Envolver un método para que cada llamada se mida como `stage`"""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return timed
+
+    def summary(self, order=()):
+        names = [name for name in order if name in self.samples]
+        names += sorted(name for name in self.samples if name not in names)
+        return {name: summarize(self.samples[name]) for name in names}
+
+
+class TimedGraph:
+    """Envuelve un grafo de MediaPipe para medir solo las llamadas reales a process()"""
+
+    def __init__(self, graph, timer, stage):
+        self.graph = graph
+        self.timer = timer
+        self.stage = stage
+
+    def process(self, image):
+        with self.timer.measure(self.stage):
+            return self.graph.process(image)
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+
+def summarize(samples):
+    """Percentiles, media y máximo de una lista de duraciones, en milisegundos"""
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    result = {"count": int(values.size), "mean_ms": float(values.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        result[f"p{p}_ms"] = float(value)
+    result["max_ms"] = float(values.max())
+    return result
+
+
+def synthetic_hand(pose, center=(0.5, 0.5), scale=1.0, jitter=0.0, rng=None):
+    """Mano (21, 3) en coordenadas normalizadas con la pose pedida de SYNTHETIC_POSES
+
+    No pretende ser anatómica: solo respeta las relaciones entre puntas y
+    articulaciones que miran los predicados del detector.
+    """
+    fingers, thumb_extended = SYNTHETIC_POSES[pose]
+    cx, cy = center
+    s = 0.1 * scale
+    hand = np.zeros((NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+
+    hand[0] = (cx, cy + 1.5 * s, 0)  # Muñeca
+    # Pulgar: CMC, MCP, IP, punta (extendido = punta separada en x de la articulación IP)
+    hand[1] = (cx - 0.4 * s, cy + 1.1 * s, 0)
+    hand[2] = (cx - 0.7 * s, cy + 0.8 * s, 0)
+    hand[3] = (cx - 0.8 * s, cy + 0.5 * s, 0)
+    hand[4] = (cx - 1.4 * s, cy + 0.1 * s, 0) if thumb_extended else (cx - 0.7 * s, cy + 0.6 * s, 0)
+
+    # Índice, medio, anular y meñique: MCP, PIP, DIP, punta
+    for finger, extended in enumerate(fingers):
+        base = 5 + 4 * finger
+        x = cx + (finger - 1.5) * 0.35 * s
+        hand[base] = (x, cy, 0)
+        hand[base + 1] = (x, cy - 0.8 * s, 0)
+        if extended:
+            hand[base + 2] = (x, cy - 1.2 * s, 0)
+            hand[base + 3] = (x, cy - 1.6 * s, 0)
+        else:
+            hand[base + 2] = (x, cy - 0.5 * s, 0)
+            hand[base + 3] = (x, cy - 0.3 * s, 0)
+
+    if jitter and rng is not None:
+        hand += rng.normal(0.0, jitter, hand.shape).astype(np.float32)
+    return hand
+
+
+def synthetic_face(center=(0.5, 0.25), tilt_deg=0.0, size=0.12):
+    """Puntos clave del rostro (NUM_FACE_KEYPOINTS, 3) con la inclinación de cabeza pedida"""
+    cx, cy = center
+    offsets = np.zeros((NUM_FACE_KEYPOINTS, 2), dtype=np.float32)
+    offsets[FACE_NOSE] = (0, 0.1)
+    offsets[FACE_FOREHEAD] = (0, -0.8)
+    offsets[FACE_LEFT_EYE] = (-0.45, -0.2)
+    offsets[FACE_RIGHT_EYE] = (0.45, -0.2)
+    offsets[FACE_CHIN] = (0, 0.9)
+    offsets[FACE_LEFT_CHEEK] = (-0.7, 0.1)
+    offsets[FACE_RIGHT_CHEEK] = (0.7, 0.1)
+
+    angle = np.radians(tilt_deg)
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]], dtype=np.float32)
+    face = np.zeros((NUM_FACE_KEYPOINTS, 3), dtype=np.float32)
+    face[:, :2] = offsets @ rotation.T * size + (cx, cy)
+    return face
+
+
+def synthetic_scenario(frames, seed=0):
+    """Secuencia determinista de (hands, face) que recorre todos los controles
+
+    Ciclo de 240 frames: sin manos, palma -> puño (play/pause), dos manos en
+    cord grip separándose (volumen) y puño con la cabeza inclinada (multimedia).
+    Las manos van en el formato de extract_hands, sin la lista de MediaPipe.
+    """
+    rng = np.random.default_rng(seed)
+    level_face = synthetic_face()
+    tilted_face = synthetic_face(tilt_deg=40.0)
+    scenario = []
+    for i in range(frames):
+        phase = i % 240
+        if phase < 40:
+            hands, face = [], None
+        elif phase < 100:
+            pose = "palm" if phase < 75 else "fist"
+            hands = [(synthetic_hand(pose, (0.7, 0.6), jitter=0.002, rng=rng), "Right", None)]
+            face = level_face
+        elif phase < 180:
+            spread = 0.1 + 0.3 * (phase - 100) / 80
+            hands = [
+                (synthetic_hand("cord", (0.5 - spread, 0.6), jitter=0.002, rng=rng), "Left", None),
+                (synthetic_hand("cord", (0.5 + spread, 0.6), jitter=0.002, rng=rng), "Right", None),
+            ]
+            face = level_face
+        else:
+            hands = [(synthetic_hand("fist", (0.75, 0.65), jitter=0.002, rng=rng), "Right", None)]
+            face = tilted_face if phase >= 200 else level_face
+        scenario.append((hands, face))
+    return scenario
+
+
+def benchmark_predicates(iterations=2000, batch=50, seed=0):
+    """Medir los predicados de GestureDetector sobre manos sintéticas (ms por llamada)"""
+    rng = np.random.default_rng(seed)
+    detector = GestureDetector()
+    face = synthetic_face()
+    hands = [synthetic_hand(pose, (0.5, 0.6), jitter=0.002, rng=rng) for pose in SYNTHETIC_POSES]
+
+    predicates = {
+        "finger_offsets": lambda hand: detector.finger_offsets(hand),
+        "is_palm_open": lambda hand: detector.is_palm_open(hand),
+        "is_fist": lambda hand: detector.is_fist(hand),
+        "is_cord_grip": lambda hand: detector.is_cord_grip(hand),
+        "is_gun_gesture": lambda hand: detector.is_gun_gesture(hand),
+        "is_peace_sign": lambda hand: detector.is_peace_sign(hand),
+        "is_hand_touching_face": lambda hand: detector.is_hand_touching_face(hand, face),
+        "detect_head_tilt": lambda hand: detector.detect_head_tilt(face),
+        "classify": lambda hand: detector.classify(hand, face, "Right"),
+    }
+
+    # Cada muestra es la media de un lote de llamadas: perf_counter cuesta lo mismo que un predicado
+    timer = StageTimer()
+    for name, predicate in predicates.items():
+        for i in range(iterations // batch):
+            hand = hands[i % len(hands)]
+            start = time.perf_counter()
+            for _ in range(batch):
+                predicate(hand)
+            timer.add(name, (time.perf_counter() - start) / batch)
+    return timer.summary(predicates)
+
+
+def benchmark_engine(frames=20000, batch=100):
+    """Medir GestureEngine.update con las reglas por defecto sobre frames sintéticos (ms por frame)
+
+    Las reglas salen de build_default_rules, igual que en HandController, sobre
+    un controlador de reproducción (backends nulos, sin cámara ni MediaPipe):
+    se mide la configuración actual, incluidas las acciones de las reglas.
+    """
+    from gesture_engine import GestureEngine, GestureFrame
+    from gesture_rules import build_default_rules
+    from landmark_recording import ReplayClock, create_replay_controller
+
+    # Clasificar con el detector del controlador: las acciones leen su estado (ej. el último ángulo)
+    controller = create_replay_controller(ReplayClock())
+    detector = controller.gesture_detector
+    scenario = synthetic_scenario(240)
+    classified = []
+    for hands, face in scenario:
+        hand_data = [detector.classify(points, face, label) for points, label, _ in hands]
+        classified.append(hand_data)
+
+    engine = GestureEngine(build_default_rules(controller))
+    gesture_frames = [GestureFrame(hand_data) for hand_data in classified]
+
+    timer = StageTimer()
+    index = 0
+    for _ in range(frames // batch):
+        start = time.perf_counter()
+        for _ in range(batch):
+            engine.update(gesture_frames[index % len(gesture_frames)], index / SYNTHETIC_FPS)
+            index += 1
+        timer.add("gesture_engine.update", (time.perf_counter() - start) / batch)
+    controller.close()
+    return timer.summary()
+
+
+class SyntheticFrameSource:
+    """Frames BGR deterministas de tamaño fijo (sin cámara ni archivos)"""
+
+    name = "synthetic"
+    live = False
+
+    def __init__(self, frames, width, height, seed=0):
+        rng = np.random.default_rng(seed)
+        # Pocos frames distintos que se repiten: la captura no domina la medición
+        self.pool = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+        self.frames = frames
+        self.index = 0
+
+    def read(self, frame=None):
+        if self.index >= self.frames:
+            return False, None
+        source = self.pool[self.index % len(self.pool)]
+        if frame is None or frame.shape != source.shape:
+            frame = np.empty_like(source)
+        np.copyto(frame, source)
+        self.index += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+def benchmark_pipeline(frames, video=None, display=False, warmup=10, allocations=False):
+    """Medir cada etapa del bucle de HandController.run sobre un video o frames sintéticos
+
+    Con frames sintéticos MediaPipe no encuentra manos, así que las etapas de
+    gestos y FaceMesh reciben las manos de synthetic_scenario() en su lugar.
+    La etapa "flip" es el espejado de la vista que se dibuja (la inferencia
+    usa el frame sin espejar) e "inference" incluye ambos grafos (o el grafo
+    Holistic con INFERENCE_BACKEND = "holistic"); con
+    INFERENCE_EXECUTION = "processes" los grafos corren en el pool y sus
+    etapas individuales no se miden. Con `allocations` también se mide la memoria
+    reservada por frame (resumen de AllocationMonitor, o None).
+    Devuelve (frames medidos, etapas, resumen de memoria).
+    """
+    import cv2
+    from frame_sources import VideoFileSource
+    from inference_pool import landmark_list_from_array
+    from landmark_recording import ReplayClock
+    from main import HandController, WINDOW_NAME
+    from media_control import MediaControl, NullMediaBackend
+    from volume_control import VolumeControl, NullVolumeBackend
+
+    if video:
+        source = VideoFileSource(video, realtime=False)
+        scenario = None
+    else:
+        source = SyntheticFrameSource(frames + warmup, GestureConfig.CAMERA_WIDTH, GestureConfig.CAMERA_HEIGHT)
+        scenario = synthetic_scenario(frames + warmup)
+        for hands, _ in scenario:
+            hands[:] = [(points, label, landmark_list_from_array(points)) for points, label, _ in hands]
+
+    clock = ReplayClock()
+    controller = HandController(
+        headless=not display, clock=clock, source=source,
+        volume_control=VolumeControl(NullVolumeBackend()),
+        media_control=MediaControl(backend=NullMediaBackend()),
+    )
+
+    timer = StageTimer()
+    if controller.face_mesh is not None:
+        face_stage = f"{GestureConfig.HEAD_POSE_PROVIDER}_process"
+        controller.face_mesh = TimedGraph(controller.face_mesh, timer, face_stage)
+    if controller.face_roi is not None:
+        controller.face_roi.graph = TimedGraph(controller.face_roi.graph, timer, "face_mesh_process")
+    for stage in ("detect_gestures", "process_volume_control"):
+        setattr(controller, stage, timer.wrap(stage, getattr(controller, stage)))
+    controller.gesture_engine.update = timer.wrap("gesture_engine", controller.gesture_engine.update)
+
+    monitor = AllocationMonitor(warmup).start() if allocations else None
+    measured = 0
+    try:
+        for index in range(frames + warmup):
+            if index == warmup:
+                timer.samples.clear()  # Descartar el arranque de los grafos
+            clock.now = index / SYNTHETIC_FPS
+            if monitor is not None:
+                monitor.begin_frame()
+            frame_start = time.perf_counter()
+
+            with timer.measure("capture"):
+                ret, frame, capture_time = controller.capture.read()
+            if not ret:
+                break
+            controller.frames_processed = index
+            controller.tracer.begin_frame(index, capture_time)
+            with timer.measure("prepare_inference"):
+                rgb = controller.prepare_inference_image(frame)
+            with timer.measure("inference"):
+                if controller.holistic is not None:
+                    with timer.measure("holistic_process"):
+                        results = controller.holistic.process(rgb)
+                    hands, face = controller.extract_holistic(results)
+                    if scenario is not None:
+                        hands, face = scenario[index]
+                elif controller.inference_pool is None:
+                    with timer.measure("hands_process"):
+                        results = controller.hands.process(rgb)
+                    with timer.measure("extract_hands"):
+                        hands = controller.extract_hands(results)
+                    if scenario is not None:
+                        hands, _ = scenario[index]
+                    face = controller.process_face(rgb, hands)
+                else:
+                    hands, face = controller.infer_in_pool()
+                    if scenario is not None:
+                        hands, _ = scenario[index]
+                        controller.last_hands = hands  # La planificación de FaceMesh ve las manos sintéticas
+            if scenario is not None and face is None and hands:
+                face = scenario[index][1]
+            controller.tracer.mark_inference()
+
+            left_hand, right_hand, hand_data = controller.process_landmarks(hands, face)
+            with timer.measure("flip"):
+                view = controller.prepare_display_frame(frame)
+            with timer.measure("draw_ui"):
+                controller.draw_ui(view, left_hand, right_hand, hand_data)
+            if display:
+                with timer.measure("imshow"):
+                    cv2.imshow(WINDOW_NAME, view)
+                    cv2.waitKey(1)
+
+            timer.add("frame", time.perf_counter() - frame_start)
+            if monitor is not None:
+                monitor.end_frame()
+            if index >= warmup:
+                measured += 1
+    finally:
+        controller.close()
+        if monitor is not None:
+            monitor.stop()
+
+    return measured, timer.summary(PIPELINE_STAGES), monitor.summary() if monitor is not None else None
+
+
+def compare_reports(report, baseline, threshold=DEFAULT_THRESHOLD, metric="p50_ms"):
+    """Comparar con un baseline: lista de (sección, etapa, antes, ahora, cambio relativo) que empeoraron"""
+    regressions = []
+    for section in ("pipeline", "predicates"):
+        current = report.get(section) or {}
+        previous = baseline.get(section) or {}
+        for stage, stats in current.items():
+            if stage not in previous:
+                continue
+            before = previous[stage][metric]
+            now = stats[metric]
+            if before <= 0:
+                continue
+            change = (now - before) / before
+            if change > threshold and now - before > MIN_REGRESSION_MS:
+                regressions.append((section, stage, before, now, change))
+    return regressions
+
+
+def backend_summary(frames, pipeline):
+    """Latencia de inferencia y de frame completo de una corrida del pipeline (para comparar backends)"""
+    return {"frames": frames, "inference": pipeline["inference"], "frame": pipeline["frame"]}
+
+
+def print_section(title, stats):
+    print(f"\n📊 {title}")
+    print(f"   {'etapa':<28}{'n':>7}{'media':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'máx':>10}  (ms)")
+    for stage, s in stats.items():
+        print(f"   {stage:<28}{s['count']:>7}{s['mean_ms']:>10.3f}{s['p50_ms']:>10.3f}"
+              f"{s['p90_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark por etapas del pipeline de gestos")
+    parser.add_argument("--video", help="Video fijo a procesar (por defecto frames y landmarks sintéticos)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames a medir en el pipeline")
+    parser.add_argument("--iterations", type=int, default=2000, help="Llamadas por predicado")
+    parser.add_argument("--predicates-only", action="store_true", help="Solo los predicados (no requiere MediaPipe)")
+    parser.add_argument("--display", action="store_true", help="Mostrar la ventana para medir imshow")
+    parser.add_argument("--output", help="Guardar el reporte JSON en este archivo")
+    parser.add_argument("--baseline", help="Reporte JSON con el que comparar")
+    parser.add_argument("--save-baseline", metavar="ARCHIVO", help="Guardar este reporte como baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento relativo de p50 que se considera regresión (0.15 = 15%%)")
+    parser.add_argument("--parallel-inference", action="store_true",
+                        help="Hands y FaceMesh en el pool de procesos (INFERENCE_EXECUTION = \"processes\")")
+    parser.add_argument("--head-pose", choices=["face_detection", "face_mesh"],
+                        help="Modelo del rostro a medir (por defecto GestureConfig.HEAD_POSE_PROVIDER)")
+    parser.add_argument("--backend", choices=["separate", "holistic", "both"],
+                        help="Backend de inferencia a medir; \"both\" mide los dos y compara su latencia por frame")
+    parser.add_argument("--face-roi", action="store_true",
+                        help="FaceMesh sobre un recorte alrededor del último rostro (implica --head-pose face_mesh)")
+    parser.add_argument("--allocations", action="store_true",
+                        help="Medir también la memoria reservada por frame (tracemalloc; infla los tiempos)")
+    parser.add_argument("--verbose", action="store_true", help="No silenciar los mensajes del controlador")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    GestureConfig.SHOW_DEBUG_INFO = args.verbose
+    if args.parallel_inference:
+        GestureConfig.INFERENCE_EXECUTION = "processes"
+    if args.head_pose:
+        GestureConfig.HEAD_POSE_PROVIDER = args.head_pose
+    if args.face_roi:
+        GestureConfig.FACE_ROI_TRACKING = True
+        if not args.head_pose:
+            GestureConfig.HEAD_POSE_PROVIDER = "face_mesh"
+    if args.backend == "both":
+        backends = ["separate", "holistic"]
+    else:
+        backends = [args.backend or GestureConfig.INFERENCE_BACKEND]
+    GestureConfig.INFERENCE_BACKEND = backends[0]
+
+    report = {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "input": args.video or "synthetic",
+        "inference_execution": GestureConfig.INFERENCE_EXECUTION,
+        "head_pose_provider": GestureConfig.HEAD_POSE_PROVIDER,
+        "inference_backend": backends[0],
+    }
+
+    # Los prints de los gestos y del volumen no deben ensuciar la salida ni la medición
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        report["predicates"] = benchmark_predicates(args.iterations)
+        report["predicates"].update(benchmark_engine())
+        if not args.predicates_only:
+            report["frames"], report["pipeline"], allocations = benchmark_pipeline(
+                args.frames, args.video, args.display, allocations=args.allocations
+            )
+            if allocations is not None:
+                report["allocations"] = allocations
+
+            # Los demás backends: solo la inferencia y el frame completo, para compararlos
+            if len(backends) > 1:
+                report["backends"] = {backends[0]: backend_summary(report["frames"], report["pipeline"])}
+                for backend in backends[1:]:
+                    GestureConfig.INFERENCE_BACKEND = backend
+                    frames, pipeline, _ = benchmark_pipeline(args.frames, args.video, args.display)
+                    report["backends"][backend] = backend_summary(frames, pipeline)
+
+    if "pipeline" in report:
+        print_section(f"Pipeline ({report['frames']} frames, {report['input']})", report["pipeline"])
+        frame_p50 = report["pipeline"]["frame"]["p50_ms"]
+        if frame_p50 > 0:
+            print(f"   ≈ {1000.0 / frame_p50:.1f} FPS (p50)")
+    if "allocations" in report:
+        a = report["allocations"]
+        print(f"\n📊 Memoria reservada por frame: pico p50 {a['p50_bytes'] / 1024:.1f} KB - "
+              f"máx {a['max_bytes'] / 1024:.1f} KB - {a['large_frames']}/{a['frames']} frames "
+              f"con más de {LARGE_ALLOCATION_BYTES // 1024} KB")
+    if "backends" in report:
+        print("\n📊 Backends de inferencia (p50 / p90 por frame)")
+        for backend, summary in report["backends"].items():
+            inference, frame = summary["inference"], summary["frame"]
+            print(f"   {backend:<12} inferencia {inference['p50_ms']:>8.3f} / {inference['p90_ms']:>8.3f} ms"
+                  f"   frame {frame['p50_ms']:>8.3f} / {frame['p90_ms']:>8.3f} ms")
+    print_section("Predicados de GestureDetector (por llamada)", report["predicates"])
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Reporte guardado: {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        if not regressions:
+            print(f"\n✅ Sin regresiones respecto a {args.baseline} (umbral {args.threshold:.0%})")
+            return 0
+        print(f"\n❌ Regresiones respecto a {args.baseline} (umbral {args.threshold:.0%}, p50):")
+        for section, stage, before, now, change in regressions:
+            print(f"   {section}/{stage}: {before:.3f} ms -> {now:.3f} ms (+{change:.0%})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
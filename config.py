@@ -17,18 +17,92 @@ class GestureConfig:
     VOLUME_MIN_DISTANCE = 0.08  # Volumen mínimo (manos muy juntas)
     VOLUME_MAX_DISTANCE = 0.7   # Volumen máximo (manos separadas)
     
+    # Backend de volumen: "auto" (pycaw en Windows, PulseAudio/PipeWire en Linux),
+    # "pycaw", "powershell", "pulse" o "none"
+    VOLUME_BACKEND = "auto"
+    VOLUME_SINK = None  # Sink de PulseAudio a controlar (None = sink por defecto)
+    
+    # Backend multimedia: "auto" (teclas multimedia en Windows, MPRIS en Linux), "keys", "mpris" o "none"
+    MEDIA_BACKEND = "auto"
+    MPRIS_PLAYER = None  # Reproductor MPRIS preferido (ej. "spotify"); None = el que esté sonando
+    
     # Configuración de detección de MediaPipe
     MEDIAPIPE_CONFIDENCE = 0.8  # Aumentado para mejor detección
     MAX_HANDS = 2
     
+    # Planificación de FaceMesh: "always" = todos los frames, "gated" = sin manos no se ejecuta,
+    # con puño se ejecuta en todos los frames y con otras manos cada FACE_MESH_IDLE_INTERVAL frames
+    FACE_MESH_SCHEDULE = "gated"
+    FACE_MESH_IDLE_INTERVAL = 5  # Frames entre ejecuciones cuando hay manos pero ningún puño
+    
+    # Modelo del rostro para la inclinación de cabeza y el toque de cara (también con --head-pose):
+    # "face_mesh" = FaceMesh completo (468 puntos con refinamiento de iris) o "face_detection" = BlazeFace
+    # (ojos, nariz y caja del rostro; una fracción del costo, pero frente, barbilla y mejillas se
+    # estiman de la caja, así los umbrales de inclinación y toque de cara se comportan algo distinto)
+    HEAD_POSE_PROVIDER = "face_mesh"
+    FACE_DETECTION_MODEL = 0  # 0 = rostros a menos de 2 m, 1 = hasta 5 m
+    
+    # Seguimiento del rostro (solo "face_mesh"; con otro HEAD_POSE_PROVIDER se avisa al arrancar): FaceMesh
+    # recibe solo un recorte alrededor de la última cara (vuelve a la imagen completa si la pierde); también
+    # con --face-roi, que además selecciona "face_mesh" si no se pasó --head-pose
+    FACE_ROI_TRACKING = False
+    FACE_ROI_MARGIN = 0.25  # Margen por lado alrededor de la caja del rostro (fracción de su tamaño)
+    FACE_ROI_SIZE = 192     # Lado en píxeles del recorte que recibe FaceMesh
+    
     # Configuración de cámara
     CAMERA_INDEX = 1  # 0=cámara integrada, 1=cámara USB externa, 2=segunda externa, etc.
     
+    # Varias cámaras en paralelo, un proceso de inferencia por cámara (también con --cameras 0,2).
+    # Cada entrada es un índice de cámara o la ruta de un video; None = una sola cámara (CAMERA_INDEX)
+    CAMERAS = None
+    MULTI_CAMERA_DEDUP_WINDOW = 1.0     # Segundos en que la misma acción vista por otra cámara se descarta
+    # Segundos que se retiene cada evento desde la captura de su frame para ordenar los de todas las
+    # cámaras: debe cubrir la latencia captura -> acción de la cámara más lenta
+    MULTI_CAMERA_REORDER_DELAY = 0.15
+    
+    # Fuente de frames: "camera", "video" (archivo), "images" (directorio) o "pipe" (BGR crudo, ej. stdin)
+    FRAME_SOURCE = "camera"
+    FRAME_SOURCE_PATH = None        # Archivo/directorio para video, images o pipe (None o '-' = stdin)
+    FRAME_SOURCE_REALTIME = False   # Archivos: False = lo más rápido posible, True = a su FPS original
+    
     # Configuración de resolución y ventana
     CAMERA_WIDTH = 1280   # Ancho de la cámara (640, 1280, 1920)
     CAMERA_HEIGHT = 720   # Alto de la cámara (480, 720, 1080)
     WINDOW_SCALE = 1.0    # Factor de escala de la ventana (1.0 = tamaño original, 1.5 = 150%)
     
+    # Resolución de inferencia: la imagen que reciben los modelos de MediaPipe se reduce a este
+    # tamaño (el dibujo sigue en resolución completa; los landmarks son normalizados)
+    INFERENCE_WIDTH = 640    # None = misma resolución que la cámara
+    INFERENCE_HEIGHT = None  # None = mantener la proporción de la cámara
+    
+    # Backend de inferencia (también con --backend): "separate" = grafos Hands y del rostro independientes;
+    # "holistic" = un solo grafo Holistic que devuelve manos y rostro en una llamada (siempre en línea)
+    INFERENCE_BACKEND = "separate"
+    HOLISTIC_MODEL_COMPLEXITY = 1  # Modelo de pose de Holistic: 0, 1 o 2 (el 1 viene incluido en mediapipe)
+    
+    # Ejecución de los modelos: "inline" = Hands y FaceMesh en el proceso principal, uno después del otro;
+    # "processes" = cada grafo en su propio proceso, en paralelo, leyendo el frame de memoria compartida
+    # (también con --parallel-inference)
+    INFERENCE_EXECUTION = "inline"
+    INFERENCE_RING_SLOTS = 3     # Frames del anillo de memoria compartida
+    INFERENCE_TIMEOUT = 5.0      # Segundos máximos de espera por los resultados de los workers
+    
+    # Captura en hilo separado: el bucle principal siempre toma el frame más reciente
+    CAPTURE_THREADED = True
+    CAPTURE_BUFFER_SIZE = 2  # Frames guardados en el buffer circular (se descarta el más viejo)
+    
+    # Gobernador de actividad (solo fuentes en vivo): sin manos durante IDLE_AFTER segundos baja a
+    # IDLE_FPS e IDLE_INFERENCE_WIDTH; tras SLEEP_AFTER segundos solo corre los modelos si hay movimiento.
+    # Al aparecer una mano vuelve a frecuencia y resolución completas en el siguiente frame
+    ACTIVITY_GOVERNOR = True
+    IDLE_AFTER = 3.0               # Segundos sin manos para pasar a idle
+    SLEEP_AFTER = 30.0             # Segundos sin manos para pasar a sleep
+    ACTIVITY_MIN_HOLD = 5.0        # Segundos mínimos en un estado antes de bajar (histéresis)
+    IDLE_FPS = 10                  # Frames por segundo procesados en idle
+    SLEEP_FPS = 4                  # Frames por segundo revisados en sleep
+    IDLE_INFERENCE_WIDTH = 320     # Ancho de la imagen de inferencia en idle y sleep
+    SLEEP_MOTION_FRACTION = 0.01   # Fracción de píxeles que deben cambiar para despertar los modelos
+    
     # Modo de control multimedia preferido
     MEDIA_GESTURE_MODE = "fist_head_tilt"  # "gun", "peace", o "fist_head_tilt"
     
@@ -36,5 +110,38 @@ class GestureConfig:
     REQUIRE_STABLE_GESTURE = True  # Reactivado para evitar falsos positivos
     STABLE_FRAMES_REQUIRED = 5     # Aumentado: requiere 5 frames consecutivos
     
+    # Clasificador aprendido de la forma de la mano (también con --classifier): archivo .npz de
+    # train_classifier.py; None = umbrales de GestureDetector. Con el clasificador alcanzan menos frames
+    # estables para confirmar un gesto
+    GESTURE_CLASSIFIER_PATH = None
+    CLASSIFIER_MIN_CONFIDENCE = 0.6   # Por debajo de esta probabilidad la mano cuenta como "none"
+    CLASSIFIER_STABLE_FRAMES = 2      # Frames estables requeridos cuando el clasificador está activo
+    
+    # Filtro One Euro sobre los landmarks de las manos (también con --smooth): elimina el temblor en
+    # reposo sin retrasar los movimientos rápidos, así se pueden pedir menos frames estables
+    LANDMARK_FILTER = False
+    LANDMARK_FILTER_MIN_CUTOFF = 1.0     # Hz: menor = más suavizado con la mano quieta
+    LANDMARK_FILTER_BETA = 10.0          # Cuánto sube la frecuencia de corte con la velocidad
+    LANDMARK_FILTER_STABLE_FRAMES = 2    # Frames estables requeridos cuando el filtro está activo
+    
+    # Modo headless: sin ventana ni dibujo, solo procesamiento de gestos (también con --headless)
+    HEADLESS = False
+    
+    # Grabación de landmarks para reproducir sin inferencia (None = no grabar; también con --record)
+    RECORD_PATH = None
+    
+    # Métricas de rendimiento (FPS, inferencia, latencias)
+    SHOW_METRICS = True           # Mostrar las métricas en el panel de información
+    METRICS_WINDOW = 120          # Frames de la ventana deslizante para promedios y percentiles
+    METRICS_LOW_FPS = 15          # Por debajo de este FPS la línea se muestra en rojo
+    METRICS_PANEL_INTERVAL = 0.5  # Segundos entre actualizaciones de las métricas en el panel
+    METRICS_PORT = None           # Puerto HTTP en localhost para Prometheus (/metrics); None = desactivado
+    METRICS_FILE = None           # Archivo donde escribir las métricas periódicamente (útil en headless)
+    METRICS_FILE_INTERVAL = 5.0   # Segundos entre escrituras del archivo de métricas
+    
+    # Trazas de latencia por acción: archivo JSON por línea (None = solo el resumen al salir; también con --trace)
+    TRACE_PATH = None
+    
     # Debug
     SHOW_DEBUG_INFO = True  # Mostrar información de debug en consola
+    DEBUG_ALLOCATIONS = False  # Medir la memoria reservada por frame con tracemalloc (lento; también con --debug-allocations)
@@ -1,6 +1,10 @@
 import cv2
 import mediapipe as mp
-from gesture_detector import GestureDetector
+from gesture_detector import (
+    GestureDetector, landmarks_to_array,
+    WRIST, THUMB_IP, THUMB_TIP, INDEX_FINGER_MCP, INDEX_FINGER_PIP, INDEX_FINGER_TIP,
+    PINKY_MCP
+)
 
 def debug_gestures():
     """Script para debugear la detección de gestos en tiempo real"""
@@ -39,13 +43,19 @@ def debug_gestures():
                 # Dibujar landmarks
                 mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
                 
-                # Detectar todos los gestos
-                is_palm = gesture_detector.is_palm_open(hand_landmarks)
-                is_fist = gesture_detector.is_fist(hand_landmarks)
-                is_cord = gesture_detector.is_cord_grip(hand_landmarks)
-                is_gun = gesture_detector.is_gun_gesture(hand_landmarks)
-                is_peace = gesture_detector.is_peace_sign(hand_landmarks)
-                is_fist_tilt, fist_tilt_dir = gesture_detector.is_fist_with_tilt(hand_landmarks)
+                # Convertir la mano a array (21, 3) una sola vez por frame
+                hand = landmarks_to_array(hand_landmarks)
+                
+                # Detectar todos los gestos en una sola pasada
+                # (sin rostro: este script solo usa el modelo de manos)
+                gestures = gesture_detector.classify(hand, landmarks=hand_landmarks)
+                is_palm = gestures.is_palm
+                is_fist = gestures.is_fist
+                is_cord = gestures.is_cord
+                is_gun = gestures.is_gun
+                is_peace = gestures.is_peace
+                is_fist_tilt = gestures.is_fist_head_tilt
+                fist_tilt_dir = gestures.fist_head_direction
                 
                 # Mostrar información
                 y_pos = 30
@@ -59,12 +69,10 @@ def debug_gestures():
                     gestures_detected.append("CORDÓN")
                 if is_gun:
                     gestures_detected.append("PISTOLA")
-                    gun_dir = gesture_detector.get_gun_direction(hand_landmarks)
-                    gestures_detected.append(f"DIR: {gun_dir}")
+                    gestures_detected.append(f"DIR: {gestures.gun_direction}")
                 if is_peace:
                     gestures_detected.append("PAZ")
-                    peace_dir = gesture_detector.get_peace_direction(hand_landmarks)
-                    gestures_detected.append(f"PAZ_DIR: {peace_dir}")
+                    gestures_detected.append(f"PAZ_DIR: {gestures.peace_direction}")
                 if is_fist_tilt:
                     gestures_detected.append("PUÑO_INCLINADO")
                     gestures_detected.append(f"INCL_DIR: {fist_tilt_dir}")
@@ -79,12 +87,7 @@ def debug_gestures():
                 
                 # Información detallada para puño inclinado
                 if is_fist_tilt:
-                    wrist = hand_landmarks.landmark[mp_hands.HandLandmark.WRIST]
-                    middle_mcp = hand_landmarks.landmark[mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
-                    pinky_mcp = hand_landmarks.landmark[mp_hands.HandLandmark.PINKY_MCP]
-                    index_mcp = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_MCP]
-                    
-                    lateral_vector_y = pinky_mcp.y - index_mcp.y
+                    lateral_vector_y = hand[PINKY_MCP, 1] - hand[INDEX_FINGER_MCP, 1]
                     
                     debug_info = f"Inclinacion lateral: {lateral_vector_y:.3f} (>0.05=der, <-0.05=izq)"
                     cv2.putText(frame, debug_info, (10, y_pos + 30), 
@@ -93,24 +96,24 @@ def debug_gestures():
                 # Información detallada para pistola
                 elif is_gun:
                     # Obtener coordenadas específicas
-                    index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                    index_pip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_PIP]
-                    thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-                    thumb_ip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_IP]
-                    wrist = hand_landmarks.landmark[mp_hands.HandLandmark.WRIST]
+                    index_tip = hand[INDEX_FINGER_TIP]
+                    index_pip = hand[INDEX_FINGER_PIP]
+                    thumb_tip = hand[THUMB_TIP]
+                    thumb_ip = hand[THUMB_IP]
+                    wrist = hand[WRIST]
                     
                     # Calcular métricas
-                    index_ext = index_tip.y < (index_pip.y - 0.04)
-                    thumb_ext = thumb_tip.y < (thumb_ip.y - 0.04)
-                    horizontal = abs(index_tip.y - wrist.y) < 0.12
-                    separation = abs(index_tip.x - thumb_tip.x) > 0.05
+                    index_ext = index_tip[1] < (index_pip[1] - 0.04)
+                    thumb_ext = thumb_tip[1] < (thumb_ip[1] - 0.04)
+                    horizontal = abs(index_tip[1] - wrist[1]) < 0.12
+                    separation = abs(index_tip[0] - thumb_tip[0]) > 0.05
                     
                     debug_info = f"Idx:{index_ext} Thumb:{thumb_ext} Horiz:{horizontal} Sep:{separation}"
                     cv2.putText(frame, debug_info, (10, y_pos + 30), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
                     
                     # Mostrar valores numéricos
-                    values = f"IdxY:{index_tip.y:.2f} ThumbY:{thumb_tip.y:.2f} WristY:{wrist.y:.2f}"
+                    values = f"IdxY:{index_tip[1]:.2f} ThumbY:{thumb_tip[1]:.2f} WristY:{wrist[1]:.2f}"
                     cv2.putText(frame, values, (10, y_pos + 50), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.4, (200, 200, 200), 1)
                 else:
@@ -0,0 +1,106 @@
+"""
+Seguimiento del rostro: FaceMesh sobre un recorte alrededor de la última cara
+
+FaceMesh recibía la imagen de inferencia completa en cada ejecución aunque
+la cara apenas se mueve entre frames y el detector solo usa siete puntos.
+Con FACE_ROI_TRACKING, cuando el frame anterior encontró una cara, FaceMesh
+recibe solo un cuadrado alrededor de ella (su caja más FACE_ROI_MARGIN por
+lado), escalado a FACE_ROI_SIZE píxeles en un buffer reutilizado. Los
+puntos se devuelven a coordenadas normalizadas de la imagen completa antes
+de llegar a detect_head_tilt e is_hand_touching_face.
+
+Los recortes usan un grafo propio: el seguimiento interno de FaceMesh
+guarda la región del frame anterior en coordenadas de su imagen, y en el
+recorte la cara siempre queda centrada. Si en el recorte no aparece ninguna
+cara (seguimiento perdido) se repite FaceMesh sobre la imagen completa en el
+mismo frame, así el recorte nunca hace perder un rostro.
+"""
+import cv2
+import numpy as np
+
+from gesture_detector import face_landmarks_to_array
+
+# Lado mínimo del recorte en píxeles de la imagen de inferencia
+FACE_ROI_MIN_SIDE = 32
+
+
+class FaceRoiTracker:
+    """Recorte cuadrado alrededor del último rostro y su propio grafo de FaceMesh"""
+
+    def __init__(self, graph, margin=0.25, size=192):
+        self.graph = graph
+        self.margin = margin
+        self.size = size
+        self.canvas = np.empty((size, size, 3), dtype=np.uint8)
+        self.box = None  # (centro x, centro y, ancho, alto) normalizados, sin espejar
+
+        # Estadísticas
+        self.crops = 0      # Ejecuciones resueltas con el recorte
+        self.fallbacks = 0  # Recortes sin cara que se repitieron sobre la imagen completa
+
+    def crop(self, rgb):
+        """Recorte escalado al lienzo y su región (x0, y0, lado) en píxeles, o None para la imagen completa"""
+        if self.box is None:
+            return None
+        height, width = rgb.shape[:2]
+        cx, cy, box_width, box_height = self.box
+        side = int(round(max(box_width * width, box_height * height) * (1.0 + 2.0 * self.margin)))
+        side = max(side, FACE_ROI_MIN_SIDE)
+        if side >= min(width, height):
+            return None  # Cara muy grande: el recorte no ahorra nada
+
+        # Cuadrado centrado en la cara y desplazado para quedar dentro de la imagen
+        x0 = min(max(int(round(cx * width - side / 2)), 0), width - side)
+        y0 = min(max(int(round(cy * height - side / 2)), 0), height - side)
+        interpolation = cv2.INTER_AREA if side > self.size else cv2.INTER_LINEAR
+        cv2.resize(rgb[y0:y0 + side, x0:x0 + side], (self.size, self.size),
+                   dst=self.canvas, interpolation=interpolation)
+        return x0, y0, side
+
+    def process(self, face_mesh, rgb, mirror=False):
+        """Puntos clave del rostro en coordenadas de la imagen completa (o None)
+
+        `face_mesh` es el grafo de imagen completa, usado cuando no hay una
+        cara previa o el recorte no la encontró.
+        """
+        region = self.crop(rgb)
+        face_landmarks = None
+        if region is not None:
+            results = self.graph.process(self.canvas)
+            if results.multi_face_landmarks:
+                face_landmarks = results.multi_face_landmarks[0]
+                self.crops += 1
+            else:
+                region = None
+                self.fallbacks += 1
+
+        if face_landmarks is None:
+            results = face_mesh.process(rgb)
+            if not results.multi_face_landmarks:
+                self.box = None
+                return None
+            face_landmarks = results.multi_face_landmarks[0]
+
+        face = face_landmarks_to_array(face_landmarks)
+        if region is not None:
+            height, width = rgb.shape[:2]
+            x0, y0, side = region
+            face[:, 0] = (x0 + face[:, 0] * side) / width
+            face[:, 1] = (y0 + face[:, 1] * side) / height
+            face[:, 2] *= side / width  # La z de MediaPipe está en la escala del ancho
+
+        # Caja de los puntos clave (frente, barbilla y mejillas la delimitan) para el próximo recorte
+        low = face[:, :2].min(axis=0)
+        high = face[:, :2].max(axis=0)
+        center = (low + high) / 2
+        self.box = (float(center[0]), float(center[1]), float(high[0] - low[0]), float(high[1] - low[1]))
+
+        if mirror:
+            face[:, 0] = 1.0 - face[:, 0]
+        return face
+
+    def reset(self):
+        self.box = None
+
+    def close(self):
+        self.graph.close()
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import deque
+
+
+class DirectCapture:
+    """Lectura síncrona de la cámara (sin hilo), misma interfaz que ThreadedCapture
+
+    Cada lectura reutiliza el buffer de la anterior: el frame entregado es
+    válido hasta la siguiente llamada a read().
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.frame = None
+        self.frame_interval = 0.0  # Segundos mínimos entre frames entregados (0 = todos)
+        self.last_delivered = None
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        return self
+
+    def set_frame_interval(self, seconds):
+        """Entregar como máximo un frame cada `seconds` segundos; los demás se saltan sin decodificar"""
+        self.frame_interval = seconds
+
+    def read(self):
+        """Leer un frame: devuelve (ret, frame, timestamp de captura)"""
+        if self.frame_interval > 0 and self.last_delivered is not None:
+            while time.perf_counter() - self.last_delivered < self.frame_interval:
+                if not self.cap.grab():
+                    return False, None, None
+                self.frames_dropped += 1
+        ret, frame = self.cap.read(self.frame)
+        timestamp = time.perf_counter()
+        if ret:
+            self.frame = frame
+            self.last_delivered = timestamp
+            self.frames_captured += 1
+            self.frames_delivered += 1
+        return ret, frame, timestamp
+
+    def stats(self):
+        """Contadores de frames capturados, entregados y descartados"""
+        return {
+            'captured': self.frames_captured,
+            'delivered': self.frames_delivered,
+            'dropped': self.frames_dropped,
+        }
+
+    def stop(self):
+        pass
+
+
+class ThreadedCapture:
+    """Hilo de captura que conserva solo los frames más recientes
+
+    El hilo lee la cámara continuamente y guarda cada frame con su timestamp en
+    un buffer circular pequeño (se descarta el más viejo al llenarse). El bucle
+    principal siempre recibe el frame más nuevo, así la latencia desde la
+    cámara hasta la acción queda acotada a un periodo de inferencia y el driver
+    nunca acumula frames atrasados.
+
+    Los frames se leen sobre un pool fijo de buffers (buffer_size + 2: los
+    del buffer circular, el que se está leyendo y el que tiene el bucle
+    principal). El frame entregado por read() es válido hasta la siguiente
+    llamada a read(), que lo devuelve al pool.
+    """
+
+    def __init__(self, cap, buffer_size=2):
+        self.cap = cap
+        self.buffer = deque(maxlen=max(1, buffer_size))
+        self.free = []        # Buffers libres para la próxima lectura
+        self.current = None   # Frame entregado al bucle principal
+        self.frame_interval = 0.0  # Segundos mínimos entre frames decodificados (0 = todos)
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.finished = False
+
+        # Contadores expuestos para diagnóstico
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0  # Frames que nunca llegaron al bucle principal
+
+    def start(self):
+        """Arrancar el hilo de captura"""
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, name="frame-capture", daemon=True)
+        self.thread.start()
+        return self
+
+    def set_frame_interval(self, seconds):
+        """Decodificar como máximo un frame cada `seconds` segundos
+
+        Los frames intermedios se sacan del driver con grab() (sin
+        decodificar) para que el siguiente frame entregado no sea viejo.
+        """
+        self.frame_interval = seconds
+
+    def _capture_loop(self):
+        last_capture = None
+        try:
+            while self.running:
+                if self.frame_interval > 0 and last_capture is not None:
+                    if time.perf_counter() - last_capture < self.frame_interval:
+                        if not self.cap.grab():
+                            break
+                        continue
+
+                with self.condition:
+                    target = self.free.pop() if self.free else None  # None: el pool todavía crece
+                ret, frame = self.cap.read(target)
+                timestamp = time.perf_counter()
+                if not ret:
+                    break
+                last_capture = timestamp
+
+                with self.condition:
+                    if len(self.buffer) == self.buffer.maxlen:
+                        self.frames_dropped += 1  # Se descarta el más viejo
+                        self.free.append(self.buffer[0][0])
+                    self.buffer.append((frame, timestamp))
+                    self.frames_captured += 1
+                    self.condition.notify()
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def read(self, timeout=None):
+        """Obtener el frame más reciente: devuelve (ret, frame, timestamp de captura)
+
+        Bloquea hasta que haya un frame nuevo. Los frames más viejos que
+        quedaban en el buffer se descartan y se cuentan en frames_dropped.
+        """
+        with self.condition:
+            # El bucle principal ya terminó con el frame anterior
+            if self.current is not None:
+                self.free.append(self.current)
+                self.current = None
+
+            self.condition.wait_for(lambda: self.buffer or self.finished, timeout)
+            if not self.buffer:
+                return False, None, None
+
+            frame, timestamp = self.buffer.pop()
+            self.frames_dropped += len(self.buffer)
+            self.free.extend(old_frame for old_frame, _ in self.buffer)
+            self.buffer.clear()
+            self.frames_delivered += 1
+            self.current = frame
+            return True, frame, timestamp
+
+    def stats(self):
+        """Contadores de frames capturados, entregados y descartados"""
+        with self.condition:
+            return {
+                'captured': self.frames_captured,
+                'delivered': self.frames_delivered,
+                'dropped': self.frames_dropped,
+            }
+
+    def stop(self):
+        """Detener el hilo de captura"""
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
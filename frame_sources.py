@@ -0,0 +1,203 @@
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from config import GestureConfig
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class FrameSource:
+    """Interfaz común de las fuentes de frames (misma API que cv2.VideoCapture)
+
+    `live` indica si la fuente produce frames a su propio ritmo (cámara, o un
+    archivo reproducido en tiempo real): en ese caso se lee en un hilo y se
+    descartan los frames viejos. Las fuentes no live entregan todos los frames
+    tan rápido como el bucle los consume, útil para medir rendimiento.
+
+    Como cv2.VideoCapture.read(image), read() acepta un buffer opcional: si
+    tiene el tamaño del frame se escribe ahí y se devuelve el mismo array, así
+    la captura no reserva memoria por frame.
+    """
+
+    name = "base"
+    live = False
+
+    def read(self, frame=None):
+        """Leer el siguiente frame BGR (en `frame` si se puede reutilizar): devuelve (ret, frame)"""
+        raise NotImplementedError
+
+    def grab(self):
+        """Avanzar un frame sin entregarlo (las cámaras no lo decodifican): devuelve ret"""
+        return self.read()[0]
+
+    def release(self):
+        pass
+
+
+class PacedSource(FrameSource):
+    """Base para fuentes de archivo que pueden reproducirse a su FPS original"""
+
+    def __init__(self, fps, realtime):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.live = realtime
+        self.frame_index = 0
+        self.start_time = None
+
+    def _wait_for_next_frame(self):
+        """En tiempo real, esperar al instante que le corresponde al frame"""
+        if not self.live:
+            return
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        delay = self.start_time + self.frame_index / self.fps - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CameraSource(FrameSource):
+    """Cámara web vía cv2.VideoCapture"""
+
+    name = "camera"
+    live = True
+
+    def __init__(self, index, width=None, height=None):
+        print(f"🎥 Inicializando cámara {index}...")
+        self.cap = cv2.VideoCapture(index)
+        if not self.cap.isOpened():
+            raise Exception("No se pudo inicializar la cámara")
+
+        # Configurar resolución de la cámara
+        if width and height:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        # Verificar resolución actual
+        actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        print(f"📐 Resolución configurada: {actual_width}x{actual_height}")
+
+    def read(self, frame=None):
+        return self.cap.read(frame)
+
+    def grab(self):
+        return self.cap.grab()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(PacedSource):
+    """Archivo de video; por defecto entrega los frames lo más rápido posible"""
+
+    name = "video"
+
+    def __init__(self, path, realtime=False):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise Exception(f"No se pudo abrir el video: {path}")
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS), realtime)
+        print(f"🎞️ Video: {path} ({int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))} frames a {self.fps:.1f} FPS)")
+
+    def read(self, frame=None):
+        self._wait_for_next_frame()
+        ret, frame = self.cap.read(frame)
+        self.frame_index += 1
+        return ret, frame
+
+    def grab(self):
+        self._wait_for_next_frame()
+        self.frame_index += 1
+        return self.cap.grab()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(PacedSource):
+    """Directorio de imágenes leídas en orden alfabético"""
+
+    name = "images"
+
+    def __init__(self, directory, realtime=False, fps=30.0):
+        self.paths = sorted(
+            path for path in glob.glob(os.path.join(directory, '*'))
+            if path.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise Exception(f"No hay imágenes en: {directory}")
+        super().__init__(fps, realtime)
+        print(f"🖼️ Secuencia de imágenes: {directory} ({len(self.paths)} frames)")
+
+    def read(self, frame=None):
+        # La decodificación siempre reserva una imagen nueva: el buffer no se usa
+        if self.frame_index >= len(self.paths):
+            return False, None
+        self._wait_for_next_frame()
+        frame = cv2.imread(self.paths[self.frame_index], cv2.IMREAD_COLOR)
+        self.frame_index += 1
+        return frame is not None, frame
+
+
+class RawPipeSource(PacedSource):
+    """Frames BGR crudos (ancho x alto x 3 bytes cada uno) leídos de un stream
+
+    Por defecto lee de stdin, por ejemplo:
+    ffmpeg -i video.mp4 -f rawvideo -pix_fmt bgr24 -s 1280x720 - | python main.py --source pipe
+    """
+
+    name = "pipe"
+
+    def __init__(self, width, height, stream=None, realtime=False, fps=30.0):
+        self.width = width
+        self.height = height
+        self.frame_bytes = width * height * 3
+        self.stream = stream if stream is not None else sys.stdin.buffer
+        super().__init__(fps, realtime)
+
+    def read(self, frame=None):
+        self._wait_for_next_frame()
+        if frame is None or frame.shape != (self.height, self.width, 3):
+            frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        # Leer directo sobre el buffer (sin bytes intermedios)
+        if self.stream.readinto(frame.reshape(-1)) != self.frame_bytes:
+            return False, None
+        self.frame_index += 1
+        return True, frame
+
+    def release(self):
+        if self.stream is not sys.stdin.buffer:
+            self.stream.close()
+
+
+def create_frame_source(kind=None, path=None, realtime=None):
+    """Crear la fuente de frames configurada ("camera", "video", "images" o "pipe")"""
+    kind = kind or GestureConfig.FRAME_SOURCE
+    path = path or GestureConfig.FRAME_SOURCE_PATH
+    realtime = GestureConfig.FRAME_SOURCE_REALTIME if realtime is None else realtime
+
+    if kind == "camera":
+        return CameraSource(GestureConfig.CAMERA_INDEX, GestureConfig.CAMERA_WIDTH, GestureConfig.CAMERA_HEIGHT)
+    if kind in ("video", "images") and not path:
+        what = "un archivo de video" if kind == "video" else "un directorio de imágenes"
+        raise ValueError(f"La fuente \"{kind}\" necesita {what}: indicarlo con --input RUTA "
+                         f"(o GestureConfig.FRAME_SOURCE_PATH)")
+    if kind == "video":
+        return VideoFileSource(path, realtime)
+    if kind == "images":
+        return ImageSequenceSource(path, realtime)
+    if kind == "pipe":
+        stream = open(path, 'rb') if path and path != '-' else None
+        return RawPipeSource(GestureConfig.CAMERA_WIDTH, GestureConfig.CAMERA_HEIGHT, stream, realtime)
+    raise ValueError(f"Fuente de frames desconocida: {kind}")
+
+
+def create_camera_source(spec, realtime=None):
+    """Fuente para una entrada de GestureConfig.CAMERAS: índice de cámara o ruta de un video"""
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec), GestureConfig.CAMERA_WIDTH, GestureConfig.CAMERA_HEIGHT)
+    realtime = GestureConfig.FRAME_SOURCE_REALTIME if realtime is None else realtime
+    return VideoFileSource(spec, realtime)
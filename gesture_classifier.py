@@ -0,0 +1,110 @@
+"""
+Clasificador aprendido de la forma de la mano (MLP en NumPy puro)
+
+Sustituye a los umbrales de GestureDetector (punta por encima de la PIP,
++0.02, separación del pulgar...) para decidir si una mano es palma, puño,
+cordón, pistola o paz. Los umbrales fallan con la mano rotada o a otra
+distancia de la cámara; los rasgos de hand_features() son invariantes a la
+posición, la escala y la rotación en el plano de la imagen, y las manos
+izquierdas se reflejan para compartir el modelo con las derechas.
+
+El modelo es un .npz con las matrices de cada capa, la media y desviación
+de los rasgos y los nombres de las clases: se carga sin ningún framework y
+se entrena con train_classifier.py a partir de grabaciones de landmarks.
+Todas las manos de un frame se clasifican en una sola pasada por la red.
+"""
+import numpy as np
+
+from gesture_detector import WRIST, MIDDLE_FINGER_MCP, NUM_HAND_LANDMARKS
+
+# Clases que entiende GestureDetector.classify ("none" = ninguna de las demás)
+GESTURE_CLASSES = ("none", "palm", "fist", "cord", "gun", "peace")
+
+MODEL_VERSION = 1
+NUM_FEATURES = (NUM_HAND_LANDMARKS - 1) * 3
+
+
+def hand_features(hands, left):
+    """Rasgos de un lote de manos (N, 21, 3) -> (N, NUM_FEATURES) float32
+
+    Se resta la muñeca, se divide por la distancia muñeca - MCP del medio
+    (tamaño de la palma) y se rota en el plano de la imagen para que ese
+    segmento apunte hacia arriba. Las manos con `left` (array bool (N,)) se
+    reflejan en x. La muñeca, que queda en el origen, no se incluye.
+    """
+    hands = np.asarray(hands, dtype=np.float32)
+    centered = hands - hands[:, WRIST:WRIST + 1]
+    axis = centered[:, MIDDLE_FINGER_MCP, :2]
+    size = np.maximum(np.linalg.norm(axis, axis=1), 1e-6)
+
+    # Rotación que lleva el eje muñeca -> MCP a (0, -tamaño): cos = -ay / s, sin = -ax / s
+    cos = (-axis[:, 1] / size)[:, None]
+    sin = (-axis[:, 0] / size)[:, None]
+    x = centered[:, :, 0]
+    y = centered[:, :, 1]
+    features = np.empty_like(centered)
+    features[:, :, 0] = (x * cos - y * sin) / size[:, None]
+    features[:, :, 1] = (x * sin + y * cos) / size[:, None]
+    features[:, :, 2] = centered[:, :, 2] / size[:, None]
+    features[np.asarray(left, dtype=bool), :, 0] *= -1.0
+    return features[:, WRIST + 1:].reshape(len(hands), NUM_FEATURES)
+
+
+class GestureClassifier:
+    """Perceptrón multicapa (ReLU + softmax) sobre hand_features()"""
+
+    def __init__(self, classes, mean, std, weights, biases, min_confidence=0.0):
+        self.classes = tuple(str(name) for name in classes)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def load(cls, path, min_confidence=0.0):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != MODEL_VERSION:
+                raise ValueError(f"Versión de modelo no soportada en {path}: {int(data['version'])}")
+            layers = int(data["layers"])
+            return cls(
+                data["classes"], data["mean"], data["std"],
+                [data[f"W{i}"] for i in range(layers)], [data[f"b{i}"] for i in range(layers)],
+                min_confidence,
+            )
+
+    def save(self, path):
+        arrays = {f"W{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(path, version=MODEL_VERSION, layers=len(self.weights), classes=np.array(self.classes),
+                 mean=self.mean, std=self.std, **arrays)
+
+    def probabilities(self, features):
+        """Probabilidad de cada clase para un lote de rasgos (N, NUM_FEATURES) -> (N, clases)"""
+        x = (features - self.mean) / self.std
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = np.maximum(x @ w + b, 0.0)
+        logits = x @ self.weights[-1] + self.biases[-1]
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, hands, hand_types):
+        """Clase de cada mano de un frame (una sola pasada por la red para todas)
+
+        Las predicciones con menos de `min_confidence` se devuelven como "none".
+        """
+        if not hands:
+            return []
+        left = np.array([hand_type == 'Left' for hand_type in hand_types])
+        return self.predict_batch(np.stack(hands), left)
+
+    def predict_batch(self, hands, left):
+        """Clase de cada mano de un lote ya apilado (N, 21, 3), con `left` array bool (N,)
+
+        Para clasificar muchos frames de una vez (ej. una grabación entera).
+        """
+        probabilities = self.probabilities(hand_features(hands, left))
+        best = probabilities.argmax(axis=1)
+        confident = probabilities[np.arange(len(best)), best] >= self.min_confidence
+        return [self.classes[index] if ok else "none" for index, ok in zip(best, confident)]
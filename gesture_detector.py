@@ -1,307 +1,382 @@
-import mediapipe as mp
 import math
-import time
+
+import numpy as np
+
+# Índices de los 21 landmarks de la mano (mismo orden que mp.solutions.hands.HandLandmark)
+WRIST = 0
+THUMB_IP = 3
+THUMB_TIP = 4
+INDEX_FINGER_MCP = 5
+INDEX_FINGER_PIP = 6
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_MCP = 9
+MIDDLE_FINGER_PIP = 10
+MIDDLE_FINGER_TIP = 12
+RING_FINGER_PIP = 14
+RING_FINGER_TIP = 16
+PINKY_MCP = 17
+PINKY_PIP = 18
+PINKY_TIP = 20
+
+NUM_HAND_LANDMARKS = 21
+
+# Puntas y articulaciones PIP de índice, medio, anular y meñique (en ese orden)
+FINGER_TIPS = np.array([INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP])
+FINGER_PIPS = np.array([INDEX_FINGER_PIP, MIDDLE_FINGER_PIP, RING_FINGER_PIP, PINKY_PIP])
+
+# Puntos del FaceMesh que usa el detector. El array de cara sigue este orden.
+FACE_MESH_KEYPOINTS = (1, 10, 33, 152, 234, 263, 454)
+FACE_NOSE = 0           # 1: Punta de la nariz
+FACE_FOREHEAD = 1       # 10: Frente
+FACE_LEFT_EYE = 2       # 33: Esquina externa del ojo izquierdo
+FACE_CHIN = 3           # 152: Barbilla
+FACE_LEFT_CHEEK = 4     # 234: Mejilla izquierda
+FACE_RIGHT_EYE = 5      # 263: Esquina externa del ojo derecho
+FACE_RIGHT_CHEEK = 6    # 454: Mejilla derecha
+NUM_FACE_KEYPOINTS = len(FACE_MESH_KEYPOINTS)
+
+# Contorno facial usado para detectar mano cerca de la cara
+FACE_CONTOUR = np.array([FACE_FOREHEAD, FACE_CHIN, FACE_LEFT_CHEEK, FACE_RIGHT_CHEEK, FACE_NOSE])
+HAND_FACE_POINTS = np.array([MIDDLE_FINGER_MCP, WRIST])
+
+# Puntos clave de MediaPipe FaceDetection (BlazeFace) que se usan en su lugar
+DETECTION_EYES = (0, 1)  # Centros de ambos ojos
+DETECTION_NOSE = 2       # Punta de la nariz
+
+
+# Lateralidad de MediaPipe Hands sobre una imagen sin espejar -> lateralidad en la vista espejada
+MIRRORED_HANDEDNESS = {'Left': 'Right', 'Right': 'Left'}
+
+# Formas de la mano que puede decidir un clasificador aprendido (además de "none")
+HAND_SHAPES = ("palm", "fist", "cord", "gun", "peace")
+
+# Cordón y paz son la misma postura de índice y medio (paz exige además el pulgar pegado): con los
+# umbrales se cumplen a la vez, así que la forma aprendida de una no descarta la otra
+OVERLAPPING_SHAPES = {"cord": "peace", "peace": "cord"}
+
+
+def landmarks_to_array(landmark_list, indices=None, mirror=False):
+    """Convertir un NormalizedLandmarkList de MediaPipe a un array float32 (N, 3)
+
+    Se llama una sola vez por mano y por frame; el resto del detector trabaja
+    solo sobre el array resultante. Con `mirror` la x se refleja (1 - x), como
+    si la imagen de entrada se hubiera espejado horizontalmente.
+    """
+    landmarks = landmark_list.landmark
+    if indices is not None:
+        landmarks = [landmarks[i] for i in indices]
+    if mirror:
+        return np.array([(1.0 - lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+def face_landmarks_to_array(face_landmarks, mirror=False):
+    """Extraer del FaceMesh solo los puntos clave usados (NUM_FACE_KEYPOINTS, 3)"""
+    return landmarks_to_array(face_landmarks, FACE_MESH_KEYPOINTS, mirror)
+
+
+def face_detection_to_array(detection, mirror=False):
+    """Puntos clave equivalentes a los de FaceMesh a partir de una detección de FaceDetection
+
+    Los ojos y la nariz salen de los puntos de BlazeFace (centros de los ojos
+    en lugar de las comisuras externas: la línea que los une tiene la misma
+    inclinación); frente, barbilla y mejillas, de los bordes de la caja del
+    rostro. La z queda en 0.
+    """
+    location = detection.location_data
+    box = location.relative_bounding_box
+    keypoints = location.relative_keypoints
+    nose = keypoints[DETECTION_NOSE]
+    # El ojo más a la izquierda de la imagen sin espejar ocupa el lugar del landmark 33
+    left_eye, right_eye = sorted((keypoints[i] for i in DETECTION_EYES), key=lambda kp: kp.x)
+    center_x = box.xmin + box.width / 2
+
+    face = np.zeros((NUM_FACE_KEYPOINTS, 3), dtype=np.float32)
+    face[FACE_NOSE, :2] = (nose.x, nose.y)
+    face[FACE_FOREHEAD, :2] = (center_x, box.ymin)
+    face[FACE_LEFT_EYE, :2] = (left_eye.x, left_eye.y)
+    face[FACE_CHIN, :2] = (center_x, box.ymin + box.height)
+    face[FACE_LEFT_CHEEK, :2] = (box.xmin, nose.y)
+    face[FACE_RIGHT_EYE, :2] = (right_eye.x, right_eye.y)
+    face[FACE_RIGHT_CHEEK, :2] = (box.xmin + box.width, nose.y)
+    if mirror:
+        face[:, 0] = 1.0 - face[:, 0]
+    return face
+
+
+def mirror_landmark_list(landmark_list):
+    """Reflejar en el lugar la x de un NormalizedLandmarkList (para dibujarlo sobre la vista espejada)"""
+    for lm in landmark_list.landmark:
+        lm.x = 1.0 - lm.x
+    return landmark_list
+
+
+class HandGestures:
+    """Resultado de clasificar una mano en un frame (todos los gestos y direcciones)"""
+
+    __slots__ = (
+        'type', 'landmarks', 'points', 'center',
+        'is_palm', 'is_fist', 'is_cord', 'is_gun', 'is_peace', 'is_fist_head_tilt',
+        'gun_direction', 'peace_direction', 'fist_head_direction', 'is_touching_face',
+    )
+
+    def __repr__(self):
+        flags = [name for name in ('is_palm', 'is_fist', 'is_cord', 'is_gun', 'is_peace',
+                                   'is_fist_head_tilt', 'is_touching_face') if getattr(self, name)]
+        return f"HandGestures(type={self.type!r}, flags={flags})"
+
 
 class GestureDetector:
+    """Clasificador de gestos sobre arrays de landmarks.
+
+    Todos los métodos reciben la mano como array float32 (21, 3) generado por
+    landmarks_to_array() y la cara como array (NUM_FACE_KEYPOINTS, 3) generado
+    por face_landmarks_to_array() o face_detection_to_array().
+    """
+
     def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        
-        # Timeout para evitar detecciones múltiples de inclinación de cabeza
-        self.last_head_tilt_time = 0
-        self.head_tilt_cooldown = 1.5  # 1.5 segundos entre detecciones
-        
         # Control de logging para toque de cara
         self.face_touch_logged = False  # Para evitar spam de logs
-        
-    def is_palm_open(self, hand_landmarks):
+
+    @staticmethod
+    def finger_offsets(hand):
+        """Diferencia vertical punta - PIP de índice, medio, anular y meñique
+
+        Negativo = dedo extendido (la punta está por encima de la articulación).
+        """
+        return hand[FINGER_TIPS, 1] - hand[FINGER_PIPS, 1]
+
+    @staticmethod
+    def thumb_offset(hand):
+        """Separación horizontal entre punta y articulación IP del pulgar"""
+        return abs(float(hand[THUMB_TIP, 0] - hand[THUMB_IP, 0]))
+
+    def is_palm_open(self, hand, offsets=None, thumb=None):
         """Detectar palma abierta"""
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        
-        fingers = [
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]),
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]),
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]),
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]),
-        ]
-        
-        open_fingers = 0
-        for tip, pip in fingers:
-            if tip.y < pip.y:
-                open_fingers += 1
-        
-        if abs(thumb_tip.x - thumb_ip.x) > 0.04:
+        if offsets is None:
+            offsets = self.finger_offsets(hand)
+        if thumb is None:
+            thumb = self.thumb_offset(hand)
+
+        open_fingers = int(np.count_nonzero(offsets < 0))
+
+        if thumb > 0.04:
             open_fingers += 1
-            
+
         return open_fingers >= 4
 
-    def is_fist(self, hand_landmarks):
+    def is_fist(self, hand, offsets=None, thumb=None):
         """Detectar puño cerrado - MÁS ESTRICTO para evitar falsas detecciones"""
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        
-        fingers = [
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]),
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]),
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]),
-            (hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP], 
-             hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]),
-        ]
-        
-        # TODOS los dedos deben estar claramente doblados (más estricto)
-        closed_fingers = 0
-        for tip, pip in fingers:
-            # Aumentar el umbral para requerir que esté MÁS doblado
-            if tip.y > (pip.y + 0.02):  # Más estricto: 0.02 en lugar de 0
-                closed_fingers += 1
-                
+        if offsets is None:
+            offsets = self.finger_offsets(hand)
+        if thumb is None:
+            thumb = self.thumb_offset(hand)
+
+        # TODOS los dedos deben estar claramente doblados (más estricto: 0.02 en lugar de 0)
+        all_closed = bool(np.all(offsets > 0.02))
+
         # El pulgar también debe estar doblado o pegado
-        thumb_folded = abs(thumb_tip.x - thumb_ip.x) < 0.03  # Pulgar no extendido
-        
+        thumb_folded = thumb < 0.03  # Pulgar no extendido
+
         # Requerir TODOS los 4 dedos + pulgar para un puño más estricto
-        return closed_fingers == 4 and thumb_folded
+        return all_closed and thumb_folded
 
-    def is_cord_grip(self, hand_landmarks):
+    def is_cord_grip(self, hand, offsets=None, thumb=None):
         """Detectar posición de cordón - solo índice y medio extendidos como pinzas"""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-        
-        # Otros dedos doblados
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-        ring_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        
+        if offsets is None:
+            offsets = self.finger_offsets(hand)
+        if thumb is None:
+            thumb = self.thumb_offset(hand)
+
         # Índice y medio extendidos
-        extended_fingers = 0
-        if index_tip.y < index_pip.y:
-            extended_fingers += 1
-        if middle_tip.y < middle_pip.y:
-            extended_fingers += 1
-        
+        extended_fingers = int(np.count_nonzero(offsets[:2] < 0))
+
         # Otros dedos doblados (incluyendo pulgar)
-        folded_fingers = 0
-        if ring_tip.y > ring_pip.y:
+        folded_fingers = int(np.count_nonzero(offsets[2:] > 0))
+        if thumb < 0.03:  # Pulgar pegado
             folded_fingers += 1
-        if pinky_tip.y > pinky_pip.y:
-            folded_fingers += 1
-        if abs(thumb_tip.x - thumb_ip.x) < 0.03:  # Pulgar pegado
-            folded_fingers += 1
-        
+
         return extended_fingers == 2 and folded_fingers >= 2
 
-    def is_gun_gesture(self, hand_landmarks):
+    def is_gun_gesture(self, hand, offsets=None):
         """Detectar gesto de pistola más estricto (índice + pulgar extendidos, otros doblados)"""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
-        
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-        ring_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]
-        wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-        
+        if offsets is None:
+            offsets = self.finger_offsets(hand)
+        index_tip = hand[INDEX_FINGER_TIP]
+        thumb_tip = hand[THUMB_TIP]
+        wrist = hand[WRIST]
+
         # Requisitos estrictos para pistola real:
-        
+
         # 1. Índice claramente extendido
-        index_extended = index_tip.y < (index_pip.y - 0.04)
-        
+        index_extended = offsets[0] < -0.04
+
         # 2. Pulgar claramente extendido hacia arriba (OBLIGATORIO)
-        thumb_extended = thumb_tip.y < (thumb_ip.y - 0.04)
-        
+        thumb_extended = thumb_tip[1] < (hand[THUMB_IP, 1] - 0.04)
+
         # 3. Los otros 3 dedos TODOS doblados (sin excepciones)
-        middle_folded = middle_tip.y > (middle_pip.y + 0.03)
-        ring_folded = ring_tip.y > (ring_pip.y + 0.03)
-        pinky_folded = pinky_tip.y > (pinky_pip.y + 0.03)
-        all_others_folded = middle_folded and ring_folded and pinky_folded
-        
+        all_others_folded = np.all(offsets[1:] > 0.03)
+
         # 4. Orientación: la mano debe estar relativamente horizontal
         # El índice no debe estar apuntando muy arriba o muy abajo
-        horizontal_pointing = abs(index_tip.y - wrist.y) < 0.12
-        
+        horizontal_pointing = abs(index_tip[1] - wrist[1]) < 0.12
+
         # 5. El índice debe estar claramente separado del pulgar
-        finger_separation = abs(index_tip.x - thumb_tip.x) > 0.05
-        
+        finger_separation = abs(index_tip[0] - thumb_tip[0]) > 0.05
+
         # TODOS los requisitos deben cumplirse
-        return (index_extended and thumb_extended and all_others_folded and 
-                horizontal_pointing and finger_separation)
+        return bool(index_extended and thumb_extended and all_others_folded and
+                    horizontal_pointing and finger_separation)
 
-    def is_peace_sign(self, hand_landmarks):
+    def is_peace_sign(self, hand, offsets=None, thumb=None):
         """Detectar gesto de paz (índice y medio extendidos, otros doblados) - alternativa más estable"""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-        
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-        ring_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        
-        # Índice y medio extendidos
-        index_extended = index_tip.y < index_pip.y
-        middle_extended = middle_tip.y < middle_pip.y
-        
-        # Otros dedos doblados
-        ring_folded = ring_tip.y > ring_pip.y
-        pinky_folded = pinky_tip.y > pinky_pip.y
-        thumb_folded = abs(thumb_tip.x - thumb_ip.x) < 0.03  # Pulgar pegado
-        
-        return (index_extended and middle_extended and 
-                ring_folded and pinky_folded and thumb_folded)
-
-    def get_gun_direction(self, hand_landmarks):
+        if offsets is None:
+            offsets = self.finger_offsets(hand)
+        if thumb is None:
+            thumb = self.thumb_offset(hand)
+
+        # Índice y medio extendidos, anular y meñique doblados
+        fingers_ok = bool(np.all(offsets[:2] < 0) and np.all(offsets[2:] > 0))
+        thumb_folded = thumb < 0.03  # Pulgar pegado
+
+        return fingers_ok and thumb_folded
+
+    def classify(self, hand, face=None, hand_type=None, landmarks=None, shape=None, learned=()):
+        """Clasificar una mano en una sola pasada
+
+        Calcula una vez los rasgos compartidos (offsets de los dedos, pulgar,
+        centro) y devuelve un HandGestures con todos los gestos y direcciones.
+        `hand_type` ('Left'/'Right') y `landmarks` (lista original de MediaPipe,
+        usada para dibujar) se copian tal cual al resultado. `shape` es la
+        forma de la mano según GestureClassifier y `learned` las clases que
+        conoce el modelo: esas formas salen de `shape` y las demás (clases
+        que el modelo no aprendió, o la que se superpone con la elegida según
+        OVERLAPPING_SHAPES) de los umbrales. Sin `shape` se usan los umbrales.
+        """
+        result = HandGestures()
+        result.type = hand_type
+        result.landmarks = landmarks
+        result.points = hand
+        result.center = self.get_hand_center(hand)
+
+        if shape is None:
+            learned = ()
+        else:
+            learned = [name for name in HAND_SHAPES if name in learned and name != OVERLAPPING_SHAPES.get(shape)]
+
+        if len(learned) < len(HAND_SHAPES):
+            offsets = self.finger_offsets(hand)
+            thumb = self.thumb_offset(hand)
+        result.is_palm = shape == "palm" if "palm" in learned else self.is_palm_open(hand, offsets, thumb)
+        result.is_fist = shape == "fist" if "fist" in learned else self.is_fist(hand, offsets, thumb)
+        result.is_cord = shape == "cord" if "cord" in learned else self.is_cord_grip(hand, offsets, thumb)
+        result.is_gun = shape == "gun" if "gun" in learned else self.is_gun_gesture(hand, offsets)
+        result.is_peace = shape == "peace" if "peace" in learned else self.is_peace_sign(hand, offsets, thumb)
+
+        result.gun_direction = self.get_gun_direction(hand) if result.is_gun else None
+        result.peace_direction = self.get_peace_direction(hand) if result.is_peace else None
+
+        # Puño con inclinación de cabeza (solo se evalúa la cabeza si hay puño)
+        head_tilt = None
+        if result.is_fist and face is not None:
+            head_tilt = self.detect_head_tilt(face)
+        result.is_fist_head_tilt = head_tilt is not None
+        result.fist_head_direction = head_tilt
+
+        # Verificar si la mano está tocando la cara (VALIDACIÓN DE SEGURIDAD)
+        result.is_touching_face = self.is_hand_touching_face(hand, face)
+
+        return result
+
+    def get_gun_direction(self, hand):
         """Determinar dirección de la pistola (izquierda/derecha)"""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-        
-        if index_tip.x > wrist.x:
+        if hand[INDEX_FINGER_TIP, 0] > hand[WRIST, 0]:
             return "right"  # Apuntando a la derecha
         else:
             return "left"   # Apuntando a la izquierda
 
-    def detect_head_tilt(self, face_landmarks):
-        """Detectar inclinación de la cabeza usando landmarks del rostro"""
-        if not face_landmarks:
-            return None
-            
-        # Verificar timeout para evitar múltiples detecciones
-        current_time = time.time()
-        if current_time - self.last_head_tilt_time < self.head_tilt_cooldown:
+    def detect_head_tilt(self, face):
+        """Detectar inclinación de la cabeza usando landmarks del rostro
+
+        Devuelve la dirección en cada frame en que la cabeza está inclinada; el
+        cooldown entre acciones lo aplica el GestureEngine.
+        """
+        if face is None:
             return None
-        
-        # Puntos clave del rostro para detectar inclinación
-        # Usar puntos de los ojos y la nariz
-        left_eye = face_landmarks.landmark[33]   # Esquina izquierda del ojo izquierdo
-        right_eye = face_landmarks.landmark[263] # Esquina derecha del ojo derecho
-        nose_tip = face_landmarks.landmark[1]    # Punta de la nariz
-        
+
+        # Puntos clave del rostro para detectar inclinación: esquinas externas de los ojos
+        left_eye = face[FACE_LEFT_EYE]
+        right_eye = face[FACE_RIGHT_EYE]
+
         # Calcular la línea de los ojos
-        eye_line_slope = (right_eye.y - left_eye.y) / (right_eye.x - left_eye.x + 0.0001)
-        
+        eye_line_slope = float(right_eye[1] - left_eye[1]) / (float(right_eye[0] - left_eye[0]) + 0.0001)
+
         # Convertir pendiente a ángulo
         angle_rad = math.atan(eye_line_slope)
         angle_deg = math.degrees(angle_rad)
-        
+
         # Guardar el ángulo para mostrarlo en la UI
         self.last_head_angle = angle_deg
-        
+
         # Umbral para detectar inclinación (en grados) - AUMENTADO a 35°
         tilt_threshold = 35  # grados (aumentado para requerir inclinación más intencional)
-        
+
         if angle_deg > tilt_threshold:
-            self.last_head_tilt_time = current_time  # Actualizar timeout
-            print(f"🎵➡️ SIGUIENTE CANCIÓN - Cabeza inclinada IZQUIERDA ({angle_deg:.1f}°)")
             return "right"   # Cabeza inclinada hacia la izquierda = siguiente canción
         elif angle_deg < -tilt_threshold:
-            self.last_head_tilt_time = current_time  # Actualizar timeout
-            print(f"🎵⬅️ CANCIÓN ANTERIOR - Cabeza inclinada DERECHA ({angle_deg:.1f}°)")
             return "left"  # Cabeza inclinada hacia la derecha = canción anterior
         else:
             return None     # Sin inclinación suficiente
 
-    def is_fist_with_head_tilt(self, hand_landmarks, face_landmarks=None):
+    def is_fist_with_head_tilt(self, hand, face=None):
         """Detectar puño cerrado con inclinación de cabeza"""
         # Primero verificar que es un puño
-        if not self.is_fist(hand_landmarks):
+        if not self.is_fist(hand):
             return False, None
-        
+
         # Detectar inclinación de la cabeza
-        if face_landmarks is None:
+        if face is None:
             return False, None
-        
-        head_tilt = self.detect_head_tilt(face_landmarks)
-        
+
+        head_tilt = self.detect_head_tilt(face)
+
         if head_tilt:
             return True, head_tilt
         else:
             return False, None
 
-    def get_peace_direction(self, hand_landmarks):
+    def get_peace_direction(self, hand):
         """Determinar dirección del signo de paz basado en orientación de la mano"""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-        
         # Punto medio entre índice y medio
-        fingers_center_x = (index_tip.x + middle_tip.x) / 2
-        
+        fingers_center_x = (hand[INDEX_FINGER_TIP, 0] + hand[MIDDLE_FINGER_TIP, 0]) / 2
+
         # Si los dedos están más a la derecha que la muñeca = derecha
-        if fingers_center_x > wrist.x:
+        if fingers_center_x > hand[WRIST, 0]:
             return "right"
         else:
             return "left"
 
-    def get_hand_center(self, hand_landmarks):
+    def get_hand_center(self, hand):
         """Obtener centro de la mano entre índice y medio"""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        center_x = (index_tip.x + middle_tip.x) / 2
-        center_y = (index_tip.y + middle_tip.y) / 2
-        return center_x, center_y
+        center = (hand[INDEX_FINGER_TIP, :2] + hand[MIDDLE_FINGER_TIP, :2]) / 2
+        return float(center[0]), float(center[1])
 
-    def is_hand_touching_face(self, hand_landmarks, face_landmarks):
+    def is_hand_touching_face(self, hand, face):
         """Detectar si la mano está tocando o muy cerca de la cara"""
-        if not face_landmarks:
+        if face is None:
             return False
-            
-        # Obtener puntos clave de la mano
-        hand_center = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
-        wrist = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-        
-        # Obtener puntos clave de la cara (contorno facial)
-        face_points = [
-            face_landmarks.landmark[10],   # Frente
-            face_landmarks.landmark[152],  # Barbilla
-            face_landmarks.landmark[234],  # Mejilla izquierda 
-            face_landmarks.landmark[454],  # Mejilla derecha
-            face_landmarks.landmark[1],    # Nariz
-        ]
-        
-        # Calcular distancia mínima entre la mano y la cara
-        min_distance = float('inf')
-        
-        for face_point in face_points:
-            # Distancia del centro de la mano a puntos de la cara
-            distance_center = math.sqrt(
-                (hand_center.x - face_point.x)**2 + 
-                (hand_center.y - face_point.y)**2
-            )
-            
-            # Distancia de la muñeca a puntos de la cara
-            distance_wrist = math.sqrt(
-                (wrist.x - face_point.x)**2 + 
-                (wrist.y - face_point.y)**2
-            )
-            
-            min_distance = min(min_distance, distance_center, distance_wrist)
-        
+
+        # Distancias de centro de la mano y muñeca a cada punto del contorno facial
+        hand_points = hand[HAND_FACE_POINTS, :2]
+        face_points = face[FACE_CONTOUR, :2]
+        distances = np.linalg.norm(hand_points[:, None, :] - face_points[None, :, :], axis=2)
+        min_distance = float(distances.min())
+
         # Si la distancia es menor a este umbral, consideramos que está tocando la cara
         touch_threshold = 0.15  # Ajustable según sea necesario
-        
+
         is_touching = min_distance < touch_threshold
-        
-        # Debug: mostrar estado actual
-        #print(f"DEBUG: is_touching={is_touching}, face_touch_logged={self.face_touch_logged}, distance={min_distance:.3f}")
-        
+
         if is_touching:
             if not self.face_touch_logged:
                 # Mostrar mensaje solo la primera vez que se detecta
@@ -312,7 +387,7 @@ class GestureDetector:
                 # Mostrar mensaje cuando se libera la mano de la cara
                 print(f"✅ MANO LIBERADA - Distancia: {min_distance:.3f} - CONTROLES REACTIVADOS")
                 self.face_touch_logged = False
-            
+
         return is_touching
 
     def calculate_distance(self, point1, point2):
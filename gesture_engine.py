@@ -0,0 +1,185 @@
+"""
+Motor declarativo de gestos
+
+Un gesto se declara como una secuencia de pasos; cada paso es un predicado
+sobre el frame que debe cumplirse durante `frames` frames consecutivos y al
+menos `hold` segundos antes de pasar al siguiente. Al cumplirse el último
+paso se ejecuta la acción de la regla, respetando su cooldown (compartido
+entre las reglas de un mismo `group`).
+
+Cada regla guarda solo su paso actual, un contador y el instante en que
+empezó el paso, así la evaluación por frame es O(1) sin recorrer historiales.
+Los predicados reciben un GestureFrame (o cualquier objeto con los atributos
+que usen), por eso el motor se puede alimentar con datos sintéticos.
+"""
+import math
+
+
+class GestureFrame:
+    """Entrada del motor para un frame: las manos clasificadas (HandGestures)"""
+
+    __slots__ = ('hands', 'left', 'right', 'single', 'timestamp')
+
+    def __init__(self, hands, left=None, right=None, timestamp=0.0):
+        self.hands = hands
+        self.left = left
+        self.right = right
+        # La única mano visible (None si hay cero o dos manos)
+        self.single = hands[0] if len(hands) == 1 else None
+        self.timestamp = timestamp
+
+
+class Step:
+    """Un paso de un gesto: `predicate(frame)` verdadero durante `frames` frames y `hold` segundos
+
+    El valor que devuelve el predicado (por ejemplo una dirección) se pasa a
+    la acción si es el último paso.
+    """
+
+    __slots__ = ('predicate', 'hold', 'frames')
+
+    def __init__(self, predicate, hold=0.0, frames=1):
+        self.predicate = predicate
+        self.hold = hold
+        self.frames = max(1, frames)
+
+
+class GestureEvent:
+    """Disparo de una regla: valor del último paso, instante y duración del gesto"""
+
+    __slots__ = ('name', 'value', 'timestamp', 'onset', 'result')
+
+    def __init__(self, name, value, timestamp, onset):
+        self.name = name
+        self.value = value
+        self.timestamp = timestamp
+        self.onset = onset
+        self.result = None
+
+    @property
+    def debounce(self):
+        """Segundos desde que empezó el primer paso hasta el disparo"""
+        return self.timestamp - self.onset
+
+    def __repr__(self):
+        return f"GestureEvent({self.name!r}, value={self.value!r}, result={self.result!r})"
+
+
+class GestureRule:
+    """Secuencia de pasos con una acción al completarse
+
+    - `guard(frame)`: si es falso la secuencia vuelve al primer paso (ej. mano cerca de la cara).
+    - Si el paso en curso ya había empezado y su predicado deja de cumplirse,
+      la secuencia también vuelve al primer paso. Un paso que todavía no
+      empezó simplemente espera (ej. tras sostener la palma se espera el puño).
+    - `action(event)` devuelve un valor verdadero si aceptó la acción; el
+      resultado queda en event.result. Un resultado falso no se reporta ni
+      inicia el cooldown y la regla reintenta en el próximo frame. Las
+      acciones que solo encolan el trabajo (MediaControl con dispatcher)
+      devuelven verdadero al encolar: un fallo posterior del backend no
+      libera el cooldown.
+    - `cooldown`: segundos mínimos desde el último disparo aceptado de la
+      regla, o de cualquier regla del mismo `group`. Una secuencia completada
+      durante el cooldown queda lista y dispara en cuanto termina mientras el
+      último paso se siga cumpliendo. Si deja de cumplirse, solo ese paso
+      vuelve a empezar (con sus `frames` y `hold`), no la secuencia entera.
+    """
+
+    def __init__(self, name, steps, action, guard=None, cooldown=0.0, group=None):
+        if not steps:
+            raise ValueError(f"La regla {name} no tiene pasos")
+        self.name = name
+        self.steps = tuple(steps)
+        self.action = action
+        self.guard = guard
+        self.cooldown = cooldown
+        self.group = group or name
+        self.reset()
+
+    def reset(self):
+        self.index = 0       # Paso actual
+        self.count = 0       # Frames consecutivos cumpliendo el paso actual
+        self.started = 0.0   # Instante en que empezó el paso actual
+        self.onset = 0.0     # Instante en que empezó el primer paso
+        self.ready = False   # Secuencia completada, esperando el cooldown o reintentando la acción
+
+    @property
+    def state(self):
+        """Paso actual y progreso, para depuración o UI"""
+        return self.index, self.count
+
+
+class GestureEngine:
+    """Evalúa todas las reglas una vez por frame"""
+
+    def __init__(self, rules=()):
+        self.rules = []
+        self.last_fire = {}  # grupo -> instante del último disparo
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule):
+        if any(existing.name == rule.name for existing in self.rules):
+            raise ValueError(f"Ya existe una regla llamada {rule.name}")
+        self.rules.append(rule)
+        return rule
+
+    def remove(self, name):
+        self.rules = [rule for rule in self.rules if rule.name != name]
+
+    def get(self, name):
+        return next((rule for rule in self.rules if rule.name == name), None)
+
+    def reset(self):
+        for rule in self.rules:
+            rule.reset()
+        self.last_fire.clear()
+
+    def update(self, frame, timestamp):
+        """Avanzar todas las reglas con un frame; devuelve los GestureEvent ejecutados"""
+        events = []
+        for rule in self.rules:
+            if rule.guard is not None and not rule.guard(frame):
+                if rule.index or rule.count:
+                    rule.reset()
+                continue
+
+            step = rule.steps[rule.index]
+            value = step.predicate(frame)
+            if not value:
+                if rule.ready:
+                    # Secuencia completada que perdió el último paso: repetirlo entero
+                    rule.ready = False
+                    rule.count = 0
+                elif rule.count:
+                    rule.reset()  # Se rompió el paso en curso
+                continue
+
+            if not rule.ready:
+                if rule.count == 0:
+                    rule.started = timestamp
+                    if rule.index == 0:
+                        rule.onset = timestamp
+                rule.count += 1
+                if rule.count < step.frames or timestamp - rule.started < step.hold:
+                    continue
+
+                if rule.index + 1 < len(rule.steps):
+                    # Paso cumplido: el siguiente se evalúa desde el próximo frame
+                    rule.index += 1
+                    rule.count = 0
+                    continue
+                rule.ready = True
+
+            # Último paso cumplido: disparar si el cooldown lo permite
+            if timestamp - self.last_fire.get(rule.group, -math.inf) < rule.cooldown:
+                continue
+
+            event = GestureEvent(rule.name, value, timestamp, rule.onset)
+            event.result = rule.action(event)
+            if not event.result:
+                continue  # Acción rechazada: sin cooldown, se reintenta
+            self.last_fire[rule.group] = timestamp
+            rule.reset()
+            events.append(event)
+        return events
@@ -0,0 +1,116 @@
+"""
+Gestos de control multimedia declarados para el GestureEngine
+
+Para agregar un gesto nuevo basta con declarar otra GestureRule aquí (o
+llamar a controller.gesture_engine.add(...)) sin tocar main.py. Los
+predicados reciben un GestureFrame; las reglas usan `guard` para exigir una
+sola mano visible que no esté cerca de la cara.
+"""
+from config import GestureConfig
+from gesture_engine import GestureRule, Step
+
+MEDIA_GROUP = "media"  # Cooldown compartido por todas las acciones multimedia
+
+
+def single_hand_free(frame):
+    """Una sola mano visible y lejos de la cara (validación de seguridad)"""
+    return frame.single is not None and not frame.single.is_touching_face
+
+
+def palm(frame):
+    return frame.single.is_palm
+
+
+def fist(frame):
+    return frame.single.is_fist
+
+
+def fist_head_tilt_direction(frame):
+    hand = frame.single
+    return hand.fist_head_direction if hand.is_fist_head_tilt else None
+
+
+def peace_direction(frame):
+    hand = frame.single
+    return hand.peace_direction if hand.is_peace else None
+
+
+def gun_direction(frame):
+    hand = frame.single
+    return hand.gun_direction if hand.is_gun else None
+
+
+# Gesto multimedia (MEDIA_GESTURE_MODE) -> predicado que devuelve la dirección
+MEDIA_GESTURES = {
+    "fist_head_tilt": fist_head_tilt_direction,
+    "peace": peace_direction,
+    "gun": gun_direction,
+}
+
+
+def play_pause_rule(controller):
+    """Palma sostenida PALM_HOLD_DURATION segundos y después puño: play/pause"""
+    def toggle(event):
+        controller.tracer.mark_stable(event.debounce)
+        if not controller.media_control.play_pause():
+            return None
+        controller.current_mode = "play_pause"
+        return "play_pause"
+
+    return GestureRule(
+        "play_pause",
+        [Step(palm, hold=GestureConfig.PALM_HOLD_DURATION), Step(fist)],
+        toggle,
+        guard=single_hand_free,
+        cooldown=GestureConfig.MEDIA_COOLDOWN,
+        group=MEDIA_GROUP,
+    )
+
+
+def track_rule(controller, gesture, stable_frames):
+    """Gesto con dirección (derecha = siguiente canción, izquierda = anterior)
+
+    La inclinación de cabeza con puño dispara en el primer frame (el ángulo
+    ya exige una inclinación intencional); los otros gestos deben mantenerse
+    `stable_frames` frames.
+    """
+    frames = 1 if gesture == "fist_head_tilt" else stable_frames
+
+    def skip(event):
+        controller.current_mode = "media"
+        controller.tracer.mark_stable(event.debounce)
+        if gesture == "fist_head_tilt":
+            angle = controller.gesture_detector.last_head_angle
+            side = "IZQUIERDA" if event.value == "right" else "DERECHA"
+            print(f"🎵 Cabeza inclinada {side} ({angle:.1f}°)")
+        print(f"🎯 Ejecutando gesto: {gesture} hacia {event.value}")
+
+        if event.value == "right":
+            if controller.media_control.next_track():
+                print("✅ Siguiente canción ejecutada")
+                return f"next_{gesture}"
+            print("❌ Error al ejecutar siguiente canción")
+        elif event.value == "left":
+            if controller.media_control.previous_track():
+                print("✅ Canción anterior ejecutada")
+                return f"previous_{gesture}"
+            print("❌ Error al ejecutar canción anterior")
+        return None
+
+    return GestureRule(
+        f"track_{gesture}",
+        [Step(MEDIA_GESTURES[gesture], frames=frames)],
+        skip,
+        guard=single_hand_free,
+        cooldown=GestureConfig.MEDIA_COOLDOWN,
+        group=MEDIA_GROUP,
+    )
+
+
+def build_default_rules(controller):
+    """Reglas de la configuración actual para un HandController"""
+    stable_frames = controller.required_stable_frames if GestureConfig.REQUIRE_STABLE_GESTURE else 1
+    return [
+        play_pause_rule(controller),
+        track_rule(controller, GestureConfig.MEDIA_GESTURE_MODE, stable_frames),
+    ]
@@ -0,0 +1,298 @@
+"""
+Hands y FaceMesh en procesos propios, alimentados por memoria compartida
+
+El proceso principal escribe la imagen RGB de inferencia directamente en un
+slot de un anillo multiprocessing.shared_memory (cvtColor con dst=) y avisa
+a los workers con el número de frame, el slot y la forma de la imagen. El
+anillo se reserva una vez con lugar para la resolución más grande; los
+cambios de resolución del gobernador de actividad (activo <-> idle) solo
+cambian la vista sobre cada slot. Cada worker lee el slot sin
+copiarlo, ejecuta su grafo y devuelve solo los arrays de landmarks por una
+cola común; el proceso principal junta ambos resultados por número de frame.
+Así los dos grafos corren en paralelo en núcleos distintos y la latencia de
+inferencia pasa a ser la del más lento en lugar de la suma.
+
+Los landmarks llegan ya espejados (como extract_hands y process_face del
+modo en línea); las listas de MediaPipe para dibujar se reconstruyen en el
+proceso principal solo cuando hay ventana.
+"""
+import multiprocessing
+import queue
+import signal
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from config import GestureConfig
+from gesture_detector import (
+    landmarks_to_array, face_landmarks_to_array, face_detection_to_array, MIRRORED_HANDEDNESS
+)
+from face_roi import FaceRoiTracker
+from multi_camera import config_snapshot
+
+
+def create_hands_graph():
+    """Grafo de MediaPipe Hands con la configuración actual"""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=GestureConfig.MAX_HANDS,
+        min_detection_confidence=GestureConfig.MEDIAPIPE_CONFIDENCE
+    )
+
+
+def create_face_mesh_graph():
+    """Grafo de MediaPipe FaceMesh con la configuración actual"""
+    import mediapipe as mp
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=False,
+        max_num_faces=1,
+        refine_landmarks=True,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+def create_holistic_graph():
+    """Grafo de MediaPipe Holistic (pose, manos y rostro en una sola llamada)"""
+    import mediapipe as mp
+    return mp.solutions.holistic.Holistic(
+        static_image_mode=False,
+        model_complexity=GestureConfig.HOLISTIC_MODEL_COMPLEXITY,
+        refine_face_landmarks=False,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+def create_face_detection_graph():
+    """Grafo de MediaPipe FaceDetection (BlazeFace) con la configuración actual"""
+    import mediapipe as mp
+    return mp.solutions.face_detection.FaceDetection(
+        model_selection=GestureConfig.FACE_DETECTION_MODEL,
+        min_detection_confidence=0.5
+    )
+
+
+def create_face_graph():
+    """Grafo del rostro según HEAD_POSE_PROVIDER: FaceDetection o FaceMesh"""
+    if GestureConfig.HEAD_POSE_PROVIDER == "face_detection":
+        return create_face_detection_graph()
+    return create_face_mesh_graph()
+
+
+def create_face_roi_tracker():
+    """Seguimiento del rostro con su propio grafo de FaceMesh (None si está desactivado o no se usa FaceMesh)"""
+    if not GestureConfig.FACE_ROI_TRACKING or GestureConfig.HEAD_POSE_PROVIDER != "face_mesh":
+        return None
+    return FaceRoiTracker(create_face_mesh_graph(), GestureConfig.FACE_ROI_MARGIN, GestureConfig.FACE_ROI_SIZE)
+
+
+def hand_arrays(hand_results):
+    """Resultado de Hands -> [(array (21, 3) espejado, 'Left'/'Right' en la vista espejada)]"""
+    if not hand_results.multi_hand_landmarks or not hand_results.multi_handedness:
+        return []
+    hands = []
+    for hand_landmarks, handedness in zip(hand_results.multi_hand_landmarks, hand_results.multi_handedness):
+        label = handedness.classification[0].label
+        hands.append((landmarks_to_array(hand_landmarks, mirror=True), MIRRORED_HANDEDNESS.get(label, label)))
+    return hands
+
+
+def face_array(face_results):
+    """Resultado de FaceMesh o FaceDetection -> puntos clave espejados del primer rostro (o None)"""
+    if hasattr(face_results, "multi_face_landmarks"):
+        if not face_results.multi_face_landmarks:
+            return None
+        return face_landmarks_to_array(face_results.multi_face_landmarks[0], mirror=True)
+    if not face_results.detections:
+        return None
+    return face_detection_to_array(face_results.detections[0], mirror=True)
+
+
+def landmark_list_from_array(points):
+    """NormalizedLandmarkList de MediaPipe a partir de un array, para dibujar con drawing_utils"""
+    from mediapipe.framework.formats import landmark_pb2
+
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in points:
+        landmark_list.landmark.add(x=float(x), y=float(y), z=float(z))
+    return landmark_list
+
+
+class SharedFrameRing:
+    """Anillo de `slots` imágenes RGB en memoria compartida, cada slot con lugar para `slot_bytes`
+
+    Cada frame es una vista (alto, ancho, 3) al inicio de su slot, así el
+    mismo segmento sirve para cualquier resolución que quepa.
+    """
+
+    def __init__(self, slots, slot_bytes):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.memory = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def fits(self, height, width):
+        return height * width * 3 <= self.slot_bytes
+
+    def slot(self, frame_id, height, width):
+        """Buffer donde escribir el frame `frame_id` (índice del slot, vista sin copia)"""
+        index = frame_id % self.slots
+        return index, frame_view(self.memory, self.slot_bytes, index, (height, width, 3))
+
+    def close(self):
+        try:
+            self.memory.close()
+        except BufferError:
+            pass  # Todavía hay una vista del último frame: el mapeo se libera con ella
+        self.memory.unlink()
+
+
+def frame_view(memory, slot_bytes, index, shape):
+    """Vista uint8 con forma `shape` al inicio del slot `index` de un segmento compartido"""
+    return np.ndarray(shape, dtype=np.uint8, buffer=memory.buf, offset=index * slot_bytes)
+
+
+def attach_shared_memory(name):
+    """Abrir un segmento creado por otro proceso sin registrarlo en el resource_tracker
+
+    El proceso que lo crea es el único que lo libera (unlink). Antes de
+    Python 3.13 abrir un segmento por nombre también lo registra, y el
+    tracker avisa de segmentos "perdidos" o intenta liberarlos otra vez.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    register = resource_tracker.register
+
+    def register_except_shared_memory(resource, rtype):
+        if rtype != "shared_memory":
+            register(resource, rtype)
+
+    resource_tracker.register = register_except_shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def graph_worker(kind, tasks, results, config):
+    """Proceso de un grafo ("hands" o "face"): lee frames del anillo y devuelve landmarks"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # La salida la coordina el proceso principal
+    for name, value in config.items():
+        setattr(GestureConfig, name, value)
+
+    graph = create_hands_graph() if kind == "hands" else create_face_graph()
+    convert = hand_arrays if kind == "hands" else face_array
+    face_roi = create_face_roi_tracker() if kind == "face" else None
+    memory = None
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            frame_id, ring_name, slot_bytes, index, shape = task
+
+            # Anillo nuevo (solo si creció la resolución máxima): volver a abrirlo
+            if memory is None or memory.name != ring_name:
+                if memory is not None:
+                    memory.close()
+                memory = attach_shared_memory(ring_name)
+
+            rgb = frame_view(memory, slot_bytes, index, shape)
+            start = time.perf_counter()
+            if face_roi is not None:
+                output = face_roi.process(graph, rgb, mirror=True)
+            else:
+                output = convert(graph.process(rgb))
+            rgb = None  # Sin vistas vivas el segmento se puede cerrar
+            results.put((kind, frame_id, output, time.perf_counter() - start))
+    finally:
+        if memory is not None:
+            memory.close()
+        if face_roi is not None:
+            face_roi.close()
+        graph.close()
+
+
+class InferencePool:
+    """Workers de Hands y FaceMesh y el anillo de frames que comparten con el proceso principal"""
+
+    def __init__(self, slots=3, timeout=5.0):
+        self.slots = slots
+        self.timeout = timeout
+        self.ring = None
+        self.frame_shape = None  # (alto, ancho, 3) del último frame escrito
+
+        # spawn: cada worker arranca un intérprete limpio con su propio grafo
+        context = multiprocessing.get_context("spawn")
+        self.results = context.Queue()
+        self.tasks = {"hands": context.Queue(), "face": context.Queue()}
+        config = config_snapshot()
+        self.workers = [
+            context.Process(target=graph_worker, args=(kind, tasks, self.results, config),
+                            name=f"inference-{kind}", daemon=True)
+            for kind, tasks in self.tasks.items()
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def reserve(self, width, height):
+        """Reservar el anillo para imágenes de hasta width x height (solo se recrea si no entran)"""
+        if self.ring is None or not self.ring.fits(height, width):
+            if self.ring is not None:
+                self.ring.close()  # Los workers abren el anillo nuevo en su próxima tarea
+            self.ring = SharedFrameRing(self.slots, height * width * 3)
+
+    def buffer(self, frame_id, width, height):
+        """Slot del anillo para el frame, con la forma de la resolución actual"""
+        self.reserve(width, height)
+        self.frame_shape = (height, width, 3)
+        return self.ring.slot(frame_id, height, width)[1]
+
+    def process(self, frame_id, run_face):
+        """Ejecutar los grafos sobre el frame ya escrito en su slot; devuelve (manos, rostro, tiempos)
+
+        `tiempos` es {"hands": segundos, "face": segundos} con los grafos que corrieron.
+        """
+        index = frame_id % self.ring.slots
+        task = (frame_id, self.ring.name, self.ring.slot_bytes, index, self.frame_shape)
+        pending = {"hands"}
+        self.tasks["hands"].put(task)
+        if run_face:
+            pending.add("face")
+            self.tasks["face"].put(task)
+
+        outputs = {"hands": [], "face": None}
+        durations = {}
+        deadline = time.perf_counter() + self.timeout
+        while pending:
+            try:
+                kind, result_id, output, duration = self.results.get(
+                    timeout=max(0.0, deadline - time.perf_counter())
+                )
+            except queue.Empty:
+                raise RuntimeError(f"Los workers de inferencia no respondieron ({', '.join(sorted(pending))})")
+            if result_id != frame_id:
+                continue  # Resultado de un frame anterior que ya se abandonó
+            outputs[kind] = output
+            durations[kind] = duration
+            pending.discard(kind)
+        return outputs["hands"], outputs["face"], durations
+
+    def close(self):
+        for tasks in self.tasks.values():
+            tasks.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
@@ -0,0 +1,97 @@
+"""
+Filtro One Euro para los landmarks de las manos
+
+Paso bajo adaptativo (Casiez et al., 2012): con la mano quieta la frecuencia
+de corte es baja y se elimina el temblor de MediaPipe; al moverse rápido la
+frecuencia de corte sube con la velocidad y el retraso se mantiene pequeño.
+Se aplica a los 21 puntos (x, y, z) de una mano a la vez con numpy.
+"""
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """Filtro One Euro vectorizado sobre un array de forma fija (ej. (21, 3))
+
+    `min_cutoff` (Hz) controla el suavizado en reposo, `beta` cuánto sube la
+    frecuencia de corte con la velocidad (en unidades normalizadas por segundo)
+    y `d_cutoff` (Hz) el suavizado de la velocidad estimada.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.dx = None
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        """Factor de suavizado exponencial para un paso dt y una frecuencia de corte (escalar o array)"""
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, timestamp):
+        """Filtrar una nueva muestra tomada en `timestamp` (segundos); devuelve un array nuevo"""
+        if self.x is None:
+            self.x = np.array(x, dtype=np.float32)
+            self.dx = np.zeros_like(self.x)
+            self.timestamp = timestamp
+            return self.x.copy()
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.x.copy()  # Mismo instante (o reloj hacia atrás): repetir la última salida
+        self.timestamp = timestamp
+
+        # Velocidad suavizada y frecuencia de corte por coordenada
+        a_d = self._alpha(dt, self.d_cutoff)
+        dx = (x - self.x) / dt
+        self.dx = a_d * dx + (1.0 - a_d) * self.dx
+        cutoff = self.min_cutoff + self.beta * np.abs(self.dx)
+
+        a = self._alpha(dt, cutoff)
+        self.x = (a * x + (1.0 - a) * self.x).astype(np.float32, copy=False)
+        return self.x.copy()
+
+
+class HandLandmarkFilter:
+    """Un OneEuroFilter por mano seguida, identificada por su lateralidad ('Left'/'Right')
+
+    Si una mano desaparece por más de `reset_after` segundos su filtro se
+    reinicia, así al volver no arrastra la posición vieja.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0, reset_after=0.3):
+        self.params = (min_cutoff, beta, d_cutoff)
+        self.reset_after = reset_after
+        self.filters = {}
+
+    def apply(self, hands, timestamp):
+        """Filtrar la lista de extract_hands(): [(array (21, 3), lateralidad, landmarks)]"""
+        filtered = []
+        seen = set()
+        for points, hand_type, landmarks in hands:
+            # Dos manos con la misma etiqueta (error de MediaPipe): la segunda tiene su propio filtro
+            key = hand_type if hand_type not in seen else f"{hand_type}#2"
+            seen.add(key)
+
+            hand_filter = self.filters.get(key)
+            if hand_filter is None or timestamp - hand_filter.timestamp > self.reset_after:
+                hand_filter = OneEuroFilter(*self.params)
+                self.filters[key] = hand_filter
+            filtered.append((hand_filter(points, timestamp), hand_type, landmarks))
+
+        # Olvidar las manos que ya no están (se reinician al reaparecer)
+        for key in [key for key, f in self.filters.items()
+                    if key not in seen and timestamp - f.timestamp > self.reset_after]:
+            del self.filters[key]
+        return filtered
+
+    def reset(self):
+        self.filters.clear()
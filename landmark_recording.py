@@ -0,0 +1,290 @@
+"""
+Grabación compacta de landmarks y reproducción sin inferencia
+
+Formato del archivo (.glr), columnar y mapeable en memoria:
+    MAGIC (8 bytes) | longitud del encabezado (uint64) | encabezado JSON | columnas
+
+Cada columna es un array de forma fija por frame (float32 para coordenadas)
+alineado a 64 bytes, así el lector las abre con np.memmap sin copiar nada.
+Del rostro se guardan solo los puntos clave que usa GestureDetector.
+"""
+import argparse
+import json
+import os
+import struct
+import time
+
+import numpy as np
+from config import GestureConfig
+from gesture_detector import NUM_HAND_LANDMARKS, NUM_FACE_KEYPOINTS
+
+MAGIC = b'GLMREC01'
+ALIGNMENT = 64
+CHUNK_FRAMES = 1024
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+HANDEDNESS_LABELS = ('Left', 'Right')
+HANDEDNESS_UNKNOWN = -1  # Lateralidad desconocida (se reproduce como None)
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def recording_columns(max_hands):
+    """Columnas del archivo: nombre -> (dtype, forma por frame)"""
+    return {
+        'timestamp': (np.float64, ()),
+        'hands': (np.float32, (max_hands, NUM_HAND_LANDMARKS, 3)),
+        'hand_present': (np.bool_, (max_hands,)),
+        'handedness': (np.int8, (max_hands,)),  # 0 = Left, 1 = Right, -1 = desconocida
+        'face': (np.float32, (NUM_FACE_KEYPOINTS, 3)),
+        'face_present': (np.bool_, ()),
+    }
+
+
+def _handedness_label(code):
+    """Código de la columna handedness -> 'Left', 'Right' o None"""
+    return HANDEDNESS_LABELS[code] if 0 <= code < len(HANDEDNESS_LABELS) else None
+
+
+class LandmarkRecorder:
+    """Graba por frame las manos, su lateralidad y el rostro que recibe detect_gestures
+
+    Los frames se acumulan en bloques en memoria y se vuelcan a un archivo
+    temporal por columna; close() arma el archivo final.
+    """
+
+    def __init__(self, path, max_hands=None):
+        self.path = path
+        self.max_hands = max_hands or GestureConfig.MAX_HANDS
+        self.columns = recording_columns(self.max_hands)
+        self.frames = 0
+        self.chunk_index = 0
+
+        self.chunks = {
+            name: np.zeros((CHUNK_FRAMES,) + shape, dtype=dtype)
+            for name, (dtype, shape) in self.columns.items()
+        }
+        self.temp_files = {name: open(f"{path}.{name}.tmp", 'wb') for name in self.columns}
+
+    def write(self, timestamp, hands, face):
+        """Agregar un frame: hands = [(array (21, 3), 'Left'/'Right', ...)], face = array o None"""
+        i = self.chunk_index
+        chunks = self.chunks
+        chunks['timestamp'][i] = timestamp
+        chunks['hand_present'][i] = False
+        chunks['handedness'][i] = HANDEDNESS_UNKNOWN
+        for slot, (points, hand_type, *_) in enumerate(hands[:self.max_hands]):
+            chunks['hands'][i, slot] = points
+            chunks['hand_present'][i, slot] = True
+            chunks['handedness'][i, slot] = HANDEDNESS_CODES.get(hand_type, HANDEDNESS_UNKNOWN)
+
+        chunks['face_present'][i] = face is not None
+        if face is not None:
+            chunks['face'][i] = face
+
+        self.frames += 1
+        self.chunk_index += 1
+        if self.chunk_index == CHUNK_FRAMES:
+            self._flush()
+
+    def _flush(self):
+        for name, chunk in self.chunks.items():
+            chunk[:self.chunk_index].tofile(self.temp_files[name])
+        self.chunk_index = 0
+
+    def close(self):
+        """Volcar lo pendiente y armar el archivo final"""
+        self._flush()
+        for f in self.temp_files.values():
+            f.close()
+
+        # Offsets relativos al inicio de la sección de datos
+        header = {'version': 1, 'frames': self.frames, 'max_hands': self.max_hands, 'columns': {}}
+        offset = 0
+        for name, (dtype, shape) in self.columns.items():
+            header['columns'][name] = {
+                'dtype': np.dtype(dtype).str,
+                'shape': [self.frames] + list(shape),
+                'offset': offset,
+            }
+            size = self.frames * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+            offset = _align(offset + size)
+
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+        with open(self.path, 'wb') as out:
+            out.write(MAGIC)
+            out.write(struct.pack('<Q', len(header_bytes)))
+            out.write(header_bytes)
+            for name, column in header['columns'].items():
+                out.write(b'\0' * (data_start + column['offset'] - out.tell()))
+                temp_path = f"{self.path}.{name}.tmp"
+                with open(temp_path, 'rb') as f:
+                    out.write(f.read())
+                os.remove(temp_path)
+
+        print(f"💾 Grabación guardada: {self.path} ({self.frames} frames)")
+
+
+class LandmarkRecording:
+    """Lector de grabaciones: cada columna es una vista de solo lectura sobre un np.memmap"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"No es una grabación de landmarks: {path}")
+            header_length, = struct.unpack('<Q', f.read(8))
+            self.header = json.loads(f.read(header_length))
+
+        data_start = _align(len(MAGIC) + 8 + header_length)
+        self.frames = self.header['frames']
+        self.max_hands = self.header['max_hands']
+        self.columns = {}
+        for name, column in self.header['columns'].items():
+            dtype = np.dtype(column['dtype'])
+            shape = tuple(column['shape'])
+            if self.frames == 0:
+                self.columns[name] = np.zeros(shape, dtype=dtype)
+            else:
+                # Vista ndarray sobre el memmap: indexar una subclase memmap en cada acceso por frame
+                # cuesta más que leer los datos
+                self.columns[name] = np.memmap(path, dtype=dtype, mode='r',
+                                               offset=data_start + column['offset'], shape=shape).view(np.ndarray)
+
+        self.timestamps = self.columns['timestamp']
+        self.hands = self.columns['hands']
+        self.hand_present = self.columns['hand_present']
+        self.handedness = self.columns['handedness']
+        self.face = self.columns['face']
+        self.face_present = self.columns['face_present']
+
+    def __len__(self):
+        return self.frames
+
+    def frame(self, index):
+        """Frame en el mismo formato que HandController.extract_hands: (timestamp, hands, face)
+
+        Las manos con lateralidad desconocida (-1) se devuelven con tipo None:
+        indexar HANDEDNESS_LABELS con -1 las convertiría en 'Right'.
+        """
+        hands = [
+            (self.hands[index, slot], _handedness_label(self.handedness[index, slot]), None)
+            for slot in range(self.max_hands) if self.hand_present[index, slot]
+        ]
+        face = self.face[index] if self.face_present[index] else None
+        return float(self.timestamps[index]), hands, face
+
+    def __iter__(self):
+        for index in range(self.frames):
+            yield self.frame(index)
+
+    def hand_batch(self, start=0, stop=None):
+        """Manos presentes de los frames [start, stop) apiladas, en el orden de frame()
+
+        Devuelve (frame, puntos (N, 21, 3), izquierda (N,)) sin recorrer los
+        frames en Python, para clasificar muchos frames en una sola pasada.
+        """
+        frame_index, slot = np.nonzero(self.hand_present[start:stop])
+        frame_index += start
+        points = self.hands[frame_index, slot]
+        left = self.handedness[frame_index, slot] == HANDEDNESS_CODES['Left']
+        return frame_index, points, left
+
+
+class ReplayClock:
+    """Reloj controlado por los timestamps de la grabación (sustituye a time.time)"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_replay_controller(clock):
+    """HandController sin cámara, MediaPipe ni acciones reales del sistema"""
+    from main import HandController
+    from media_control import MediaControl, NullMediaBackend
+    from volume_control import VolumeControl, NullVolumeBackend
+
+    return HandController(
+        headless=True, inference=False, clock=clock,
+        volume_control=VolumeControl(NullVolumeBackend()),
+        media_control=MediaControl(backend=NullMediaBackend()),
+    )
+
+
+def recording_shapes(recording, classifier, chunk=CHUNK_FRAMES):
+    """Formas del clasificador para cada frame de la grabación (generador de listas, una por frame)
+
+    La red corre una vez por bloque de `chunk` frames en lugar de una vez por
+    frame, que es lo que domina la reproducción con clasificador.
+    """
+    for start in range(0, len(recording), chunk):
+        stop = min(start + chunk, len(recording))
+        frame_index, points, left = recording.hand_batch(start, stop)
+        shapes = classifier.predict_batch(points, left) if len(points) else []
+        # Las manos de cada frame quedan contiguas: cortar por la cantidad de manos de cada uno
+        ends = np.searchsorted(frame_index, np.arange(start, stop), side='right').tolist()
+        begin = 0
+        for end in ends:
+            yield shapes[begin:end]
+            begin = end
+
+
+def replay(path, controller=None, clock=None):
+    """Alimentar detect_gestures y los process_* desde una grabación, sin inferencia
+
+    Devuelve un dict acción -> cantidad de veces que se disparó.
+    """
+    recording = LandmarkRecording(path)
+    if controller is None:
+        clock = ReplayClock()
+        controller = create_replay_controller(clock)
+
+    # Con clasificador, todas las manos se clasifican por bloques y cada frame recibe su resultado por
+    # la caché de hand_shapes. Con el filtro de landmarks las manos cambian antes de clasificarse:
+    # se clasifica frame a frame
+    shapes = None
+    if controller.gesture_classifier is not None and controller.landmark_filter is None:
+        shapes = recording_shapes(recording, controller.gesture_classifier)
+
+    actions = {}
+    try:
+        for timestamp, hands, face in recording:
+            if clock is not None:
+                clock.now = timestamp
+            if shapes is not None:
+                controller.hand_shapes_cache = (hands, next(shapes))
+            controller.process_landmarks(hands, face)
+            for action in controller.last_actions:
+                actions[action] = actions.get(action, 0) + 1
+    finally:
+        controller.close()
+    return actions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproducir una grabación de landmarks sin inferencia")
+    parser.add_argument("recording", help="Archivo .glr grabado con main.py --record")
+    parser.add_argument("--classifier", metavar="ARCHIVO",
+                        help="Clasificador de gestos entrenado con train_classifier.py (.npz)")
+    args = parser.parse_args()
+    if args.classifier:
+        GestureConfig.GESTURE_CLASSIFIER_PATH = args.classifier
+
+    # El controlador (importar main y mediapipe) se crea fuera de la medición
+    clock = ReplayClock()
+    controller = create_replay_controller(clock)
+    start = time.perf_counter()
+    actions = replay(args.recording, controller, clock)
+    elapsed = time.perf_counter() - start
+    frames = len(LandmarkRecording(args.recording))
+
+    print(f"📊 {frames} frames en {elapsed:.2f} s ({frames / elapsed if elapsed > 0 else 0:.0f} frames/s)")
+    for action, count in sorted(actions.items()):
+        print(f"   {action}: {count}")
@@ -1,267 +1,482 @@
+import argparse
+import signal
 import cv2
 import mediapipe as mp
+import numpy as np
 import time
-from gesture_detector import GestureDetector
+from gesture_detector import (
+    GestureDetector, landmarks_to_array, face_landmarks_to_array, mirror_landmark_list,
+    MIRRORED_HANDEDNESS, FACE_LEFT_EYE, FACE_RIGHT_EYE, HAND_SHAPES
+)
 from volume_control import VolumeControl
 from media_control import MediaControl
 from config import GestureConfig
+from frame_capture import DirectCapture, ThreadedCapture
+from frame_sources import create_frame_source
+from action_dispatcher import ActionDispatcher
+from landmark_recording import LandmarkRecorder
+from metrics import PipelineMetrics, MetricsServer, MetricsFileWriter
+from action_trace import ActionTracer
+from landmark_filter import HandLandmarkFilter
+from gesture_classifier import GestureClassifier
+from gesture_engine import GestureEngine, GestureFrame
+from gesture_rules import build_default_rules
+from ui_overlay import OverlayCache, PANEL_TEXT_COLOR, PANEL_WARNING_COLOR
+from allocation_monitor import AllocationMonitor
+from multi_camera import MultiCameraController
+from activity_governor import ActivityGovernor, MotionDetector, ACTIVE, IDLE
+from inference_pool import (
+    InferencePool, create_hands_graph, create_face_graph, create_face_roi_tracker, create_holistic_graph,
+    face_array, landmark_list_from_array
+)
+
+WINDOW_NAME = 'Control Multimedia con Manos'
+
+# Mensaje de cada estado del gobernador de actividad
+ACTIVITY_ICONS = {"active": "🟢", "idle": "🟡", "sleep": "💤"}
+
+# Instrucciones sin caracteres especiales (panel inferior)
+INSTRUCTIONS = (
+    "Dos manos abiertas: Control volumen",
+    "Palma a Puno: Play/Pause",
+    "Puno + cabeza inclinada 35 grados: Cambiar cancion",
+    "Q: Salir",
+)
 
 class HandController:
-    def __init__(self):
-        # Inicializar MediaPipe para manos
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False, 
-            max_num_hands=GestureConfig.MAX_HANDS, 
-            min_detection_confidence=GestureConfig.MEDIAPIPE_CONFIDENCE
-        )
-        
-        # Inicializar MediaPipe para rostro
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, headless=None, inference=True, clock=time.time,
+                 volume_control=None, media_control=None, source=None):
+        # Sin inferencia (reproducción de grabaciones) no hay cámara, MediaPipe ni ventana
+        self.inference_enabled = inference
+        
+        # Modo headless: sin ventana ni dibujo (mismo procesamiento de gestos)
+        self.headless = GestureConfig.HEADLESS if headless is None else headless
+        self.headless = self.headless or not inference
+        self.running = False
+        self.frames_processed = 0
+        self.run_start_time = time.perf_counter()
+        
+        # Reloj de las máquinas de estado y cooldowns (se sustituye al reproducir grabaciones)
+        self.clock = clock
+        
+        # Grafos de MediaPipe: un solo grafo Holistic, o Hands y el del rostro en este proceso
+        # (uno después del otro) o cada uno en su propio proceso, en paralelo, leyendo el frame
+        # de memoria compartida
+        self.hands = None
+        self.face_mesh = None
+        self.face_roi = None
+        self.holistic = None
+        self.inference_pool = None
+        if inference:
+            self.mp_hands = mp.solutions.hands
+            self.mp_draw = mp.solutions.drawing_utils
+            if GestureConfig.FACE_ROI_TRACKING and GestureConfig.HEAD_POSE_PROVIDER != "face_mesh":
+                print(f"⚠️ FACE_ROI_TRACKING solo aplica a FaceMesh: sin efecto con HEAD_POSE_PROVIDER = "
+                      f"\"{GestureConfig.HEAD_POSE_PROVIDER}\" (usar --head-pose face_mesh)")
+            if GestureConfig.INFERENCE_BACKEND == "holistic":
+                self.holistic = create_holistic_graph()
+                print("🧍 Inferencia con un solo grafo Holistic (manos y rostro en una llamada)")
+            elif GestureConfig.INFERENCE_EXECUTION == "processes":
+                self.inference_pool = InferencePool(GestureConfig.INFERENCE_RING_SLOTS, GestureConfig.INFERENCE_TIMEOUT)
+                print("🧵 Inferencia en procesos separados (Hands y FaceMesh en paralelo)")
+            else:
+                self.hands = create_hands_graph()
+                self.face_mesh = create_face_graph()  # FaceMesh o FaceDetection según HEAD_POSE_PROVIDER
+                self.face_roi = create_face_roi_tracker()  # Recorte alrededor del último rostro (opcional)
         
         # Inicializar componentes
         self.gesture_detector = GestureDetector()
-        self.volume_control = VolumeControl()
-        self.media_control = MediaControl()
+        self.volume_control = volume_control if volume_control is not None else VolumeControl()
+        
+        # Métricas de rendimiento (panel, endpoint Prometheus y/o archivo)
+        self.metrics = PipelineMetrics(GestureConfig.METRICS_WINDOW)
+        self.metrics_server = None
+        self.metrics_writer = None
+        if inference and GestureConfig.METRICS_PORT:
+            self.metrics_server = MetricsServer(self.metrics, GestureConfig.METRICS_PORT).start()
+        if inference and GestureConfig.METRICS_FILE:
+            self.metrics_writer = MetricsFileWriter(
+                self.metrics, GestureConfig.METRICS_FILE, GestureConfig.METRICS_FILE_INTERVAL
+            )
+        
+        # Trazas de latencia captura -> acción (log JSON por línea opcional, resumen al salir)
+        self.tracer = ActionTracer(GestureConfig.TRACE_PATH if inference else None)
+        
+        # Las acciones del sistema (volumen, teclas multimedia) se ejecutan en un hilo aparte
+        self.dispatcher = ActionDispatcher(self.volume_control, observer=self.metrics.observe_dispatch).start()
+        if media_control is None:
+            media_control = MediaControl(self.dispatcher, tracer=self.tracer)
+        elif media_control.tracer is None:
+            media_control.tracer = self.tracer
+        self.media_control = media_control
+        
+        # Grabación de landmarks (opcional)
+        self.recorder = None
+        if GestureConfig.RECORD_PATH and inference:
+            self.recorder = LandmarkRecorder(GestureConfig.RECORD_PATH)
+            print(f"💾 Grabando landmarks en {GestureConfig.RECORD_PATH}")
         
         # Estados
         self.current_mode = "idle"  # idle, volume, play_pause, media
-        self.last_gesture = None
+        self.last_actions = []  # Acciones disparadas en el último frame procesado
+        self.volume_state = (False, None, None, None)  # (activo, volumen, centro izq, centro der)
         self.last_gesture_time = 0
         self.mode_cooldown = 0.5
         
-        # Estados de play/pause
-        self.pause_state = "waiting"  # waiting, palm_detected, ready_to_toggle
-        self.pause_palm_time = 0
-        self.palm_hold_duration = GestureConfig.PALM_HOLD_DURATION
-        
-        # Sistema de estabilización de gestos
-        self.gesture_history = []
-        self.stable_gesture_count = 0
-        self.required_stable_frames = GestureConfig.STABLE_FRAMES_REQUIRED
+        # Caché de los paneles de la UI y último texto de ángulo y métricas mostrado
+        self.overlay = OverlayCache()
+        self.metrics_panel_time = 0.0
+        self.angle_panel_line = "Inclinacion: --"
+        self.metrics_panel_lines = []
+        self.metrics_low_fps = False
+        
+        # Resolución de inferencia y buffers reutilizados para la imagen de los modelos
+        self.inference_width = GestureConfig.INFERENCE_WIDTH
+        self.inference_height = GestureConfig.INFERENCE_HEIGHT
+        self.inference_size = None
+        self.inference_bgr = None
+        self.inference_rgb = None
+        
+        # Vista espejada para la ventana (la inferencia usa el frame sin espejar)
+        self.display_frame = None
+        
+        # Memoria reservada por frame (solo en modo debug)
+        self.allocation_monitor = None
+        if GestureConfig.DEBUG_ALLOCATIONS and inference:
+            self.allocation_monitor = AllocationMonitor().start()
+        
+        # Planificación de FaceMesh (último resultado reutilizado entre ejecuciones)
+        self.last_face = None
+        self.last_hands = []
+        self.face_skipped_frames = GestureConfig.FACE_MESH_IDLE_INTERVAL
+        
+        # Suavizado One Euro de los landmarks de cada mano antes del detector (opcional)
+        self.landmark_filter = None
+        if GestureConfig.LANDMARK_FILTER:
+            self.landmark_filter = HandLandmarkFilter(
+                GestureConfig.LANDMARK_FILTER_MIN_CUTOFF, GestureConfig.LANDMARK_FILTER_BETA
+            )
         
-        # Inicializar webcam
-        print(f"🎥 Inicializando cámara {GestureConfig.CAMERA_INDEX}...")
-        self.cap = cv2.VideoCapture(GestureConfig.CAMERA_INDEX)
+        # Clasificador aprendido de la forma de la mano (opcional; si no, umbrales del detector)
+        self.gesture_classifier = None
+        self.hand_shapes_cache = None  # (lista de manos, formas) de la última pasada del clasificador
+        if GestureConfig.GESTURE_CLASSIFIER_PATH:
+            self.gesture_classifier = GestureClassifier.load(
+                GestureConfig.GESTURE_CLASSIFIER_PATH, GestureConfig.CLASSIFIER_MIN_CONFIDENCE
+            )
+            print(f"🧠 Clasificador de gestos: {GestureConfig.GESTURE_CLASSIFIER_PATH} "
+                  f"({', '.join(self.gesture_classifier.classes)})")
+            missing = [name for name in HAND_SHAPES if name not in self.gesture_classifier.classes]
+            if missing:
+                print(f"⚠️ El clasificador no aprendió {', '.join(missing)}: esas formas se detectan con los umbrales")
         
-        # Configurar resolución de la cámara
-        if self.cap.isOpened():
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, GestureConfig.CAMERA_WIDTH)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, GestureConfig.CAMERA_HEIGHT)
-            
-            # Verificar resolución actual
-            actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            print(f"📐 Resolución configurada: {actual_width}x{actual_height}")
+        # Frames estables requeridos por los gestos con estabilización
+        self.required_stable_frames = GestureConfig.STABLE_FRAMES_REQUIRED
+        if self.landmark_filter is not None:
+            # Con landmarks sin temblor alcanzan menos frames para confirmar un gesto
+            self.required_stable_frames = GestureConfig.LANDMARK_FILTER_STABLE_FRAMES
+        if self.gesture_classifier is not None:
+            # Clasificación más fiable por frame: también alcanzan menos frames
+            self.required_stable_frames = min(self.required_stable_frames, GestureConfig.CLASSIFIER_STABLE_FRAMES)
+        
+        # Gestos de play/pause y multimedia declarados en gesture_rules.py (secuencias, esperas y cooldowns)
+        self.gesture_engine = GestureEngine(build_default_rules(self))
+        
+        if not inference:
+            self.source = None
+            self.capture = None
+            self.governor = None
+            return
+        
+        # Fuente de frames: cámara, video, secuencia de imágenes o pipe
+        self.source = source if source is not None else create_frame_source()
+        
+        # Captura en hilo separado para fuentes en vivo (solo se procesa el frame más reciente);
+        # los archivos sin tiempo real se leen de forma síncrona para no perder frames
+        if GestureConfig.CAPTURE_THREADED and self.source.live:
+            self.capture = ThreadedCapture(self.source, GestureConfig.CAPTURE_BUFFER_SIZE)
         else:
-            raise Exception("No se pudo inicializar la cámara")
+            self.capture = DirectCapture(self.source)
+        self.capture.start()
+        
+        # Sin manos a la vista: bajar frecuencia y resolución (idle) y luego solo buscar movimiento
+        # (sleep). Solo en fuentes en vivo: los archivos se procesan completos para medir y reproducir
+        self.governor = None
+        if GestureConfig.ACTIVITY_GOVERNOR and self.source.live:
+            self.governor = ActivityGovernor(
+                GestureConfig.IDLE_AFTER, GestureConfig.SLEEP_AFTER,
+                MotionDetector(GestureConfig.SLEEP_MOTION_FRACTION),
+                min_hold=GestureConfig.ACTIVITY_MIN_HOLD
+            )
             
-        # Configurar ventana
-        cv2.namedWindow('Control Multimedia con Manos', cv2.WINDOW_NORMAL)
+        # Configurar ventana (no se crea en modo headless)
+        if self.headless:
+            print("🕶️ Modo headless: sin ventana ni dibujo")
+            return
+        cv2.namedWindow(WINDOW_NAME, cv2.WINDOW_NORMAL)
         if GestureConfig.WINDOW_SCALE != 1.0:
             window_width = int(GestureConfig.CAMERA_WIDTH * GestureConfig.WINDOW_SCALE)
             window_height = int(GestureConfig.CAMERA_HEIGHT * GestureConfig.WINDOW_SCALE)
-            cv2.resizeWindow('Control Multimedia con Manos', window_width, window_height)
+            cv2.resizeWindow(WINDOW_NAME, window_width, window_height)
             print(f"🖼️ Ventana redimensionada: {window_width}x{window_height}")
 
-    def detect_gestures(self, hand_results, face_results):
-        """Detectar gestos en ambas manos y rostro"""
-        # Guardar face landmarks para dibujar después
-        self.face_landmarks = None
-        if face_results.multi_face_landmarks:
-            self.face_landmarks = face_results.multi_face_landmarks[0]
-            
+    def get_inference_size(self, frame_width, frame_height):
+        """Calcular el tamaño (ancho, alto) de la imagen que reciben los modelos"""
+        if not self.inference_width or self.inference_width >= frame_width:
+            return frame_width, frame_height
+        
+        width = int(self.inference_width)
+        height = self.inference_height or round(frame_height * width / frame_width)
+        return width, int(height)
+
+    def prepare_inference_image(self, frame):
+        """Reducir el frame a la resolución de inferencia y convertir a RGB en buffers reutilizados
+
+        Con el pool de inferencia el RGB se escribe directamente en el slot del
+        anillo de memoria compartida que leerán los workers.
+        """
+        h, w = frame.shape[:2]
+        size = self.get_inference_size(w, h)
+        
+        # Reservar los buffers solo cuando cambia la resolución
+        if size != self.inference_size:
+            self.inference_size = size
+            self.inference_bgr = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self.inference_rgb = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            if self.inference_pool is not None:
+                # El anillo compartido se reserva al tamaño del frame (el máximo posible), así
+                # los cambios de resolución del gobernador no lo recrean en todos los workers
+                self.inference_pool.reserve(w, h)
+        
+        source = frame
+        if size != (w, h):
+            cv2.resize(frame, size, dst=self.inference_bgr, interpolation=cv2.INTER_AREA)
+            source = self.inference_bgr
+        
+        rgb = self.inference_rgb
+        if self.inference_pool is not None:
+            rgb = self.inference_pool.buffer(self.frames_processed, *size)
+        cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def prepare_display_frame(self, frame):
+        """Espejar el frame para la ventana en un buffer reutilizado (solo cuando se dibuja)"""
+        if self.display_frame is None or self.display_frame.shape != frame.shape:
+            self.display_frame = np.empty_like(frame)
+        return cv2.flip(frame, 1, dst=self.display_frame)
+
+    def apply_activity_state(self):
+        """Ajustar frecuencia de captura y resolución de inferencia al estado del gobernador"""
+        state = self.governor.state
+        if state == ACTIVE:
+            self.inference_width = GestureConfig.INFERENCE_WIDTH
+            self.inference_height = GestureConfig.INFERENCE_HEIGHT
+            self.capture.set_frame_interval(0.0)
+        else:
+            self.inference_width = GestureConfig.IDLE_INFERENCE_WIDTH
+            self.inference_height = None  # Mantener la proporción de la cámara
+            fps = GestureConfig.IDLE_FPS if state == IDLE else GestureConfig.SLEEP_FPS
+            self.capture.set_frame_interval(1.0 / fps)
+        
+        if GestureConfig.SHOW_DEBUG_INFO:
+            print(f"{ACTIVITY_ICONS[state]} Actividad: {state}")
+
+    def extract_hands(self, hand_results):
+        """Convertir el resultado de MediaPipe Hands a [(array (21, 3), 'Left'/'Right', landmarks)]
+
+        Los modelos reciben el frame sin espejar: el espejo se aplica aquí a
+        los landmarks (x -> 1 - x) y a la lateralidad, que MediaPipe calcula
+        suponiendo una imagen espejada. Las listas de MediaPipe solo se
+        reflejan si se van a dibujar.
+        """
         if not hand_results.multi_hand_landmarks or not hand_results.multi_handedness:
-            return None, None, []
+            return []
         
-        # Obtener landmarks del rostro si están disponibles
-        face_landmarks = None
-        if face_results.multi_face_landmarks:
-            face_landmarks = face_results.multi_face_landmarks[0]  # Usar la primera cara detectada
-            
-        hand_data = []
+        hands = []
         for hand_landmarks, handedness in zip(hand_results.multi_hand_landmarks, hand_results.multi_handedness):
-            hand_type = handedness.classification[0].label
-            
-            # Detectar gesto de puño con inclinación de cabeza
-            is_fist_head_tilt, fist_head_direction = self.gesture_detector.is_fist_with_head_tilt(
-                hand_landmarks, face_landmarks
-            )
+            points = landmarks_to_array(hand_landmarks, mirror=True)
+            if not self.headless:
+                mirror_landmark_list(hand_landmarks)  # Para dibujarla sobre la vista espejada
+            label = handedness.classification[0].label
+            hands.append((points, MIRRORED_HANDEDNESS.get(label, label), hand_landmarks))
+        return hands
+
+    def extract_holistic(self, holistic_results):
+        """Convertir el resultado de Holistic a (manos como extract_hands, rostro como process_face)
+
+        Holistic nombra las manos desde la persona (left_hand_landmarks es su
+        mano izquierda), que es la misma lateralidad que extract_hands deja
+        tras espejar; solo las coordenadas se reflejan.
+        """
+        hands = []
+        for hand_landmarks, label in ((holistic_results.left_hand_landmarks, 'Left'),
+                                      (holistic_results.right_hand_landmarks, 'Right')):
+            if hand_landmarks is None:
+                continue
+            points = landmarks_to_array(hand_landmarks, mirror=True)
+            if not self.headless:
+                mirror_landmark_list(hand_landmarks)  # Para dibujarla sobre la vista espejada
+            hands.append((points, label, hand_landmarks))
+        
+        face = None
+        if holistic_results.face_landmarks is not None:
+            face = face_landmarks_to_array(holistic_results.face_landmarks, mirror=True)
+        self.last_face = face
+        return hands, face
+
+    def hand_shapes(self, hands):
+        """Forma de cada mano según el clasificador, en una sola pasada por la red
+
+        El resultado se guarda junto a la lista de manos: la planificación de
+        FaceMesh y detect_gestures reciben la misma lista y comparten la pasada.
+        """
+        if self.hand_shapes_cache is not None and self.hand_shapes_cache[0] is hands:
+            return self.hand_shapes_cache[1]
+        shapes = self.gesture_classifier.predict([hand for hand, _, _ in hands], [hand_type for _, hand_type, _ in hands])
+        self.hand_shapes_cache = (hands, shapes)
+        return shapes
+
+    def should_run_face_mesh(self, hands):
+        """Decidir si este frame necesita FaceMesh o puede reutilizar el último resultado"""
+        if GestureConfig.FACE_MESH_SCHEDULE == "always":
+            return True
+        
+        # Con puño cerrado la inclinación de cabeza se evalúa a frecuencia completa (con el
+        # clasificador activo, según la misma forma que usará classify())
+        if self.gesture_classifier is not None and "fist" in self.gesture_classifier.classes:
+            if "fist" in self.hand_shapes(hands):
+                return True
+        elif any(self.gesture_detector.is_fist(hand) for hand, _, _ in hands):
+            return True
+        
+        # Con otras manos a la vista: frecuencia reducida, reutilizando el último rostro
+        if self.face_skipped_frames + 1 >= GestureConfig.FACE_MESH_IDLE_INTERVAL:
+            return True
+        
+        return False
+
+    def infer(self, rgb):
+        """Ejecutar los modelos sobre la imagen de inferencia: devuelve (manos, rostro)"""
+        if self.inference_pool is not None:
+            return self.infer_in_pool()
+        if self.holistic is not None:
+            start = time.perf_counter()
+            results = self.holistic.process(rgb)
+            self.metrics.observe_inference("holistic", time.perf_counter() - start)
+            return self.extract_holistic(results)
+        
+        start = time.perf_counter()
+        results = self.hands.process(rgb)
+        self.metrics.observe_inference("hands", time.perf_counter() - start)
+        
+        # Convertir cada mano a array (21, 3) una sola vez por frame
+        hands = self.extract_hands(results)
+        return hands, self.process_face(rgb, hands)
+
+    def infer_in_pool(self):
+        """Hands y FaceMesh en paralelo en el pool de procesos, juntados por número de frame
+
+        Las manos de este frame todavía no se conocen al lanzar FaceMesh, así
+        que la planificación decide con las del frame anterior: al aparecer
+        una mano el rostro llega un frame después.
+        """
+        gated = GestureConfig.FACE_MESH_SCHEDULE != "always"
+        run_face = not gated or bool(self.last_hands) and self.should_run_face_mesh(self.last_hands)
+        points, face, durations = self.inference_pool.process(self.frames_processed, run_face)
+        for kind, name in (("hands", "hands"), ("face", GestureConfig.HEAD_POSE_PROVIDER)):
+            if kind in durations:
+                self.metrics.observe_inference(name, durations[kind])
+        
+        # Las listas de MediaPipe solo hacen falta para dibujar
+        hands = [
+            (hand, label, None if self.headless else landmark_list_from_array(hand))
+            for hand, label in points
+        ]
+        self.last_hands = hands
+        
+        if not hands and gated:
+            self.last_face = None
+            self.face_skipped_frames = GestureConfig.FACE_MESH_IDLE_INTERVAL  # Forzar ejecución al aparecer una mano
+            return hands, None
+        if run_face:
+            self.face_skipped_frames = 0
+            self.last_face = face
+        else:
+            self.face_skipped_frames += 1
+        return hands, self.last_face
+
+    def process_face(self, rgb, hands):
+        """Ejecutar el modelo del rostro según la planificación configurada y devolver el rostro como array"""
+        # Sin manos el rostro no se usa: no ejecutar FaceMesh
+        if not hands and GestureConfig.FACE_MESH_SCHEDULE != "always":
+            self.last_face = None
+            self.face_skipped_frames = GestureConfig.FACE_MESH_IDLE_INTERVAL  # Forzar ejecución al aparecer una mano
+            return None
+        
+        if not self.should_run_face_mesh(hands):
+            self.face_skipped_frames += 1
+            return self.last_face
+        
+        self.face_skipped_frames = 0
+        start = time.perf_counter()
+        if self.face_roi is not None:
+            face = self.face_roi.process(self.face_mesh, rgb, mirror=True)
+        else:
+            face = face_array(self.face_mesh.process(rgb))  # Usar la primera cara detectada
+        self.metrics.observe_inference(GestureConfig.HEAD_POSE_PROVIDER, time.perf_counter() - start)
+        self.last_face = face
+        return face
+
+    def detect_gestures(self, hands, face):
+        """Detectar gestos en ambas manos y rostro"""
+        # Guardar el rostro para dibujar después
+        self.face_landmarks = face
             
-            # Verificar si la mano está tocando la cara (VALIDACIÓN DE SEGURIDAD)
-            is_touching_face = self.gesture_detector.is_hand_touching_face(hand_landmarks, face_landmarks)
+        if not hands:
+            return None, None, []
             
-            hand_data.append({
-                'type': hand_type,
-                'landmarks': hand_landmarks,
-                'is_palm': self.gesture_detector.is_palm_open(hand_landmarks),
-                'is_fist': self.gesture_detector.is_fist(hand_landmarks),
-                'is_cord': self.gesture_detector.is_cord_grip(hand_landmarks),
-                'is_gun': self.gesture_detector.is_gun_gesture(hand_landmarks),
-                'is_peace': self.gesture_detector.is_peace_sign(hand_landmarks),
-                'is_fist_head_tilt': is_fist_head_tilt,
-                'gun_direction': self.gesture_detector.get_gun_direction(hand_landmarks) if self.gesture_detector.is_gun_gesture(hand_landmarks) else None,
-                'peace_direction': self.gesture_detector.get_peace_direction(hand_landmarks) if self.gesture_detector.is_peace_sign(hand_landmarks) else None,
-                'fist_head_direction': fist_head_direction,
-                'center': self.gesture_detector.get_hand_center(hand_landmarks),
-                'is_touching_face': is_touching_face  # NUEVA VALIDACIÓN
-            })
+        # Forma de todas las manos del frame en una sola pasada por el clasificador (si hay)
+        shapes = [None] * len(hands)
+        learned = ()
+        if self.gesture_classifier is not None:
+            shapes = self.hand_shapes(hands)
+            learned = self.gesture_classifier.classes
+        
+        # Clasificar cada mano en una sola pasada (todos los gestos a la vez)
+        hand_data = [
+            self.gesture_detector.classify(hand, face, hand_type, hand_landmarks, shape, learned)
+            for (hand, hand_type, hand_landmarks), shape in zip(hands, shapes)
+        ]
         
         # Separar manos izquierda y derecha
-        left_hand = next((h for h in hand_data if h['type'] == 'Left'), None)
-        right_hand = next((h for h in hand_data if h['type'] == 'Right'), None)
+        left_hand = next((h for h in hand_data if h.type == 'Left'), None)
+        right_hand = next((h for h in hand_data if h.type == 'Right'), None)
         
         return left_hand, right_hand, hand_data
 
     def process_volume_control(self, left_hand, right_hand):
         """Procesar control de volumen con ambas manos"""
-        if left_hand and right_hand and left_hand['is_cord'] and right_hand['is_cord']:
+        if left_hand and right_hand and left_hand.is_cord and right_hand.is_cord:
             
             # VALIDACIÓN DE SEGURIDAD: No funcionar si cualquier mano está cerca de la cara
-            if left_hand.get('is_touching_face') or right_hand.get('is_touching_face'):
+            if left_hand.is_touching_face or right_hand.is_touching_face:
                 return False, None, None, None
                 
             self.current_mode = "volume"
             
             # Calcular distancia entre manos
             distance = self.gesture_detector.calculate_distance(
-                left_hand['center'], right_hand['center']
+                left_hand.center, right_hand.center
             )
             
             # Mapear a volumen
             volume = self.volume_control.map_distance_to_volume(distance)
-            self.volume_control.set_volume(volume)
+            self.dispatcher.set_volume(volume, trace=self.tracer.action("volume"))
             
-            return True, volume, left_hand['center'], right_hand['center']
+            return True, volume, left_hand.center, right_hand.center
         
         return False, None, None, None
 
-    def process_play_pause_control(self, hand_data):
-        """Procesar control de play/pause con secuencia palma->puño"""
-        current_time = time.time()
-        
-        if hand_data and len(hand_data) == 1:  # Solo una mano visible
-            hand = hand_data[0]
-            
-            # VALIDACIÓN DE SEGURIDAD: No funcionar si la mano está cerca de la cara
-            if hand.get('is_touching_face'):
-                self.pause_state = "waiting"  # Reset estado si toca la cara
-                return False
-            
-            if self.pause_state == "waiting" and hand['is_palm']:
-                self.pause_state = "palm_detected"
-                self.pause_palm_time = current_time
-                
-            elif self.pause_state == "palm_detected":
-                if hand['is_palm'] and (current_time - self.pause_palm_time) >= self.palm_hold_duration:
-                    self.pause_state = "ready_to_toggle"
-                elif hand['is_fist']:
-                    self.pause_state = "waiting"  # Reset si cierra muy rápido
-                elif not hand['is_palm']:
-                    self.pause_state = "waiting"  # Reset si cambia gesto
-                    
-            elif self.pause_state == "ready_to_toggle" and hand['is_fist']:
-                if self.media_control.play_pause():
-                    self.pause_state = "waiting"
-                    self.current_mode = "play_pause"
-                    return True
-                    
-        else:
-            self.pause_state = "waiting"
-            
-        return False
-
-    def is_gesture_stable(self, gesture_type):
-        """Verificar si un gesto es estable (se mantiene por varias frames)"""
-        if not GestureConfig.REQUIRE_STABLE_GESTURE:
-            return True
-            
-        # Agregar gesto actual al historial
-        self.gesture_history.append(gesture_type)
-        
-        # Mantener solo las últimas N frames
-        if len(self.gesture_history) > self.required_stable_frames:
-            self.gesture_history.pop(0)
-        
-        # Verificar si las últimas N frames tienen el mismo gesto
-        if len(self.gesture_history) >= self.required_stable_frames:
-            return all(g == gesture_type for g in self.gesture_history)
-        
-        return False
-
-    def process_media_control(self, hand_data):
-        """Procesar controles multimedia con gesto mejorado y estabilización"""
-        if hand_data and len(hand_data) == 1:  # Solo una mano visible
-            hand = hand_data[0]
-            
-            # VALIDACIÓN DE SEGURIDAD: No funcionar si la mano está cerca de la cara
-            if hand.get('is_touching_face'):
-                self.gesture_history = []  # Reset historial si toca la cara
-                return False, None
-            
-            # Determinar qué gesto usar según configuración
-            current_gesture = None
-            direction = None
-            
-            if GestureConfig.MEDIA_GESTURE_MODE == "fist_head_tilt" and hand['is_fist_head_tilt']:
-                current_gesture = "fist_head_tilt"
-                direction = hand['fist_head_direction']
-            elif GestureConfig.MEDIA_GESTURE_MODE == "peace" and hand['is_peace']:
-                current_gesture = "peace"
-                direction = hand['peace_direction']
-            elif GestureConfig.MEDIA_GESTURE_MODE == "gun" and hand['is_gun']:
-                current_gesture = "gun"  
-                direction = hand['gun_direction']
-            
-            # Para fist_head_tilt, no usar estabilización porque ya tiene timeout interno
-            if current_gesture == "fist_head_tilt" and direction:
-                self.current_mode = "media"
-                print(f"🎯 Ejecutando gesto HEAD TILT: {current_gesture} hacia {direction}")
-                
-                if direction == "right":
-                    if self.media_control.next_track():
-                        print("✅ Siguiente canción ejecutada con HEAD TILT")
-                        return True, f"next_{current_gesture}"
-                    else:
-                        print("❌ Error al ejecutar siguiente canción")
-                elif direction == "left":
-                    if self.media_control.previous_track():
-                        print("✅ Canción anterior ejecutada con HEAD TILT")
-                        return True, f"previous_{current_gesture}"
-                    else:
-                        print("❌ Error al ejecutar canción anterior")
-            # Para otros gestos, usar estabilización
-            elif current_gesture and direction and self.is_gesture_stable(current_gesture):
-                self.current_mode = "media"
-                print(f"🎯 Ejecutando gesto: {current_gesture} hacia {direction}")
-                
-                if direction == "right":
-                    if self.media_control.next_track():
-                        print("✅ Siguiente canción ejecutada")
-                        return True, f"next_{current_gesture}"
-                    else:
-                        print("❌ Error al ejecutar siguiente canción")
-                elif direction == "left":
-                    if self.media_control.previous_track():
-                        print("✅ Canción anterior ejecutada")
-                        return True, f"previous_{current_gesture}"
-                    else:
-                        print("❌ Error al ejecutar canción anterior")
-            else:
-                # Reset si no hay gesto válido
-                self.gesture_history = []
-                        
-        return False, None
-
     def draw_text_with_background(self, frame, text, position, font_scale=0.6, color=(255, 255, 255), thickness=1):
         """Dibujar texto con fondo negro para mejor visibilidad"""
         font = cv2.FONT_HERSHEY_SIMPLEX
@@ -276,21 +491,26 @@ class HandController:
         cv2.putText(frame, text, position, font, font_scale, color, thickness)
 
     def draw_info_panel(self, frame):
-        """Dibujar panel de información en la esquina superior izquierda"""
+        """Actualizar el panel de información de la esquina superior izquierda (caché de la UI)"""
         h, w, _ = frame.shape
         
         # Información a mostrar
         info_lines = []
         
+        # El ángulo y las métricas cambian casi en cada frame: se actualizan cada METRICS_PANEL_INTERVAL
+        # (el ángulo en grados enteros) para no redibujar el panel en cada frame
+        now = time.perf_counter()
+        refresh = now - self.metrics_panel_time >= GestureConfig.METRICS_PANEL_INTERVAL
+        if refresh:
+            self.metrics_panel_time = now
+        
         # Siempre mostrar grado de inclinación
-        if hasattr(self.gesture_detector, 'last_head_angle'):
-            angle = self.gesture_detector.last_head_angle
-            info_lines.append(f"Inclinacion: {angle:.1f}°")
-        else:
-            info_lines.append("Inclinacion: --")
+        if refresh and hasattr(self.gesture_detector, 'last_head_angle'):
+            self.angle_panel_line = f"Inclinacion: {self.gesture_detector.last_head_angle:.0f}°"
+        info_lines.append(self.angle_panel_line)
         
         # Estado de detección
-        if hasattr(self, 'face_landmarks') and self.face_landmarks:
+        if getattr(self, 'face_landmarks', None) is not None:
             info_lines.append("Rostro: Detectado")
         else:
             info_lines.append("Rostro: No detectado")
@@ -299,7 +519,7 @@ class HandController:
         hand_touching_face = False
         if hasattr(self, 'current_hand_data') and self.current_hand_data:
             for hand in self.current_hand_data:
-                if hand.get('is_touching_face'):
+                if hand.is_touching_face:
                     hand_touching_face = True
                     break
         
@@ -315,121 +535,28 @@ class HandController:
             }
             info_lines.append(mode_text.get(self.current_mode, "Modo: Desconocido"))
         
-        # Calcular tamaño del panel
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.4
-        thickness = 1
-        line_height = 18
-        padding = 8
-        
-        max_width = 0
-        for line in info_lines:
-            text_size = cv2.getTextSize(line, font, font_scale, thickness)[0]
-            max_width = max(max_width, text_size[0])
-        
-        # Posición del panel (esquina superior izquierda)
-        panel_x = 10
-        panel_y = 10
-        panel_width = max_width + padding * 2
-        panel_height = len(info_lines) * line_height + padding * 2
-        
-        # Dibujar rectángulo de fondo (gris oscuro)
-        cv2.rectangle(frame, (panel_x, panel_y), 
-                     (panel_x + panel_width, panel_y + panel_height), (40, 40, 40), -1)
-        
-        # Dibujar borde
-        cv2.rectangle(frame, (panel_x, panel_y), 
-                     (panel_x + panel_width, panel_y + panel_height), (100, 100, 100), 1)
-        
-        # Dibujar cada línea de información
-        for i, line in enumerate(info_lines):
-            text_y = panel_y + padding + (i + 1) * line_height - 3
-            # Color rojo si está bloqueado, verde normal si no
-            color = (100, 100, 255) if "BLOQUEADO" in line else (150, 255, 150)  # Rojo claro o verde claro
-            cv2.putText(frame, line, (panel_x + padding, text_y), 
-                       font, font_scale, color, thickness)
-
-    def draw_instructions_panel(self, frame):
-        """Dibujar panel de instrucciones con el mismo estilo del panel superior"""
-        h, w, _ = frame.shape
-        
-        # Instrucciones sin caracteres especiales
-        instructions = [
-            "Dos manos abiertas: Control volumen",
-            "Palma a Puno: Play/Pause", 
-            "Puno + cabeza inclinada 35 grados: Cambiar cancion",
-            "Q: Salir"
+        # Rendimiento: FPS, latencia de frame, inferencia y despacho de acciones
+        if GestureConfig.SHOW_METRICS:
+            if refresh:
+                self.metrics_panel_lines = self.metrics.panel_lines()
+                self.metrics_low_fps = (self.metrics.frames > GestureConfig.METRICS_WINDOW and
+                                        self.metrics.fps() < GestureConfig.METRICS_LOW_FPS)
+            info_lines.extend(self.metrics_panel_lines)
+        
+        # Color rojo si está bloqueado o el FPS es bajo, verde normal si no
+        colors = [
+            PANEL_WARNING_COLOR if "BLOQUEADO" in line or (self.metrics_low_fps and line.startswith("FPS"))
+            else PANEL_TEXT_COLOR
+            for line in info_lines
         ]
         
-        # Calcular tamaño del rectángulo necesario (mismo estilo que panel superior)
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.4  # Mismo tamaño que panel superior
-        thickness = 1
-        line_height = 18
-        padding = 8
-        
-        max_width = 0
-        for instruction in instructions:
-            text_size = cv2.getTextSize(instruction, font, font_scale, thickness)[0]
-            max_width = max(max_width, text_size[0])
-        
-        # Posición del panel
-        panel_x = 20
-        panel_y = h - 100
-        panel_width = max_width + padding * 2
-        panel_height = len(instructions) * line_height + padding * 2
-        
-        # Dibujar rectángulo de fondo (mismo gris oscuro que panel superior)
-        cv2.rectangle(frame, (panel_x, panel_y), 
-                     (panel_x + panel_width, panel_y + panel_height), (40, 40, 40), -1)
-        
-        # Dibujar borde (mismo que panel superior)
-        cv2.rectangle(frame, (panel_x, panel_y), 
-                     (panel_x + panel_width, panel_y + panel_height), (100, 100, 100), 1)
-        
-        # Dibujar cada instrucción (mismo color verde claro que panel superior)
-        for i, instruction in enumerate(instructions):
-            text_y = panel_y + padding + (i + 1) * line_height - 3
-            cv2.putText(frame, instruction, (panel_x + padding, text_y), 
-                       font, font_scale, (150, 255, 150), thickness)  # Verde claro igual que panel superior
-        """Dibujar panel de instrucciones en un solo rectángulo"""
+        # Esquina superior izquierda; solo se vuelve a dibujar si cambió el texto
+        self.overlay.panel("info", info_lines, (10, 10), colors, frame_size=(w, h))
+
+    def draw_instructions_panel(self, frame):
+        """Registrar el panel de instrucciones (estático: se dibuja una vez por resolución)"""
         h, w, _ = frame.shape
-        
-        # Instrucciones sin caracteres especiales
-        instructions = [
-            "Dos manos abiertas: Control volumen",
-            "Palma a Puno: Play/Pause", 
-            "Puno + cabeza inclinada 35 grados: Cambiar cancion",
-            "Q: Salir"
-        ]
-        
-        # Calcular tamaño del rectángulo necesario
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.5
-        thickness = 1
-        line_height = 20
-        padding = 10
-        
-        max_width = 0
-        for instruction in instructions:
-            text_size = cv2.getTextSize(instruction, font, font_scale, thickness)[0]
-            max_width = max(max_width, text_size[0])
-        
-        # Posición del panel
-        panel_x = 20
-        panel_y = h - 120
-        panel_width = max_width + padding * 2
-        panel_height = len(instructions) * line_height + padding * 2
-        
-        # Dibujar rectángulo negro de fondo para todo el panel
-        cv2.rectangle(frame, (panel_x - 5, panel_y - 5), 
-                     (panel_x + panel_width, panel_y + panel_height), (40, 40, 40), -1)
-        
-        # Dibujar cada instrucción
-        for i, instruction in enumerate(instructions):
-            text_y = panel_y + padding + (i + 1) * line_height
-            cv2.putText(frame, instruction, (panel_x + padding, text_y), 
-                       font, font_scale, (150, 255, 150), thickness)
+        self.overlay.panel("instructions", INSTRUCTIONS, (20, h - 100), frame_size=(w, h))
 
     def draw_ui(self, frame, left_hand, right_hand, hand_data):
         """Dibujar interfaz de usuario"""
@@ -439,19 +566,19 @@ class HandController:
         show_angle_indicator = False
         if hand_data:
             for hand in hand_data:
-                if hand.get('is_fist') and not hand.get('is_touching_face'):
+                if hand.is_fist and not hand.is_touching_face:
                     show_angle_indicator = True
                     break
         
         # Dibujar indicador de ángulo SOLO cuando hay puño cerrado y no toca la cara
-        if show_angle_indicator and hasattr(self, 'face_landmarks') and self.face_landmarks:
+        if show_angle_indicator and getattr(self, 'face_landmarks', None) is not None:
             # Obtener puntos clave para calcular el ángulo
-            left_eye = self.face_landmarks.landmark[33]  # Comisura externa ojo izquierdo
-            right_eye = self.face_landmarks.landmark[263]  # Comisura externa ojo derecho
+            left_eye = self.face_landmarks[FACE_LEFT_EYE]  # Comisura externa ojo izquierdo
+            right_eye = self.face_landmarks[FACE_RIGHT_EYE]  # Comisura externa ojo derecho
             
             # Convertir a coordenadas de píxeles
-            left_eye_px = (int(left_eye.x * w), int(left_eye.y * h))
-            right_eye_px = (int(right_eye.x * w), int(right_eye.y * h))
+            left_eye_px = (int(left_eye[0] * w), int(left_eye[1] * h))
+            right_eye_px = (int(right_eye[0] * w), int(right_eye[1] * h))
             
             # Calcular punto medio entre los ojos
             center_x = (left_eye_px[0] + right_eye_px[0]) // 2
@@ -493,20 +620,20 @@ class HandController:
                 text_pos = (center_x + 25, center_y - 15)
                 cv2.putText(frame, angle_text, text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.5, line_color, 2)
         
-        # Dibujar landmarks de las manos
-        if left_hand:
+        # Dibujar landmarks de las manos (las manos de grabaciones no traen la lista de MediaPipe)
+        if left_hand and left_hand.landmarks is not None:
             self.mp_draw.draw_landmarks(
-                frame, left_hand['landmarks'], self.mp_hands.HAND_CONNECTIONS
+                frame, left_hand.landmarks, self.mp_hands.HAND_CONNECTIONS
             )
-        if right_hand:
+        if right_hand and right_hand.landmarks is not None:
             self.mp_draw.draw_landmarks(
-                frame, right_hand['landmarks'], self.mp_hands.HAND_CONNECTIONS
+                frame, right_hand.landmarks, self.mp_hands.HAND_CONNECTIONS
             )
         
         # UI según el modo actual - SOLO para control de volumen
         if self.current_mode == "volume":
-            # Dibujar barra de volumen
-            volume_active, volume, left_center, right_center = self.process_volume_control(left_hand, right_hand)
+            # Dibujar barra de volumen (estado calculado en este frame por run)
+            volume_active, volume, left_center, right_center = self.volume_state
             if volume_active:
                 bar_x1 = int(left_center[0] * w)
                 bar_y1 = int(left_center[1] * h)
@@ -533,68 +660,270 @@ class HandController:
         
         # Panel de instrucciones agrupado en la parte inferior
         self.draw_instructions_panel(frame)
+        
+        # Copiar los paneles ya dibujados (solo sus rectángulos)
+        self.overlay.composite(frame)
+
+    def process_landmarks(self, hands, face, timestamp=None):
+        """Detectar gestos y actualizar los controles a partir de landmarks ya convertidos
+
+        `hands` es la lista de extract_hands() y `face` el array de puntos clave
+        del rostro (o None). No necesita imagen ni MediaPipe, así que también
+        sirve para reproducir grabaciones. `timestamp` (segundos, por defecto el
+        reloj del controlador) es el instante del frame para el filtro de
+        landmarks, las esperas y los cooldowns. Devuelve (left_hand, right_hand, hand_data).
+        """
+        current_time = self.clock() if timestamp is None else timestamp
+        if self.landmark_filter is not None:
+            hands = self.landmark_filter.apply(hands, current_time)
+        
+        left_hand, right_hand, hand_data = self.detect_gestures(hands, face)
+        self.tracer.mark_classified()
+        
+        # Asegurar que hand_data nunca sea None
+        if hand_data is None:
+            hand_data = []
+        
+        # Guardar hand_data para el panel de información
+        self.current_hand_data = hand_data
+        
+        # Reset mode si no hay gestos activos
+        if (current_time - self.last_gesture_time) > self.mode_cooldown:
+            if self.current_mode not in ["play_pause"]:  # Mantener estado de play_pause
+                self.current_mode = "idle"
+        
+        # Procesar controles
+        self.volume_state = self.process_volume_control(left_hand, right_hand)
+        volume_active = self.volume_state[0]
+        events = self.gesture_engine.update(
+            GestureFrame(hand_data, left_hand, right_hand, current_time), current_time
+        )
+        
+        # Debug: mostrar cuando se activan controles
+        if GestureConfig.SHOW_DEBUG_INFO:
+            if volume_active:
+                print("✅ Control de volumen activo")
+            for event in events:
+                print(f"✅ Gesto {event.name}: {event.result}")
+        
+        if volume_active or events:
+            self.last_gesture_time = current_time
+        
+        # Acciones disparadas en este frame (para grabaciones, benchmarks y trazas)
+        self.last_actions = ["volume"] if volume_active else []
+        self.last_actions.extend(event.result for event in events)
+        
+        return left_hand, right_hand, hand_data
 
     def run(self):
         """Bucle principal"""
-        while True:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
+        self.running = True
+        self.frames_processed = 0
+        self.run_start_time = time.perf_counter()
+        try:
+            while self.running:
+                ret, frame, capture_time = self.capture.read()
+                if not ret:
+                    break
                 
-            frame = cv2.flip(frame, 1)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb)
-            face_results = self.face_mesh.process(rgb)
-            
-            # Detectar gestos
-            left_hand, right_hand, hand_data = self.detect_gestures(results, face_results)
-            
-            # Asegurar que hand_data nunca sea None
-            if hand_data is None:
-                hand_data = []
-            
-            # Guardar hand_data para el panel de información
-            self.current_hand_data = hand_data
-            
-            # Reset mode si no hay gestos activos
-            current_time = time.time()
-            if (current_time - self.last_gesture_time) > self.mode_cooldown:
-                if self.current_mode not in ["play_pause"]:  # Mantener estado de play_pause
-                    self.current_mode = "idle"
-            
-            # Procesar controles
-            volume_active, _, _, _ = self.process_volume_control(left_hand, right_hand)
-            play_pause_toggled = self.process_play_pause_control(hand_data)
-            media_active, media_action = self.process_media_control(hand_data)
-            
-            # Debug: mostrar cuando se activan controles
-            if GestureConfig.SHOW_DEBUG_INFO:
-                if volume_active:
-                    print("✅ Control de volumen activo")
-                if play_pause_toggled:
-                    print("✅ Play/Pause activado")
-                if media_active:
-                    print(f"✅ Control multimedia: {media_action}")
-            
-            if volume_active or play_pause_toggled or media_active:
-                self.last_gesture_time = current_time
-            
-            # Dibujar UI
-            self.draw_ui(frame, left_hand, right_hand, hand_data)
-            
-            cv2.imshow('Control Multimedia con Manos', frame)
-            if cv2.waitKey(1) & 0xFF == 27:  # ESC para salir
-                break
-        
-        self.cap.release()
-        cv2.destroyAllWindows()
+                self.frames_processed += 1
+                self.tracer.begin_frame(self.frames_processed, capture_time)
+                if self.allocation_monitor is not None:
+                    self.allocation_monitor.begin_frame()
+                
+                # Una sola imagen reducida (sin espejar) para ambos modelos; el dibujo usa el frame completo.
+                # En sleep los modelos solo corren si hubo movimiento
+                if self.governor is None or self.governor.needs_inference(frame):
+                    rgb = self.prepare_inference_image(frame)
+                    hands, face = self.infer(rgb)
+                else:
+                    hands, face = [], None
+                self.tracer.mark_inference()
+                
+                if self.governor is not None and self.governor.update(bool(hands), capture_time):
+                    self.apply_activity_state()
+                
+                if self.recorder is not None:
+                    self.recorder.write(capture_time, hands, face)
+                
+                # Detectar gestos y actualizar los controles
+                left_hand, right_hand, hand_data = self.process_landmarks(hands, face, capture_time)
+                
+                # En modo headless no se dibuja ni se procesa la ventana
+                exit_requested = False
+                if not self.headless:
+                    # Dibujar UI sobre la vista espejada
+                    display = self.prepare_display_frame(frame)
+                    self.draw_ui(display, left_hand, right_hand, hand_data)
+                    
+                    cv2.imshow(WINDOW_NAME, display)
+                    exit_requested = cv2.waitKey(1) & 0xFF == 27  # ESC para salir
+                
+                # Latencia desde la captura hasta terminar el frame, e intervalo entre frames
+                self.metrics.observe_frame(capture_time)
+                if self.metrics_writer is not None:
+                    self.metrics_writer.maybe_write()
+                if self.allocation_monitor is not None:
+                    self.allocation_monitor.end_frame()
+                
+                if exit_requested:
+                    break
+        finally:
+            self.close()
+
+    def stop(self):
+        """Pedir la salida del bucle principal (seguro desde un manejador de señales)"""
+        self.running = False
+
+    def close(self):
+        """Liberar cámara, hilos, backends y ventana"""
+        if self.capture is not None:
+            self.capture.stop()
+        self.dispatcher.stop()
+        self.volume_control.close()
+        self.media_control.close()
+        if self.source is not None:
+            self.source.release()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.inference_pool is not None:
+            self.inference_pool.close()
+        if self.face_roi is not None:
+            self.face_roi.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.metrics_writer is not None:
+            self.metrics_writer.write()
+        self.tracer.close()
+        if not self.headless:
+            cv2.destroyAllWindows()
+        
+        if GestureConfig.SHOW_DEBUG_INFO:
+            elapsed = time.perf_counter() - self.run_start_time
+            if elapsed > 0:
+                print(f"📊 {self.frames_processed} frames en {elapsed:.1f} s ({self.frames_processed / elapsed:.1f} FPS)")
+        if self.inference_enabled:
+            self.tracer.print_summary()
+        if self.allocation_monitor is not None:
+            self.allocation_monitor.print_summary()
+            self.allocation_monitor.stop()
+        if GestureConfig.SHOW_DEBUG_INFO and self.capture is not None:
+            stats = self.capture.stats()
+            print(f"📊 Frames capturados: {stats['captured']} - procesados: {stats['delivered']} - descartados: {stats['dropped']}")
+            if self.governor is not None:
+                print(f"📊 Actividad: {self.governor.state} - frames de sleep sin inferencia: {self.governor.skipped_frames}")
+            if self.face_roi is not None:
+                print(f"📊 FaceMesh con recorte: {self.face_roi.crops} - recortes perdidos: {self.face_roi.fallbacks}")
+            stats = self.dispatcher.stats()
+            print(f"📊 Acciones ejecutadas: {stats['dispatched']} - combinadas: {stats['coalesced']} - "
+                  f"latencia media: {stats['mean_latency_ms']:.1f} ms - máxima: {stats['max_latency_ms']:.1f} ms")
+
+def parse_args():
+    """Opciones de línea de comandos (sobrescriben config.py)"""
+    parser = argparse.ArgumentParser(description="Control multimedia con gestos de manos")
+    parser.add_argument("--headless", action="store_true",
+                        help="Sin ventana ni dibujo: solo procesar gestos")
+    parser.add_argument("--source", choices=["camera", "video", "images", "pipe"],
+                        help="Fuente de frames (por defecto GestureConfig.FRAME_SOURCE)")
+    parser.add_argument("--input",
+                        help="Archivo de video, directorio de imágenes o archivo de frames crudos ('-' = stdin)")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Reproducir archivos a su FPS original en lugar de lo más rápido posible")
+    parser.add_argument("--camera", type=int, help="Índice de la cámara")
+    parser.add_argument("--backend", choices=["separate", "holistic"],
+                        help="Grafos Hands y del rostro separados o un solo grafo Holistic")
+    parser.add_argument("--parallel-inference", action="store_true",
+                        help="Hands y FaceMesh en procesos separados, en paralelo (memoria compartida)")
+    parser.add_argument("--head-pose", choices=["face_detection", "face_mesh"],
+                        help="Modelo del rostro (por defecto GestureConfig.HEAD_POSE_PROVIDER)")
+    parser.add_argument("--face-roi", action="store_true",
+                        help="FaceMesh sobre un recorte alrededor del último rostro (implica --head-pose face_mesh)")
+    parser.add_argument("--cameras", metavar="LISTA",
+                        help="Varias cámaras en paralelo, un proceso por cámara (índices o videos separados por comas, ej. 0,2)")
+    parser.add_argument("--metrics-port", type=int, metavar="PUERTO",
+                        help="Servir métricas Prometheus en http://127.0.0.1:PUERTO/metrics")
+    parser.add_argument("--metrics-file", metavar="ARCHIVO",
+                        help="Escribir las métricas Prometheus a un archivo periódicamente")
+    parser.add_argument("--smooth", action="store_true",
+                        help="Suavizar los landmarks con el filtro One Euro (menos frames de estabilización)")
+    parser.add_argument("--classifier", metavar="ARCHIVO",
+                        help="Clasificador de gestos entrenado con train_classifier.py (.npz)")
+    parser.add_argument("--trace", metavar="ARCHIVO",
+                        help="Registrar la latencia captura -> acción de cada acción (JSON por línea)")
+    parser.add_argument("--record", metavar="ARCHIVO",
+                        help="Grabar los landmarks de cada frame (reproducir con landmark_recording.py)")
+    parser.add_argument("--debug-allocations", action="store_true",
+                        help="Medir la memoria reservada por frame (tracemalloc, más lento)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    controller = HandController()
+    args = parse_args()
+    if args.headless:
+        GestureConfig.HEADLESS = True
+    if args.source:
+        GestureConfig.FRAME_SOURCE = args.source
+    if args.input:
+        GestureConfig.FRAME_SOURCE_PATH = args.input
+    if args.realtime:
+        GestureConfig.FRAME_SOURCE_REALTIME = True
+    if args.camera is not None:
+        GestureConfig.CAMERA_INDEX = args.camera
+    if args.cameras:
+        GestureConfig.CAMERAS = args.cameras.split(",")
+    if args.backend:
+        GestureConfig.INFERENCE_BACKEND = args.backend
+    if args.parallel_inference:
+        GestureConfig.INFERENCE_EXECUTION = "processes"
+    if args.head_pose:
+        GestureConfig.HEAD_POSE_PROVIDER = args.head_pose
+    if args.face_roi:
+        GestureConfig.FACE_ROI_TRACKING = True
+        if not args.head_pose:
+            GestureConfig.HEAD_POSE_PROVIDER = "face_mesh"  # El recorte solo aplica a FaceMesh
+    if args.record:
+        GestureConfig.RECORD_PATH = args.record
+    if args.smooth:
+        GestureConfig.LANDMARK_FILTER = True
+    if args.classifier:
+        GestureConfig.GESTURE_CLASSIFIER_PATH = args.classifier
+    if args.trace:
+        GestureConfig.TRACE_PATH = args.trace
+    if args.metrics_port:
+        GestureConfig.METRICS_PORT = args.metrics_port
+    if args.metrics_file:
+        GestureConfig.METRICS_FILE = args.metrics_file
+    if args.debug_allocations:
+        GestureConfig.DEBUG_ALLOCATIONS = True
+    
+    # Cierre limpio con Ctrl+C o SIGTERM: se termina el frame actual y se liberan recursos. Se instala
+    # antes de arrancar: un aviso durante el arranque (grafos, cámara, hilos) deja terminarlo y cierra
+    # sin procesar frames; un segundo Ctrl+C interrumpe el arranque
+    controller = None
+    exit_requests = []
+    
+    def handle_exit_signal(signum, frame):
+        if exit_requests and controller is None:
+            raise KeyboardInterrupt
+        exit_requests.append(signum)
+        print("\n🔴 Programa cerrado por el usuario")
+        if controller is not None:
+            controller.stop()
+    signal.signal(signal.SIGINT, handle_exit_signal)
+    signal.signal(signal.SIGTERM, handle_exit_signal)
+    
     try:
-        controller.run()
+        # Con varias cámaras cada una corre su propio HandController en un proceso aparte
+        if GestureConfig.CAMERAS:
+            controller = MultiCameraController(GestureConfig.CAMERAS)
+        else:
+            controller = HandController()
+        
+        if exit_requests:
+            controller.close()
+        else:
+            controller.run()
     except KeyboardInterrupt:
-        print("\n🔴 Programa cerrado por el usuario")
+        print("\n🔴 Arranque interrumpido por el usuario")
     except Exception as e:
         print(f"\n❌ Error inesperado: {e}")
     finally:
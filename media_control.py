@@ -1,12 +1,19 @@
-import subprocess
-import time
 import ctypes
-from ctypes import wintypes
+import sys
 from config import GestureConfig
 
+try:
+    from jeepney import DBusAddress, DBusErrorResponse, Properties, new_method_call
+    from jeepney.bus_messages import message_bus
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+    JEEPNEY_AVAILABLE = True
+except ImportError:
+    JEEPNEY_AVAILABLE = False
+
 # Constantes de Windows para teclas multimedia
 VK_MEDIA_NEXT_TRACK = 0xB0
-VK_MEDIA_PREV_TRACK = 0xB1  
+VK_MEDIA_PREV_TRACK = 0xB1
 VK_MEDIA_STOP = 0xB2
 VK_MEDIA_PLAY_PAUSE = 0xB3
 
@@ -14,16 +21,57 @@ VK_MEDIA_PLAY_PAUSE = 0xB3
 KEYEVENTF_EXTENDEDKEY = 0x0001
 KEYEVENTF_KEYUP = 0x0002
 
-class MediaControl:
+# Constantes de MPRIS (control de reproductores por D-Bus en Linux)
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+
+# Acciones multimedia soportadas por todos los backends
+MEDIA_ACTIONS = ("next", "previous", "play_pause", "stop")
+
+
+class MediaBackend:
+    """Interfaz común de los backends multimedia"""
+
+    name = "base"
+
+    def send(self, action):
+        """Ejecutar una acción de MEDIA_ACTIONS; devuelve True si se pudo"""
+        raise NotImplementedError
+
+    def close(self):
+        """Liberar conexiones del backend"""
+        pass
+
+
+class NullMediaBackend(MediaBackend):
+    """Sin backend multimedia: acepta las acciones sin efecto (también para reproducir grabaciones)"""
+
+    name = "none"
+
+    def send(self, action):
+        return True
+
+
+class WindowsMediaKeyBackend(MediaBackend):
+    """Teclas multimedia enviadas con la API de Windows (keybd_event)"""
+
+    name = "keys"
+
+    KEY_CODES = {
+        "next": VK_MEDIA_NEXT_TRACK,
+        "previous": VK_MEDIA_PREV_TRACK,
+        "play_pause": VK_MEDIA_PLAY_PAUSE,
+        "stop": VK_MEDIA_STOP,
+    }
+
     def __init__(self):
-        self.last_action_time = 0
-        self.action_cooldown = GestureConfig.MEDIA_COOLDOWN
-        
         # Cargar user32.dll para acceso directo a teclas multimedia
         self.user32 = ctypes.windll.user32
-        
-    def _send_media_key(self, vk_code):
+
+    def send(self, action):
         """Enviar tecla multimedia usando la API de Windows directamente"""
+        vk_code = self.KEY_CODES[action]
         try:
             # Presionar tecla
             self.user32.keybd_event(vk_code, 0, KEYEVENTF_EXTENDEDKEY, 0)
@@ -33,39 +81,170 @@ class MediaControl:
         except Exception as e:
             print(f"❌ Error enviando tecla multimedia: {e}")
             return False
-        
+
+
+class MprisBackend(MediaBackend):
+    """Control de reproductores en Linux vía MPRIS sobre D-Bus (jeepney)
+
+    Abre una única conexión al bus de sesión al arrancar y guarda en caché la
+    dirección del reproductor activo; solo se vuelve a buscar si el
+    reproductor desaparece. Las llamadas esperan la respuesta, por eso
+    MediaControl las ejecuta en el hilo del ActionDispatcher y no en el bucle
+    de frames. Con DBUS_SESSION_BUS_ADDRESS apuntando a un dbus-daemon privado
+    se puede probar contra un reproductor MPRIS simulado.
+    """
+
+    name = "mpris"
+
+    METHODS = {
+        "next": "Next",
+        "previous": "Previous",
+        "play_pause": "PlayPause",
+        "stop": "Stop",
+    }
+
+    def __init__(self, preferred_player=None, connection=None, timeout=1.0):
+        if connection is None and not JEEPNEY_AVAILABLE:
+            raise RuntimeError("jeepney no está instalado")
+
+        self.connection = connection if connection is not None else open_dbus_connection(bus='SESSION')
+        self.preferred_player = preferred_player
+        self.timeout = timeout
+        self.player = None  # DBusAddress del reproductor en caché
+        self.find_player()
+
+    def _call(self, message):
+        return unwrap_msg(self.connection.send_and_get_reply(message, timeout=self.timeout))
+
+    def _playback_status(self, address):
+        try:
+            (_, status), = self._call(Properties(address).get('PlaybackStatus'))
+            return status
+        except Exception:
+            return None
+
+    def find_player(self):
+        """Buscar el reproductor MPRIS (preferido, el que está sonando o el primero)"""
+        names, = self._call(message_bus.ListNames())
+        players = sorted(name for name in names if name.startswith(MPRIS_PREFIX))
+        self.player = None
+        if not players:
+            return None
+
+        if self.preferred_player:
+            preferred = [p for p in players if p[len(MPRIS_PREFIX):].startswith(self.preferred_player)]
+            if preferred:
+                players = preferred
+
+        chosen = players[0]
+        if len(players) > 1:
+            for name in players:
+                address = DBusAddress(MPRIS_PATH, bus_name=name, interface=MPRIS_PLAYER_INTERFACE)
+                if self._playback_status(address) == "Playing":
+                    chosen = name
+                    break
+
+        self.player = DBusAddress(MPRIS_PATH, bus_name=chosen, interface=MPRIS_PLAYER_INTERFACE)
+        print(f"🎵 Reproductor MPRIS: {chosen[len(MPRIS_PREFIX):]}")
+        return self.player
+
+    def send(self, action):
+        method = self.METHODS[action]
+        for attempt in range(2):
+            if self.player is None and self.find_player() is None:
+                print("❌ No hay ningún reproductor MPRIS activo")
+                return False
+            try:
+                self._call(new_method_call(self.player, method))
+                return True
+            except DBusErrorResponse as e:
+                # El reproductor en caché ya no existe: buscar otro una vez
+                print(f"❌ Error MPRIS ({method}): {e.name}")
+                self.player = None
+            except Exception as e:
+                print(f"❌ Error MPRIS ({method}): {e}")
+                return False
+        return False
+
+    def close(self):
+        self.connection.close()
+
+
+def create_media_backend(name=None):
+    """Crear el backend multimedia configurado ("auto" elige según la plataforma)"""
+    name = name or GestureConfig.MEDIA_BACKEND
+
+    if name == "keys":
+        return WindowsMediaKeyBackend()
+    if name == "mpris":
+        return MprisBackend(GestureConfig.MPRIS_PLAYER)
+    if name == "none":
+        return NullMediaBackend()
+    if name != "auto":
+        raise ValueError(f"Backend multimedia desconocido: {name}")
+
+    if sys.platform == "win32":
+        return WindowsMediaKeyBackend()
+
+    if JEEPNEY_AVAILABLE:
+        try:
+            return MprisBackend(GestureConfig.MPRIS_PLAYER)
+        except Exception as e:
+            print(f"❌ No se pudo conectar con D-Bus: {e}")
+
+    print("⚠️ Sin backend multimedia disponible: los gestos de reproducción no tendrán efecto")
+    return NullMediaBackend()
+
+
+class MediaControl:
+    """Acciones multimedia de alto nivel sobre el backend configurado
+
+    Los cooldowns entre acciones los aplica el GestureEngine (ver gesture_rules.py).
+    """
+
+    def __init__(self, dispatcher=None, backend=None, tracer=None):
+        # Trazas de latencia por acción (opcional, ver action_trace.py)
+        self.tracer = tracer
+
+        # Si hay dispatcher, las acciones se envían en su hilo (fuera del bucle de frames)
+        self.dispatcher = dispatcher
+        self.backend = backend if backend is not None else create_media_backend()
+
+    def _dispatch_action(self, action):
+        """Enviar la acción en el hilo del dispatcher o directamente si no hay
+
+        Con dispatcher devuelve True al encolar (el resultado del backend
+        llega después, a la traza); sin dispatcher, el resultado del backend.
+        """
+        trace = self.tracer.action(action) if self.tracer is not None else None
+        if self.dispatcher is not None:
+            self.dispatcher.submit(action, self.backend.send, action, trace=trace)
+            return True
+        result = self.backend.send(action)
+        if trace is not None:
+            trace.finish(result)
+        return result
+
     def next_track(self):
         """Pasar a la siguiente canción"""
-        current_time = time.time()
-        if current_time - self.last_action_time > self.action_cooldown:
-            self.last_action_time = current_time
-            print("🎵 Siguiente canción (tecla multimedia)")
-            return self._send_media_key(VK_MEDIA_NEXT_TRACK)
-        return False
+        print("🎵 Siguiente canción (tecla multimedia)")
+        return self._dispatch_action("next")
 
     def previous_track(self):
         """Volver a la canción anterior"""
-        current_time = time.time()
-        if current_time - self.last_action_time > self.action_cooldown:
-            self.last_action_time = current_time
-            print("⏮️ Canción anterior (tecla multimedia)")
-            return self._send_media_key(VK_MEDIA_PREV_TRACK)
-        return False
+        print("⏮️ Canción anterior (tecla multimedia)")
+        return self._dispatch_action("previous")
 
     def play_pause(self):
         """Play/Pause"""
-        current_time = time.time()
-        if current_time - self.last_action_time > self.action_cooldown:
-            self.last_action_time = current_time
-            print("⏯️ Play/Pause (tecla multimedia)")
-            return self._send_media_key(VK_MEDIA_PLAY_PAUSE)
-        return False
-    
+        print("⏯️ Play/Pause (tecla multimedia)")
+        return self._dispatch_action("play_pause")
+
     def stop(self):
         """Stop (función adicional)"""
-        current_time = time.time()
-        if current_time - self.last_action_time > self.action_cooldown:
-            self.last_action_time = current_time
-            print("⏹️ Stop (tecla multimedia)")
-            return self._send_media_key(VK_MEDIA_STOP)
-        return False
+        print("⏹️ Stop (tecla multimedia)")
+        return self._dispatch_action("stop")
+
+    def close(self):
+        """Liberar el backend multimedia"""
+        self.backend.close()
@@ -0,0 +1,221 @@
+"""
+Métricas de rendimiento en vivo: FPS del bucle, tiempo de inferencia por grafo,
+latencia de frame (captura -> fin del procesamiento) y latencia de despacho de
+acciones.
+
+Cada métrica guarda una ventana de las últimas muestras (para el panel de la
+UI) y un histograma acumulado con buckets fijos (para Prometheus). El texto en
+formato Prometheus se sirve por HTTP en localhost o se escribe periódicamente
+a un archivo (compatible con el textfile collector de node_exporter).
+"""
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+METRIC_PREFIX = "gesture_control"
+
+# Límites superiores de los buckets en segundos (el último bucket, +Inf, es implícito)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.075, 0.1, 0.2, 0.5, 1.0)
+
+INFERENCE_GRAPHS = ("hands", "face_mesh", "face_detection", "holistic")
+
+
+class LatencyMetric:
+    """Ventana deslizante de muestras + histograma acumulado (en segundos)
+
+    observe() puede llamarse desde otros hilos (el del ActionDispatcher).
+    """
+
+    def __init__(self, window, buckets=LATENCY_BUCKETS):
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=window)
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        with self.lock:
+            self.recent.append(seconds)
+            self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def window(self):
+        with self.lock:
+            return list(self.recent)
+
+    def mean(self):
+        samples = self.window()
+        return sum(samples) / len(samples) if samples else None
+
+    def percentile(self, p):
+        samples = self.window()
+        return float(np.percentile(samples, p)) if samples else None
+
+    def histogram(self):
+        """(buckets acumulados [(le, n)], suma, cantidad) para Prometheus"""
+        with self.lock:
+            cumulative = []
+            running = 0
+            for le, n in zip(self.buckets + (float('inf'),), self.bucket_counts):
+                running += n
+                cumulative.append((le, running))
+            return cumulative, self.total, self.count
+
+
+class PipelineMetrics:
+    """Métricas del bucle de frames de HandController"""
+
+    def __init__(self, window=120):
+        self.frame_interval = LatencyMetric(window)
+        self.frame_latency = LatencyMetric(window)
+        self.inference = {graph: LatencyMetric(window) for graph in INFERENCE_GRAPHS}
+        self.dispatch_latency = LatencyMetric(window)
+        self.frames = 0
+        self.last_frame_end = None
+
+    def observe_inference(self, graph, seconds):
+        self.inference[graph].observe(seconds)
+
+    def observe_dispatch(self, name, seconds):
+        """Callback del ActionDispatcher (se ejecuta en su hilo)"""
+        self.dispatch_latency.observe(seconds)
+
+    def observe_frame(self, capture_time, now=None):
+        """Fin de un frame: latencia desde la captura e intervalo desde el frame anterior"""
+        now = time.perf_counter() if now is None else now
+        self.frames += 1
+        if capture_time is not None:
+            self.frame_latency.observe(now - capture_time)
+        if self.last_frame_end is not None:
+            self.frame_interval.observe(now - self.last_frame_end)
+        self.last_frame_end = now
+
+    def fps(self):
+        """FPS del bucle sobre la ventana reciente"""
+        mean = self.frame_interval.mean()
+        return 1.0 / mean if mean else 0.0
+
+    def panel_lines(self):
+        """Líneas para el panel de información"""
+        def ms(value):
+            return f"{value * 1000:.0f}" if value is not None else "--"
+
+        hands = self.inference["hands"].mean()
+        face = self.inference["face_mesh"].mean()
+        if face is None:
+            face = self.inference["face_detection"].mean()
+        holistic = self.inference["holistic"].mean()
+        if holistic is not None:
+            inference = f"Inferencia: holistic {ms(holistic)} ms"
+        else:
+            inference = f"Inferencia: manos {ms(hands)} ms - rostro {ms(face)} ms"
+        return [
+            f"FPS: {self.fps():.1f}",
+            f"Latencia frame: {ms(self.frame_latency.mean())} ms (p95 {ms(self.frame_latency.percentile(95))})",
+            inference,
+            f"Acciones: {ms(self.dispatch_latency.mean())} ms",
+        ]
+
+    def render_prometheus(self):
+        """Todas las métricas en formato de texto de Prometheus"""
+        lines = [
+            f"# HELP {METRIC_PREFIX}_frames_total Frames procesados por el bucle principal",
+            f"# TYPE {METRIC_PREFIX}_frames_total counter",
+            f"{METRIC_PREFIX}_frames_total {self.frames}",
+            f"# HELP {METRIC_PREFIX}_fps FPS del bucle en la ventana reciente",
+            f"# TYPE {METRIC_PREFIX}_fps gauge",
+            f"{METRIC_PREFIX}_fps {self.fps():.3f}",
+        ]
+        _append_histogram(lines, "frame_interval_seconds", "Tiempo entre frames consecutivos",
+                          [({}, self.frame_interval)])
+        _append_histogram(lines, "frame_latency_seconds", "Latencia desde la captura hasta terminar el frame",
+                          [({}, self.frame_latency)])
+        _append_histogram(lines, "inference_seconds", "Tiempo de inferencia por grafo de MediaPipe",
+                          [({"graph": graph}, metric) for graph, metric in self.inference.items()])
+        _append_histogram(lines, "dispatch_latency_seconds", "Latencia desde la petición hasta ejecutar la acción",
+                          [({}, self.dispatch_latency)])
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def _append_histogram(lines, name, help_text, series):
+    full_name = f"{METRIC_PREFIX}_{name}"
+    lines.append(f"# HELP {full_name} {help_text}")
+    lines.append(f"# TYPE {full_name} histogram")
+    for labels, metric in series:
+        buckets, total, count = metric.histogram()
+        for le, n in buckets:
+            le_text = "+Inf" if le == float('inf') else repr(le)
+            lines.append(f"{full_name}_bucket{_format_labels({**labels, 'le': le_text})} {n}")
+        lines.append(f"{full_name}_sum{_format_labels(labels)} {total:.6f}")
+        lines.append(f"{full_name}_count{_format_labels(labels)} {count}")
+
+
+class MetricsServer:
+    """Servidor HTTP en un hilo que responde /metrics en formato Prometheus"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        self.metrics = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?")[0] not in ("/metrics", "/"):
+                    handler.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass  # Sin un log por cada scrape
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        print(f"📈 Métricas en http://{host}:{port}/metrics")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsFileWriter:
+    """Escribe las métricas a un archivo cada `interval` segundos (reemplazo atómico)"""
+
+    def __init__(self, metrics, path, interval=5.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.last_write = time.monotonic()
+
+    def maybe_write(self):
+        now = time.monotonic()
+        if now - self.last_write >= self.interval:
+            self.write()
+            self.last_write = now
+
+    def write(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.metrics.render_prometheus())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,316 @@
+"""
+Varias cámaras en paralelo, un proceso de inferencia por cámara
+
+Cada cámara corre su propio HandController (MediaPipe, detector y motor de
+gestos) en un proceso aparte, así las cámaras no compiten por el GIL y el
+rendimiento escala con los núcleos. Los workers no tocan el sistema: sus
+backends de volumen y multimedia reenvían cada acción como un CameraEvent a
+una cola común. El proceso principal ordena los eventos de todas las
+cámaras por instante, descarta la misma acción vista por otra cámara dentro
+de MULTI_CAMERA_DEDUP_WINDOW (un gesto visto por dos cámaras dispara una
+sola vez) y ejecuta el resultado con los backends reales.
+
+Cada evento lleva el instante de captura del frame que lo disparó, no el
+momento en que el worker lo encoló: dos cámaras que ven el mismo gesto a la
+vez emiten instantes cercanos aunque una tarde más en inferir. Los instantes
+son time.perf_counter(), que usa un reloj monotónico común a todos los
+procesos del sistema.
+"""
+import heapq
+import math
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+
+from config import GestureConfig
+from action_dispatcher import ActionDispatcher
+from media_control import MediaBackend, MediaControl
+from volume_control import VolumeBackend, VolumeControl
+
+# Una cámara conserva el control del volumen mientras siga enviando valores con menos de esta pausa (segundos)
+VOLUME_OWNER_TIMEOUT = 0.3
+
+# Cada cuánto revisa un worker si el proceso principal pidió la salida (segundos)
+STOP_POLL_INTERVAL = 0.1
+
+# Opciones de GestureConfig que los workers no heredan (archivos y puertos que chocarían entre procesos)
+WORKER_DISABLED_OPTIONS = ("METRICS_PORT", "METRICS_FILE", "TRACE_PATH", "RECORD_PATH", "CAMERAS")
+
+
+class CameraEvent:
+    """Acción emitida por el worker de una cámara ("media" con la acción, "volume" con el porcentaje o "done")"""
+
+    __slots__ = ('camera', 'kind', 'value', 'timestamp')
+
+    def __init__(self, camera, kind, value=None, timestamp=None):
+        self.camera = camera
+        self.kind = kind
+        self.value = value
+        self.timestamp = time.perf_counter() if timestamp is None else timestamp
+
+    def __repr__(self):
+        return f"CameraEvent(cámara {self.camera}, {self.kind}, {self.value!r})"
+
+
+class ForwardMediaBackend(MediaBackend):
+    """Backend multimedia del worker: reenvía la acción al proceso principal
+
+    `frame_time()` devuelve el instante de captura del frame en curso (None =
+    el momento del envío). Las acciones multimedia se envían desde el bucle
+    de frames, así que es el frame que disparó la acción.
+    """
+
+    name = "forward"
+
+    def __init__(self, camera, events, frame_time=None):
+        self.camera = camera
+        self.events = events
+        self.frame_time = frame_time
+
+    def send(self, action):
+        timestamp = self.frame_time() if self.frame_time is not None else None
+        self.events.put(CameraEvent(self.camera, "media", action, timestamp))
+        return True
+
+
+class ForwardVolumeBackend(VolumeBackend):
+    """Backend de volumen del worker: reenvía el porcentaje al proceso principal
+
+    El volumen llega desde el hilo del dispatcher, que solo aplica el último
+    valor pendiente: el instante es el del último frame capturado, a lo sumo
+    un frame después del que calculó el valor.
+    """
+
+    name = "forward"
+
+    def __init__(self, camera, events, frame_time=None):
+        self.camera = camera
+        self.events = events
+        self.frame_time = frame_time
+
+    def set_volume(self, vol_percent):
+        timestamp = self.frame_time() if self.frame_time is not None else None
+        self.events.put(CameraEvent(self.camera, "volume", vol_percent, timestamp))
+        return True
+
+    def set_mute(self, muted):
+        pass
+
+
+class EventMerger:
+    """Une los eventos de todas las cámaras en un flujo ordenado y sin duplicados
+
+    Los eventos se retienen `reorder_delay` segundos después de su captura
+    para ordenarlos aunque una cámara tarde más que otra en inferir o lleguen
+    desordenados por la cola. Una acción multimedia se descarta si
+    otra cámara emitió la misma acción hace menos de `dedup_window` segundos
+    (las repeticiones de una misma cámara ya las limita su cooldown). El
+    volumen lo controla una cámara a la vez: la primera que lo pide lo
+    conserva mientras siga enviando valores.
+    """
+
+    def __init__(self, dedup_window=1.0, reorder_delay=0.05, volume_timeout=VOLUME_OWNER_TIMEOUT):
+        self.dedup_window = dedup_window
+        self.reorder_delay = reorder_delay
+        self.volume_timeout = volume_timeout
+        self.pending = []        # Heap de (instante, orden de llegada, evento)
+        self.sequence = 0
+        self.last_media = {}     # acción -> último CameraEvent aceptado
+        self.volume_owner = None
+        self.volume_time = -math.inf
+
+        # Estadísticas
+        self.accepted = 0
+        self.duplicates = 0
+
+    def push(self, event):
+        heapq.heappush(self.pending, (event.timestamp, self.sequence, event))
+        self.sequence += 1
+
+    def pop_ready(self, now):
+        """Eventos aceptados con más de reorder_delay segundos, en orden de instante"""
+        ready = []
+        while self.pending and self.pending[0][0] <= now - self.reorder_delay:
+            event = heapq.heappop(self.pending)[2]
+            if self._accept(event):
+                ready.append(event)
+        return ready
+
+    def wait_time(self, now):
+        """Segundos hasta que el evento pendiente más viejo esté listo (reorder_delay si no hay ninguno)"""
+        if not self.pending:
+            return self.reorder_delay
+        return max(0.0, self.pending[0][0] + self.reorder_delay - now)
+
+    def flush(self):
+        """Todos los eventos pendientes (al terminar)"""
+        return self.pop_ready(math.inf)
+
+    def _accept(self, event):
+        if event.kind == "media":
+            last = self.last_media.get(event.value)
+            if (last is not None and last.camera != event.camera
+                    and event.timestamp - last.timestamp < self.dedup_window):
+                self.duplicates += 1
+                return False
+            self.last_media[event.value] = event
+        elif event.kind == "volume":
+            if (self.volume_owner not in (None, event.camera)
+                    and event.timestamp - self.volume_time < self.volume_timeout):
+                self.duplicates += 1
+                return False
+            self.volume_owner = event.camera
+            self.volume_time = event.timestamp
+        self.accepted += 1
+        return True
+
+
+def config_snapshot():
+    """Opciones actuales de GestureConfig (incluidas las de la línea de comandos) para los workers"""
+    return {name: value for name, value in vars(GestureConfig).items() if name.isupper()}
+
+
+def watch_stop_flag(stop_flag, controller):
+    """Hilo del worker: detener el controlador cuando el proceso principal lo pide"""
+    while not stop_flag.value:
+        time.sleep(STOP_POLL_INTERVAL)
+    controller.stop()
+
+
+def camera_worker(camera, spec, events, stop_flag, config):
+    """Proceso de una cámara: HandController headless con los backends que reenvían las acciones"""
+    # Ctrl+C lo coordina el proceso principal (stop_flag)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for name, value in config.items():
+        setattr(GestureConfig, name, value)
+    for name in WORKER_DISABLED_OPTIONS:
+        setattr(GestureConfig, name, None)
+    GestureConfig.INFERENCE_EXECUTION = "inline"  # Un proceso daemon no puede lanzar el pool de inferencia
+
+    from frame_sources import create_camera_source
+    from main import HandController
+
+    controller = None
+    volume_backend = ForwardVolumeBackend(camera, events)
+    media_backend = ForwardMediaBackend(camera, events)
+    try:
+        controller = HandController(
+            headless=True,
+            source=create_camera_source(spec),
+            volume_control=VolumeControl(volume_backend),
+            media_control=MediaControl(backend=media_backend),
+        )
+        # Los eventos llevan el instante de captura del frame en curso (el tracer lo registra por frame)
+        volume_backend.frame_time = media_backend.frame_time = lambda: controller.tracer.frame.capture
+        threading.Thread(target=watch_stop_flag, args=(stop_flag, controller), daemon=True).start()
+        controller.run()
+    except Exception as e:
+        print(f"❌ Cámara {camera} ({spec}): {e}")
+    finally:
+        frames = controller.frames_processed if controller is not None else 0
+        elapsed = time.perf_counter() - controller.run_start_time if controller is not None else 0.0
+        events.put(CameraEvent(camera, "done", (frames, elapsed)))
+
+
+class MultiCameraController:
+    """Lanza un worker por cámara y ejecuta el flujo de eventos combinado"""
+
+    def __init__(self, cameras, volume_control=None, media_control=None):
+        self.cameras = list(cameras)
+        self.running = False
+
+        # spawn: los workers arrancan un intérprete limpio (fork con hilos y MediaPipe no es seguro)
+        context = multiprocessing.get_context("spawn")
+        self.events = context.Queue()
+        # Bandera compartida sin lock: un multiprocessing.Event se bloquea al activarlo si un
+        # worker que lo esperaba ya terminó
+        self.stop_flag = context.Value('b', 0, lock=False)
+        config = config_snapshot()
+        self.workers = [
+            context.Process(
+                target=camera_worker, args=(camera, spec, self.events, self.stop_flag, config),
+                name=f"camera-{camera}", daemon=True,
+            )
+            for camera, spec in enumerate(self.cameras)
+        ]
+
+        self.merger = EventMerger(GestureConfig.MULTI_CAMERA_DEDUP_WINDOW, GestureConfig.MULTI_CAMERA_REORDER_DELAY)
+        self.volume_control = volume_control if volume_control is not None else VolumeControl()
+        self.dispatcher = ActionDispatcher(self.volume_control).start()
+        self.media_control = media_control if media_control is not None else MediaControl(self.dispatcher)
+        self.media_actions = {
+            "next": self.media_control.next_track,
+            "previous": self.media_control.previous_track,
+            "play_pause": self.media_control.play_pause,
+            "stop": self.media_control.stop,
+        }
+        self.executed = []   # Eventos ejecutados, en orden
+        self.camera_stats = {}  # cámara -> (frames, segundos)
+
+    def execute(self, event):
+        if event.kind == "volume":
+            self.dispatcher.set_volume(event.value)
+        elif event.kind == "media":
+            print(f"🎥 Cámara {event.camera}: {event.value}")
+            self.media_actions[event.value]()
+        self.executed.append(event)
+
+    def run(self):
+        """Arrancar los workers y ejecutar sus eventos hasta que todos terminen"""
+        self.running = True
+        print(f"🎥 Modo multicámara: {len(self.workers)} cámaras ({', '.join(str(c) for c in self.cameras)})")
+        for worker in self.workers:
+            worker.start()
+
+        # Tras stop() se siguen leyendo los avisos "done" de los workers, pero sin ejecutar acciones nuevas
+        active = len(self.workers)
+        try:
+            while active:
+                try:
+                    event = self.events.get(timeout=self.merger.wait_time(time.perf_counter()))
+                except queue.Empty:
+                    event = None
+                    if not any(worker.is_alive() for worker in self.workers):
+                        break  # Workers terminados sin avisar (ej. error al importar)
+
+                if event is not None:
+                    if event.kind == "done":
+                        active -= 1
+                        self.camera_stats[event.camera] = event.value
+                    elif self.running:
+                        self.merger.push(event)
+
+                if self.running:
+                    for ready in self.merger.pop_ready(time.perf_counter()):
+                        self.execute(ready)
+
+            if self.running:
+                for ready in self.merger.flush():
+                    self.execute(ready)
+        finally:
+            self.close()
+
+    def stop(self):
+        """Pedir la salida (seguro desde un manejador de señales)"""
+        self.running = False
+        self.stop_flag.value = 1
+
+    def close(self):
+        self.stop_flag.value = 1
+        for worker in self.workers:
+            if worker.pid is None:
+                continue  # Nunca arrancó (salida pedida durante el arranque)
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+        self.dispatcher.stop()
+        self.volume_control.close()
+        self.media_control.close()
+
+        if GestureConfig.SHOW_DEBUG_INFO:
+            for camera, (frames, elapsed) in sorted(self.camera_stats.items()):
+                fps = frames / elapsed if elapsed > 0 else 0.0
+                print(f"📊 Cámara {camera} ({self.cameras[camera]}): {frames} frames ({fps:.1f} FPS)")
+            print(f"📊 Eventos ejecutados: {self.merger.accepted} - duplicados descartados: {self.merger.duplicates}")
@@ -0,0 +1,79 @@
+"""Transiciones del gobernador de actividad y su histéresis"""
+import numpy as np
+
+from activity_governor import ACTIVE, IDLE, SLEEP, ActivityGovernor, MotionDetector
+
+
+def feed(governor, hands, start, end, dt=0.1):
+    """Actualizar el gobernador cada `dt` segundos; devuelve [(t, estado)] de cada cambio"""
+    changes = []
+    for i in range(round((end - start) / dt)):
+        t = round(start + i * dt, 3)  # Sin error acumulado: los cambios caen en tiempos exactos
+        if governor.update(hands, t):
+            changes.append((t, governor.state))
+    return changes
+
+
+def test_states_follow_time_without_hands():
+    governor = ActivityGovernor(idle_after=3.0, sleep_after=10.0)
+    assert feed(governor, False, 0.0, 12.0) == [(3.0, IDLE), (10.0, SLEEP)]
+    assert governor.update(True, 12.0)
+    assert governor.state == ACTIVE
+
+
+def test_stray_detection_in_idle_holds_active_before_going_down():
+    governor = ActivityGovernor(idle_after=3.0, sleep_after=30.0, min_hold=5.0)
+    feed(governor, False, 0.0, 6.0)
+    assert governor.state == IDLE
+
+    # Una mano en un solo frame: sube enseguida...
+    assert governor.update(True, 6.0)
+    assert governor.state == ACTIVE
+    # ...y no vuelve a idle a los 3 s sin manos, sino cuando active lleva 5 s
+    assert feed(governor, False, 6.1, 12.0) == [(11.0, IDLE)]
+
+
+def stray_detections(governor, every=4.0, until=40.0):
+    """Una detección suelta cada `every` segundos; devuelve los cambios de estado"""
+    changes = []
+    for start in np.arange(0.0, until, every):
+        if governor.update(True, float(start)):
+            changes.append((float(start), governor.state))
+        changes += feed(governor, False, start + 0.1, start + every)
+    return changes
+
+
+def test_repeated_stray_detections_switch_less_often():
+    flapping = stray_detections(ActivityGovernor(idle_after=3.0, sleep_after=60.0))
+    held = stray_detections(ActivityGovernor(idle_after=3.0, sleep_after=60.0, min_hold=5.0))
+
+    assert len(held) < len(flapping) / 2
+    # Cada bajada llega al menos `min_hold` segundos después de la subida anterior
+    for (up_time, up), (down_time, down) in zip(held[1::2], held[2::2]):
+        assert (up, down) == (ACTIVE, IDLE)
+        assert down_time - up_time >= 5.0
+
+
+def test_going_up_ignores_hold():
+    governor = ActivityGovernor(idle_after=3.0, sleep_after=8.0, min_hold=5.0)
+    feed(governor, False, 0.0, 9.0)
+    assert governor.state == IDLE  # Idle empezó a los 5 s: sleep espera hasta los 10 s
+    feed(governor, False, 9.0, 10.5)
+    assert governor.state == SLEEP
+
+    assert governor.update(True, 10.6)
+    assert governor.state == ACTIVE
+
+
+def test_sleep_runs_models_only_on_motion():
+    governor = ActivityGovernor(idle_after=1.0, sleep_after=2.0, motion_detector=MotionDetector(0.01))
+    feed(governor, False, 0.0, 2.5)
+    assert governor.state == SLEEP
+
+    still = np.full((72, 128, 3), 40, dtype=np.uint8)
+    moved = still.copy()
+    moved[20:50, 30:90] = 220
+    assert not governor.needs_inference(still)  # Primer frame: solo referencia
+    assert not governor.needs_inference(still)
+    assert governor.needs_inference(moved)
+    assert governor.skipped_frames == 2
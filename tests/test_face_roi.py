@@ -0,0 +1,140 @@
+"""FaceRoiTracker con un FaceMesh simulado: recorte, vuelta a coordenadas completas y respaldo"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from face_roi import FaceRoiTracker
+from gesture_detector import (
+    FACE_CHIN, FACE_FOREHEAD, FACE_LEFT_CHEEK, FACE_LEFT_EYE, FACE_MESH_KEYPOINTS, FACE_NOSE,
+    FACE_RIGHT_CHEEK, FACE_RIGHT_EYE,
+)
+
+WIDTH, HEIGHT = 320, 240
+
+# Posición de cada punto clave dentro de la caja de la cara (0-1 en x e y)
+KEYPOINT_LAYOUT = {
+    FACE_NOSE: (0.5, 0.55),
+    FACE_FOREHEAD: (0.5, 0.0),
+    FACE_LEFT_EYE: (0.25, 0.35),
+    FACE_CHIN: (0.5, 1.0),
+    FACE_LEFT_CHEEK: (0.0, 0.6),
+    FACE_RIGHT_EYE: (0.75, 0.35),
+    FACE_RIGHT_CHEEK: (1.0, 0.6),
+}
+
+
+class FakeFaceMesh:
+    """"Detecta" como cara el rectángulo blanco de la imagen y ubica los puntos clave en su caja"""
+
+    def __init__(self):
+        self.inputs = []  # Forma de cada imagen recibida
+        self.closed = False
+
+    def process(self, image):
+        self.inputs.append(image.shape)
+        ys, xs = np.nonzero(image[:, :, 0] > 127)
+        if len(xs) == 0:
+            return SimpleNamespace(multi_face_landmarks=None)
+        height, width = image.shape[:2]
+        x0, x1 = xs.min() / width, (xs.max() + 1) / width
+        y0, y1 = ys.min() / height, (ys.max() + 1) / height
+
+        landmark = [SimpleNamespace(x=(x0 + x1) / 2, y=(y0 + y1) / 2, z=0.0) for _ in range(468)]
+        for keypoint, (u, v) in KEYPOINT_LAYOUT.items():
+            landmark[FACE_MESH_KEYPOINTS[keypoint]] = SimpleNamespace(
+                x=x0 + u * (x1 - x0), y=y0 + v * (y1 - y0), z=-0.1 * (x1 - x0))
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=landmark)])
+
+    def close(self):
+        self.closed = True
+
+
+def image_with_face(x, y, width=60, height=80):
+    """Imagen de inferencia con una "cara" blanca de (width, height) píxeles desde (x, y)"""
+    rgb = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    rgb[y:y + height, x:x + width] = 255
+    return rgb
+
+
+@pytest.fixture
+def graphs():
+    return FakeFaceMesh(), FakeFaceMesh()  # (imagen completa, recorte)
+
+
+def test_first_frame_uses_full_image_then_crops(graphs):
+    full, roi = graphs
+    tracker = FaceRoiTracker(roi, margin=0.25, size=96)
+    rgb = image_with_face(100, 60)
+
+    first = tracker.process(full, rgb)
+    assert full.inputs == [(HEIGHT, WIDTH, 3)]
+    assert roi.inputs == []
+
+    second = tracker.process(full, rgb)
+    assert roi.inputs == [(96, 96, 3)]
+    assert len(full.inputs) == 1
+    assert tracker.crops == 1 and tracker.fallbacks == 0
+
+    # Los puntos del recorte vuelven a coordenadas de la imagen completa (error de un píxel del recorte)
+    side = 80 * 1.5
+    np.testing.assert_allclose(second[:, :2], first[:, :2], atol=side / 96 / WIDTH * 1.5)
+    np.testing.assert_allclose(second[:, 2], first[:, 2], atol=1e-3)
+
+
+def test_crop_is_square_and_stays_inside_image(graphs):
+    _, roi = graphs
+    tracker = FaceRoiTracker(roi, margin=0.25, size=96)
+    tracker.box = (0.02, 0.95, 40 / WIDTH, 40 / HEIGHT)  # Cara en la esquina inferior izquierda
+
+    x0, y0, side = tracker.crop(image_with_face(0, 200, 40, 40))
+    assert side == 60
+    assert (x0, y0) == (0, HEIGHT - side)
+
+    tracker.box = (0.5, 0.5, 0.9, 0.9)  # Cara que ocupa casi toda la imagen: no se recorta
+    assert tracker.crop(image_with_face(0, 0)) is None
+
+
+def test_lost_face_in_crop_falls_back_to_full_image(graphs):
+    full, roi = graphs
+    tracker = FaceRoiTracker(roi, margin=0.25, size=96)
+    tracker.process(full, image_with_face(20, 20))
+
+    # La cara saltó al otro extremo: el recorte queda vacío y se repite sobre la imagen completa
+    face = tracker.process(full, image_with_face(240, 150))
+    assert tracker.fallbacks == 1 and tracker.crops == 0
+    assert len(full.inputs) == 2
+    assert face[FACE_NOSE, 0] == pytest.approx(270 / WIDTH, abs=1e-6)
+    assert tracker.box[0] == pytest.approx(270 / WIDTH)
+
+    # Con la caja actualizada el siguiente frame vuelve a usar el recorte
+    tracker.process(full, image_with_face(240, 150))
+    assert tracker.crops == 1
+
+
+def test_no_face_clears_box(graphs):
+    full, roi = graphs
+    tracker = FaceRoiTracker(roi, size=96)
+    tracker.process(full, image_with_face(100, 60))
+    assert tracker.box is not None
+
+    assert tracker.process(full, np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)) is None
+    assert tracker.box is None
+    assert tracker.fallbacks == 1  # El recorte no encontró nada y la imagen completa tampoco
+
+
+def test_mirror_flips_output_but_not_tracked_box(graphs):
+    full, roi = graphs
+    tracker = FaceRoiTracker(roi, size=96)
+    rgb = image_with_face(40, 60)
+
+    plain = tracker.process(full, rgb)
+    box = tracker.box
+    tracker.reset()
+    mirrored = tracker.process(full, rgb, mirror=True)
+
+    np.testing.assert_allclose(mirrored[:, 0], 1.0 - plain[:, 0], atol=1e-6)
+    assert tracker.box == box  # El recorte se ubica en la imagen sin espejar
+
+    tracker.close()
+    assert roi.closed
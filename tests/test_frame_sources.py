@@ -0,0 +1,17 @@
+"""Creación de fuentes de frames desde la configuración"""
+import pytest
+
+from config import GestureConfig
+from frame_sources import create_frame_source
+
+
+@pytest.mark.parametrize("kind", ["video", "images"])
+def test_file_sources_require_input_path(kind, monkeypatch):
+    monkeypatch.setattr(GestureConfig, "FRAME_SOURCE_PATH", None)
+    with pytest.raises(ValueError, match="--input"):
+        create_frame_source(kind)
+
+
+def test_unknown_source_is_rejected():
+    with pytest.raises(ValueError, match="desconocida"):
+        create_frame_source("satelite", path="x")
@@ -0,0 +1,141 @@
+"""Clasificador aprendido de la forma de la mano y su combinación con los umbrales del detector"""
+import numpy as np
+import pytest
+
+from benchmark import synthetic_hand
+from gesture_classifier import GESTURE_CLASSES, NUM_FEATURES, GestureClassifier, hand_features
+from gesture_detector import WRIST, GestureDetector
+from train_classifier import train_mlp
+
+# Poses sintéticas de benchmark.py -> clase del clasificador ("point" no es ningún gesto)
+POSE_LABELS = {"palm": "palm", "fist": "fist", "cord": "cord", "point": "none"}
+
+
+def rotate(hand, degrees):
+    """Rotar la mano alrededor de la muñeca en el plano de la imagen"""
+    angle = np.radians(degrees)
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]], dtype=np.float32)
+    rotated = hand.copy()
+    wrist = hand[WRIST, :2]
+    rotated[:, :2] = (hand[:, :2] - wrist) @ rotation.T + wrist
+    return rotated
+
+
+def mirror(hand):
+    mirrored = hand.copy()
+    mirrored[:, 0] = 1.0 - mirrored[:, 0]
+    return mirrored
+
+
+def random_hands(count, rng):
+    """Manos sintéticas rotadas, escaladas y desplazadas con su etiqueta"""
+    poses = list(POSE_LABELS)
+    hands, labels = [], []
+    for _ in range(count):
+        pose = poses[rng.integers(len(poses))]
+        hand = synthetic_hand(pose, center=rng.uniform(0.3, 0.7, 2), scale=rng.uniform(0.5, 1.5),
+                              jitter=0.003, rng=rng)
+        hands.append(rotate(hand, rng.uniform(-60, 60)))
+        labels.append(POSE_LABELS[pose])
+    return np.stack(hands), np.array(labels)
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    rng = np.random.default_rng(0)
+    hands, labels = random_hands(800, rng)
+    classes = [name for name in GESTURE_CLASSES if name in set(labels)]
+    targets = np.array([classes.index(label) for label in labels])
+    return train_mlp(hand_features(hands, np.zeros(len(hands), dtype=bool)), targets, classes,
+                     hidden=16, epochs=40, seed=0)
+
+
+def test_features_are_invariant_to_position_scale_and_rotation():
+    hand = synthetic_hand("cord")
+    moved = synthetic_hand("cord", center=(0.3, 0.7), scale=1.4)
+    reference = hand_features(hand[None], [False])
+
+    assert reference.shape == (1, NUM_FEATURES)
+    np.testing.assert_allclose(hand_features(moved[None], [False]), reference, atol=1e-5)
+    np.testing.assert_allclose(hand_features(rotate(hand, 35)[None], [False]), reference, atol=1e-5)
+
+
+def test_left_hands_are_mirrored_onto_right_hands():
+    hand = synthetic_hand("palm")
+    np.testing.assert_allclose(hand_features(mirror(hand)[None], [True]), hand_features(hand[None], [False]),
+                               atol=1e-5)
+
+
+def test_trained_model_generalizes_to_rotated_hands(classifier):
+    hands, labels = random_hands(200, np.random.default_rng(1))
+    predicted = np.array(classifier.classes)[
+        classifier.probabilities(hand_features(hands, np.zeros(len(hands), dtype=bool))).argmax(axis=1)
+    ]
+    assert np.mean(predicted == labels) > 0.95
+
+
+def test_predict_batches_hands_and_mirrors_left(classifier):
+    fist = rotate(synthetic_hand("fist"), 40)
+    palm = synthetic_hand("palm", center=(0.3, 0.5))
+    assert classifier.predict([fist, mirror(palm)], ['Right', 'Left']) == ["fist", "palm"]
+    assert classifier.predict([], []) == []
+
+
+def test_low_confidence_is_none(classifier):
+    unsure = GestureClassifier(classifier.classes, classifier.mean, classifier.std, classifier.weights,
+                               classifier.biases, min_confidence=1.01)
+    assert unsure.predict([synthetic_hand("fist")], ['Right']) == ["none"]
+
+
+def test_save_and_load_round_trip(classifier, tmp_path):
+    path = tmp_path / "gestos.npz"
+    classifier.save(path)
+    loaded = GestureClassifier.load(path, min_confidence=0.5)
+
+    assert loaded.classes == classifier.classes
+    assert loaded.min_confidence == 0.5
+    features = hand_features(np.stack([synthetic_hand(p) for p in POSE_LABELS]), [False] * len(POSE_LABELS))
+    np.testing.assert_allclose(loaded.probabilities(features), classifier.probabilities(features), atol=1e-6)
+
+
+def test_load_rejects_other_versions(classifier, tmp_path):
+    path = tmp_path / "viejo.npz"
+    classifier.save(path)
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays["version"] = np.array(99)
+    np.savez(path, **arrays)
+    with pytest.raises(ValueError):
+        GestureClassifier.load(path)
+
+
+def test_learned_shape_overrides_thresholds():
+    detector = GestureDetector()
+    learned = ("none", "palm", "fist", "cord", "gun", "peace")
+    # Una mano rotada que los umbrales no reconocen, pero el clasificador sí
+    result = detector.classify(rotate(synthetic_hand("fist"), 70), shape="fist", learned=learned)
+    assert result.is_fist
+    assert not (result.is_palm or result.is_cord or result.is_gun or result.is_peace)
+
+
+def test_shapes_missing_from_the_model_use_thresholds():
+    detector = GestureDetector()
+    learned = ("none", "palm", "fist", "cord")  # Modelo sin "gun" ni "peace"
+    result = detector.classify(synthetic_hand("cord"), shape="none", learned=learned)
+    assert not result.is_cord          # El modelo conoce cord y dijo "none"
+    assert result.is_peace             # peace no está en el modelo: umbrales
+    assert result.peace_direction is not None
+
+
+def test_cord_and_peace_can_both_hold_like_thresholds():
+    detector = GestureDetector()
+    learned = ("none", "palm", "fist", "cord", "gun", "peace")
+    hand = synthetic_hand("cord")
+
+    for shape in ("cord", "peace"):
+        result = detector.classify(hand, shape=shape, learned=learned)
+        assert result.is_cord and result.is_peace
+
+    # Otra forma aprendida descarta las dos
+    result = detector.classify(hand, shape="fist", learned=learned)
+    assert not (result.is_cord or result.is_peace)
@@ -0,0 +1,188 @@
+"""Motor declarativo de gestos alimentado con frames sintéticos"""
+from types import SimpleNamespace
+
+import pytest
+
+from gesture_engine import GestureEngine, GestureFrame, GestureRule, Step
+
+
+def hand(**flags):
+    """Mano sintética: solo los atributos que usan los predicados de estas pruebas"""
+    defaults = {'is_palm': False, 'is_fist': False, 'direction': None}
+    defaults.update(flags)
+    return SimpleNamespace(**defaults)
+
+
+def frame(**flags):
+    return GestureFrame([hand(**flags)])
+
+
+def palm(f):
+    return f.single.is_palm
+
+
+def fist(f):
+    return f.single.is_fist
+
+
+def direction(f):
+    return f.single.direction
+
+
+def one_hand(f):
+    return f.single is not None
+
+
+class Recorder:
+    """Acción que registra los eventos y devuelve `result`"""
+
+    def __init__(self, result="ok"):
+        self.result = result
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+        return self.result
+
+
+def run(engine, frames, start=0.0, dt=0.1):
+    """Alimentar el motor con (frame) cada `dt` segundos; devuelve los eventos por frame"""
+    return [engine.update(f, start + i * dt) for i, f in enumerate(frames)]
+
+
+def test_rule_without_steps_is_rejected():
+    with pytest.raises(ValueError):
+        GestureRule("vacia", [], Recorder())
+
+
+def test_duplicate_rule_names_are_rejected():
+    engine = GestureEngine([GestureRule("a", [Step(fist)], Recorder())])
+    with pytest.raises(ValueError):
+        engine.add(GestureRule("a", [Step(palm)], Recorder()))
+
+
+def test_step_requires_consecutive_frames():
+    action = Recorder()
+    engine = GestureEngine([GestureRule("puño", [Step(fist, frames=3)], action)])
+
+    results = run(engine, [frame(is_fist=True)] * 2 + [frame()] + [frame(is_fist=True)] * 3)
+
+    assert [len(events) for events in results] == [0, 0, 0, 0, 0, 1]
+    assert len(action.events) == 1
+
+
+def test_step_requires_hold_time():
+    action = Recorder()
+    engine = GestureEngine([GestureRule("palma", [Step(palm, hold=0.5)], action)])
+
+    # Frames cada 0.1 s: el paso empieza en t=0 y se cumple en t=0.5
+    results = run(engine, [frame(is_palm=True)] * 7)
+
+    assert [len(events) for events in results] == [0, 0, 0, 0, 0, 1, 0]
+    assert action.events[0].debounce == pytest.approx(0.5)
+
+
+def test_sequence_waits_for_next_step_and_breaks_on_started_step():
+    action = Recorder()
+    rule = GestureRule("play_pause", [Step(palm, hold=0.2), Step(fist)], action, guard=one_hand)
+    engine = GestureEngine([rule])
+
+    # Palma sostenida, luego frames neutros (el puño todavía no empezó) y el puño
+    run(engine, [frame(is_palm=True)] * 3 + [frame()] * 2 + [frame(is_fist=True)])
+    assert [event.name for event in action.events] == ["play_pause"]
+
+    # Palma cortada antes del hold: vuelve al primer paso y el puño no dispara
+    run(engine, [frame(is_palm=True), frame(), frame(is_fist=True)], start=10.0)
+    assert len(action.events) == 1
+    assert rule.state == (0, 0)
+
+
+def test_guard_resets_sequence():
+    action = Recorder()
+    rule = GestureRule("play_pause", [Step(palm, hold=0.2), Step(fist)], action, guard=one_hand)
+    engine = GestureEngine([rule])
+
+    run(engine, [frame(is_palm=True)] * 3)
+    assert rule.index == 1
+    engine.update(GestureFrame([]), 0.3)
+    assert rule.state == (0, 0)
+    engine.update(frame(is_fist=True), 0.4)
+    assert not action.events
+
+
+def test_cooldown_is_shared_within_group():
+    first, second, other = Recorder(), Recorder(), Recorder()
+    engine = GestureEngine([
+        GestureRule("siguiente", [Step(fist)], first, cooldown=1.0, group="media"),
+        GestureRule("play", [Step(palm)], second, cooldown=1.0, group="media"),
+        GestureRule("otro", [Step(palm)], other, cooldown=1.0),
+    ])
+
+    engine.update(frame(is_fist=True), 0.0)
+    engine.update(frame(is_palm=True), 0.5)  # Mismo grupo en cooldown; otro grupo dispara
+    assert len(first.events) == 1
+    assert not second.events
+    assert len(other.events) == 1
+
+    engine.update(frame(is_palm=True), 1.0)  # Cooldown cumplido: la regla lista dispara
+    assert len(second.events) == 1
+
+
+def test_completed_sequence_waits_for_cooldown():
+    blocker, action = Recorder(), Recorder()
+    engine = GestureEngine([
+        GestureRule("play_pause", [Step(palm, hold=0.2), Step(fist)], action, cooldown=2.0, group="media"),
+        GestureRule("otro", [Step(fist)], blocker, cooldown=2.0, group="media"),
+    ])
+
+    # "otro" dispara en t=0; play_pause se completa en t=0.4 y espera lista hasta que pasa el cooldown
+    engine.update(frame(is_fist=True), 0.0)
+    run(engine, [frame(is_palm=True)] * 3 + [frame(is_fist=True)] * 20, start=0.1)
+    assert len(blocker.events) == 1
+    assert len(action.events) == 1
+    assert 2.0 <= action.events[0].timestamp < 2.15
+
+
+def test_ready_rule_repeats_last_step_after_a_break():
+    action = Recorder()
+    blocker = GestureRule("otro", [Step(palm)], Recorder(), cooldown=5.0, group="media")
+    rule = GestureRule("pistola", [Step(direction, frames=3)], action, cooldown=5.0, group="media")
+    engine = GestureEngine([blocker, rule])
+
+    engine.update(frame(is_palm=True), 0.0)
+    run(engine, [frame(direction="left")] * 3, start=1.0)
+    assert rule.ready
+
+    # Se pierde el gesto durante el cooldown: un solo frame ruidoso después no debe disparar
+    engine.update(frame(), 4.0)
+    assert not rule.ready
+    engine.update(frame(direction="right"), 5.0)
+    assert not action.events
+
+    # Con los frames estables completos dispara con la dirección de esa racha
+    run(engine, [frame(direction="right")] * 2, start=5.1)
+    assert [event.value for event in action.events] == ["right"]
+
+
+def test_rejected_action_does_not_start_cooldown_and_retries():
+    action = Recorder(result=None)
+    other = Recorder()
+    rule = GestureRule("siguiente", [Step(fist, frames=2)], action, cooldown=2.0, group="media")
+    engine = GestureEngine([rule, GestureRule("play", [Step(palm)], other, cooldown=2.0, group="media")])
+
+    results = run(engine, [frame(is_fist=True)] * 3)
+    assert len(action.events) == 2  # Reintenta en cada frame mientras el paso se cumple
+    assert not any(results)         # Los disparos rechazados no se reportan
+    assert "media" not in engine.last_fire
+    assert rule.ready
+
+    # Sin cooldown en curso, otra regla del grupo puede disparar
+    engine.update(frame(is_palm=True), 0.3)
+    assert len(other.events) == 1
+
+    action.result = "ok"
+    engine.update(frame(is_fist=True), 2.4)
+    engine.update(frame(is_fist=True), 2.5)
+    assert action.events[-1].result == "ok"
+    assert engine.last_fire["media"] == pytest.approx(2.5)
+    assert rule.state == (0, 0)
@@ -0,0 +1,58 @@
+"""Anillo de frames en memoria compartida del pool de inferencia (sin lanzar workers)"""
+import numpy as np
+
+import inference_pool
+from inference_pool import InferencePool, SharedFrameRing, attach_shared_memory, frame_view
+
+
+def test_ring_views_share_one_segment_across_resolutions():
+    ring = SharedFrameRing(3, 64 * 48 * 3)
+    try:
+        worker = attach_shared_memory(ring.name)
+        try:
+            for frame_id, (height, width) in enumerate([(48, 64), (24, 32), (48, 64), (24, 32)]):
+                index, rgb = ring.slot(frame_id, height, width)
+                rgb[:] = np.arange(rgb.size, dtype=np.uint32).reshape(rgb.shape) % 251
+                seen = frame_view(worker, ring.slot_bytes, index, (height, width, 3))
+                assert index == frame_id % 3
+                assert np.array_equal(seen, rgb)
+        finally:
+            seen = None
+            worker.close()
+    finally:
+        rgb = None
+        ring.close()
+
+
+def test_attach_does_not_register_with_resource_tracker(monkeypatch):
+    ring = SharedFrameRing(1, 16)
+    registered = []
+    monkeypatch.setattr(inference_pool.resource_tracker, "register",
+                        lambda name, rtype: registered.append((name, rtype)))
+    try:
+        attach_shared_memory(ring.name).close()
+        assert registered == []
+    finally:
+        monkeypatch.undo()
+        ring.close()
+
+
+def test_pool_ring_is_only_recreated_when_it_grows():
+    # Solo la parte del pool que maneja el anillo (sin procesos de inferencia)
+    pool = InferencePool.__new__(InferencePool)
+    pool.slots = 3
+    pool.ring = None
+    try:
+        pool.reserve(1280, 720)
+        name = pool.ring.name
+        for width, height in [(640, 360), (320, 180), (640, 360), (1280, 720)]:
+            rgb = pool.buffer(7, width, height)
+            assert rgb.shape == (height, width, 3)
+            assert pool.frame_shape == (height, width, 3)
+            assert pool.ring.name == name
+        rgb = None
+
+        pool.buffer(0, 1920, 1080)
+        assert pool.ring.name != name
+    finally:
+        pool.ring.close()
@@ -0,0 +1,129 @@
+"""Grabación .glr: ida y vuelta, lotes de manos y reproducción con y sin clasificador"""
+import numpy as np
+import pytest
+
+import landmark_recording
+from benchmark import synthetic_face, synthetic_hand
+from config import GestureConfig
+from gesture_classifier import GESTURE_CLASSES, hand_features
+from landmark_recording import (
+    LandmarkRecorder, LandmarkRecording, ReplayClock, create_replay_controller, recording_shapes, replay,
+)
+from train_classifier import train_mlp
+
+FPS = 30.0
+
+
+def record(path, frames):
+    """Grabar [(hands, face)] a FPS fijos; hands = [(array, 'Left'/'Right'/otro)]"""
+    recorder = LandmarkRecorder(str(path), max_hands=2)
+    for index, (hands, face) in enumerate(frames):
+        recorder.write(index / FPS, [(points, hand_type, None) for points, hand_type in hands], face)
+    recorder.close()
+    return LandmarkRecording(str(path))
+
+
+def play_pause_session():
+    """Palma sostenida 1 s, puño 0.5 s y nada: un play/pause"""
+    palm = [([(synthetic_hand("palm", center=(0.3, 0.6)), 'Right')], None)] * 30
+    fist = [([(synthetic_hand("fist", center=(0.3, 0.6)), 'Right')], None)] * 15
+    return palm + fist + [([], None)] * 10
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Bloques chicos: la grabación y la clasificación cruzan varios bloques
+    monkeypatch.setattr(landmark_recording, "CHUNK_FRAMES", 4)
+
+
+@pytest.fixture(scope="module")
+def classifier_path(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    poses = {"palm": "palm", "fist": "fist", "cord": "cord", "point": "none"}
+    hands, labels = [], []
+    for _ in range(400):
+        pose = list(poses)[rng.integers(len(poses))]
+        hands.append(synthetic_hand(pose, center=rng.uniform(0.3, 0.7, 2), scale=rng.uniform(0.6, 1.4),
+                                    jitter=0.003, rng=rng))
+        labels.append(poses[pose])
+    classes = [name for name in GESTURE_CLASSES if name in set(labels)]
+    targets = np.array([classes.index(label) for label in labels])
+    model = train_mlp(hand_features(np.stack(hands), np.zeros(len(hands), dtype=bool)), targets, classes,
+                      hidden=16, epochs=40, seed=0)
+    path = tmp_path_factory.mktemp("modelo") / "gestos.npz"
+    model.save(path)
+    return str(path)
+
+
+def test_round_trip_preserves_frames(tmp_path, small_chunks):
+    left, right, other = (synthetic_hand(pose) for pose in ("palm", "fist", "cord"))
+    face = synthetic_face((0.5, 0.3), 10.0)
+    frames = [([(left, 'Left'), (right, 'Right')], face), ([(other, 'Desconocida')], None), ([], None)] * 3
+    recording = record(tmp_path / "sesion.glr", frames)
+
+    assert len(recording) == 9
+    for index, (timestamp, hands, read_face) in enumerate(recording):
+        expected_hands, expected_face = frames[index]
+        assert timestamp == pytest.approx(index / FPS)
+        assert [hand_type for _, hand_type, _ in hands] == [
+            hand_type if hand_type in ('Left', 'Right') else None for _, hand_type in expected_hands
+        ]
+        for (points, _, _), (expected, _) in zip(hands, expected_hands):
+            np.testing.assert_array_equal(points, expected)
+        if expected_face is None:
+            assert read_face is None
+        else:
+            np.testing.assert_allclose(read_face, expected_face)
+
+
+def test_hand_batch_matches_frames(tmp_path):
+    left, right = synthetic_hand("palm"), synthetic_hand("fist")
+    frames = [([(left, 'Left'), (right, 'Right')], None), ([], None), ([(right, 'Right')], None)]
+    recording = record(tmp_path / "sesion.glr", frames)
+
+    frame_index, points, is_left = recording.hand_batch(1)
+    assert frame_index.tolist() == [2]
+    np.testing.assert_array_equal(points[0], right)
+
+    frame_index, points, is_left = recording.hand_batch()
+    assert frame_index.tolist() == [0, 0, 2]
+    assert is_left.tolist() == [True, False, False]
+    np.testing.assert_array_equal(points, np.stack([left, right, right]))
+
+
+def test_recording_shapes_match_per_frame_predictions(tmp_path, classifier_path):
+    from gesture_classifier import GestureClassifier
+
+    classifier = GestureClassifier.load(classifier_path, min_confidence=0.6)
+    rng = np.random.default_rng(3)
+    poses = ("palm", "fist", "cord", "point")
+    frames = []
+    for _ in range(50):
+        count = rng.integers(3)
+        frames.append(([(synthetic_hand(poses[rng.integers(4)], center=rng.uniform(0.3, 0.7, 2)),
+                         ('Left', 'Right')[rng.integers(2)]) for _ in range(count)], None))
+    recording = record(tmp_path / "sesion.glr", frames)
+
+    expected = [classifier.predict([points for points, _, _ in hands], [hand_type for _, hand_type, _ in hands])
+                for _, hands, _ in recording]
+    assert list(recording_shapes(recording, classifier, chunk=7)) == expected
+
+
+def test_replay_fires_recorded_gesture(tmp_path):
+    recording = record(tmp_path / "sesion.glr", play_pause_session())
+    assert replay(recording.path) == {"play_pause": 1}
+
+
+def test_replay_with_classifier_uses_batched_shapes(tmp_path, classifier_path, monkeypatch):
+    recording = record(tmp_path / "sesion.glr", play_pause_session())
+    monkeypatch.setattr(GestureConfig, "GESTURE_CLASSIFIER_PATH", classifier_path)
+
+    clock = ReplayClock()
+    controller = create_replay_controller(clock)
+    predict = controller.gesture_classifier.predict
+    calls = []
+    monkeypatch.setattr(controller.gesture_classifier, "predict",
+                        lambda *args: calls.append(1) or predict(*args))
+
+    assert replay(recording.path, controller, clock) == {"play_pause": 1}
+    assert calls == []  # Ninguna pasada por frame: todo salió de recording_shapes
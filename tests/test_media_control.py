@@ -0,0 +1,174 @@
+"""MprisBackend contra un dbus-daemon privado con reproductores MPRIS simulados"""
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+jeepney = pytest.importorskip("jeepney")
+from jeepney import HeaderFields, MessageType, new_error, new_method_return  # noqa: E402
+from jeepney.bus_messages import message_bus  # noqa: E402
+from jeepney.io.blocking import open_dbus_connection  # noqa: E402
+
+from media_control import MPRIS_PREFIX, MprisBackend  # noqa: E402
+
+pytestmark = pytest.mark.skipif(shutil.which("dbus-daemon") is None, reason="dbus-daemon no está instalado")
+
+
+@pytest.fixture
+def session_bus(monkeypatch):
+    """dbus-daemon de sesión propio; DBUS_SESSION_BUS_ADDRESS apunta a él"""
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    address = daemon.stdout.readline().strip()
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", address)
+    yield address
+    daemon.terminate()
+    daemon.wait(timeout=5)
+
+
+class StubPlayer:
+    """Reproductor MPRIS mínimo en su propio hilo: registra los métodos recibidos
+
+    `failures` = cantidad de llamadas a métodos del reproductor que responden
+    con un error de D-Bus antes de empezar a responder bien.
+    """
+
+    def __init__(self, address, name, status="Paused", failures=0):
+        self.name = MPRIS_PREFIX + name
+        self.status = status
+        self.failures = failures
+        self.calls = []
+        self.connection = open_dbus_connection(bus=address)
+        self.connection.send_and_get_reply(message_bus.RequestName(self.name))
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _reply(self, message):
+        fields = message.header.fields
+        member = fields.get(HeaderFields.member)
+        if fields.get(HeaderFields.interface) == "org.freedesktop.DBus.Properties":
+            return new_method_return(message, "v", (("s", self.status),))
+        self.calls.append(member)
+        if self.failures:
+            self.failures -= 1
+            return new_error(message, "org.mpris.MediaPlayer2.Error.Failed", "s", ("falla simulada",))
+        return new_method_return(message)
+
+    def _serve(self):
+        while self.running:
+            try:
+                message = self.connection.receive(timeout=0.05)
+            except TimeoutError:
+                continue
+            if message.header.message_type == MessageType.method_call:
+                self.connection.send(self._reply(message))
+        # Soltar el nombre esperando la respuesta: al volver de stop() el bus ya no lo tiene
+        self.connection.send_and_get_reply(message_bus.ReleaseName(self.name))
+        self.connection.close()
+
+    def stop(self):
+        self.running = False
+        self.thread.join(timeout=5)
+
+
+@pytest.fixture
+def players(session_bus):
+    started = []
+
+    def start(name, **kwargs):
+        player = StubPlayer(session_bus, name, **kwargs)
+        started.append(player)
+        return player
+
+    yield start
+    for player in started:
+        if player.running:
+            player.stop()
+
+
+def count_lookups(backend, monkeypatch):
+    """Contar las búsquedas de reproductor (ListNames) que hace el backend"""
+    lookups = []
+    find_player = backend.find_player
+
+    def counted():
+        lookups.append(1)
+        return find_player()
+
+    monkeypatch.setattr(backend, "find_player", counted)
+    return lookups
+
+
+def test_prefers_playing_player_and_caches_it(players, monkeypatch):
+    paused = players("vlc")
+    playing = players("spotify", status="Playing")
+    backend = MprisBackend()
+    try:
+        assert backend.player.bus_name == playing.name
+        lookups = count_lookups(backend, monkeypatch)
+
+        assert backend.send("next")
+        assert backend.send("play_pause")
+        assert playing.calls == ["Next", "PlayPause"]
+        assert paused.calls == []
+        assert lookups == []  # Las llamadas usan el reproductor en caché
+    finally:
+        backend.close()
+
+
+def test_preferred_player_wins(players):
+    players("spotify", status="Playing")
+    preferred = players("vlc")
+    backend = MprisBackend(preferred_player="vlc")
+    try:
+        assert backend.player.bus_name == preferred.name
+    finally:
+        backend.close()
+
+
+def test_retries_once_after_player_disappears(players, monkeypatch):
+    first = players("spotify", status="Playing")
+    second = players("vlc")
+    backend = MprisBackend()
+    try:
+        assert backend.player.bus_name == first.name
+        first.stop()
+        lookups = count_lookups(backend, monkeypatch)
+
+        assert backend.send("previous")
+        assert second.calls == ["Previous"]
+        assert backend.player.bus_name == second.name
+        assert len(lookups) == 1
+    finally:
+        backend.close()
+
+
+def test_gives_up_after_one_retry(players, monkeypatch):
+    player = players("spotify", failures=2)
+    backend = MprisBackend()
+    try:
+        lookups = count_lookups(backend, monkeypatch)
+        assert not backend.send("stop")
+        assert player.calls == ["Stop", "Stop"]
+        assert len(lookups) == 1
+        assert backend.player is None  # La caché queda vacía para la próxima acción
+
+        assert backend.send("stop")
+        assert backend.player.bus_name == player.name
+    finally:
+        backend.close()
+
+
+def test_no_players_left(players):
+    player = players("spotify")
+    backend = MprisBackend()
+    try:
+        player.stop()
+        assert not backend.send("next")
+        assert backend.player is None
+    finally:
+        backend.close()
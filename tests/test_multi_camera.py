@@ -0,0 +1,96 @@
+"""EventMerger (orden, duplicados entre cámaras y dueño del volumen) y backends que reenvían eventos"""
+import queue
+
+import pytest
+
+from multi_camera import CameraEvent, EventMerger, ForwardMediaBackend, ForwardVolumeBackend
+
+
+def media(camera, action, timestamp):
+    return CameraEvent(camera, "media", action, timestamp)
+
+
+def volume(camera, percent, timestamp):
+    return CameraEvent(camera, "volume", percent, timestamp)
+
+
+def summary(events):
+    return [(event.camera, event.kind, event.value) for event in events]
+
+
+def test_events_are_held_and_released_in_capture_order():
+    merger = EventMerger(dedup_window=1.0, reorder_delay=0.1)
+    # La cámara 1 infiere más lento: su evento llega después aunque su frame se capturó antes
+    merger.push(media(0, "next", 10.00))
+    merger.push(media(1, "play_pause", 9.98))
+
+    assert merger.pop_ready(10.05) == []
+    assert merger.wait_time(10.05) == pytest.approx(0.03)
+    assert summary(merger.pop_ready(10.1)) == [(1, "media", "play_pause"), (0, "media", "next")]
+    assert merger.wait_time(10.1) == pytest.approx(0.1)
+
+
+def test_same_action_from_another_camera_is_a_duplicate():
+    merger = EventMerger(dedup_window=1.0, reorder_delay=0.1)
+    # Mismo gesto visto por las dos cámaras; la segunda lo entrega 80 ms más tarde
+    merger.push(media(0, "next", 5.00))
+    merger.push(media(1, "next", 5.01))
+    merger.push(media(1, "previous", 5.02))
+
+    assert summary(merger.flush()) == [(0, "media", "next"), (1, "media", "previous")]
+    assert merger.duplicates == 1
+    assert merger.accepted == 2
+
+
+def test_duplicate_detection_uses_capture_time_even_when_late():
+    merger = EventMerger(dedup_window=0.5, reorder_delay=0.1)
+    merger.push(media(0, "next", 5.00))
+    assert len(merger.pop_ready(5.2)) == 1
+
+    # Llega después de liberar el primero, pero su frame es del mismo instante
+    merger.push(media(1, "next", 4.99))
+    assert merger.pop_ready(5.3) == []
+    assert merger.duplicates == 1
+
+
+def test_repeats_outside_window_or_from_same_camera_are_kept():
+    merger = EventMerger(dedup_window=1.0, reorder_delay=0.1)
+    merger.push(media(0, "next", 1.0))
+    merger.push(media(0, "next", 1.5))   # Misma cámara: lo limita su propio cooldown
+    merger.push(media(1, "next", 2.6))   # Otra cámara fuera de la ventana
+    assert len(merger.flush()) == 3
+    assert merger.duplicates == 0
+
+
+def test_volume_belongs_to_one_camera_until_it_pauses():
+    merger = EventMerger(reorder_delay=0.1, volume_timeout=0.3)
+    for i in range(5):
+        merger.push(volume(0, 40 + i, 1.0 + 0.1 * i))
+        merger.push(volume(1, 80, 1.05 + 0.1 * i))
+    merger.push(volume(1, 75, 1.8))  # La cámara 0 dejó de enviar hace más de 0.3 s
+
+    accepted = merger.flush()
+    assert [event.value for event in accepted] == [40, 41, 42, 43, 44, 75]
+    assert merger.volume_owner == 1
+    assert merger.duplicates == 5
+
+
+def test_forward_backends_stamp_events_with_capture_time():
+    events = queue.Queue()
+    frame_time = [12.5]
+    media_backend = ForwardMediaBackend(2, events, frame_time=lambda: frame_time[0])
+    volume_backend = ForwardVolumeBackend(2, events, frame_time=lambda: frame_time[0])
+
+    assert media_backend.send("next")
+    frame_time[0] = 12.6
+    assert volume_backend.set_volume(55)
+
+    first, second = events.get_nowait(), events.get_nowait()
+    assert (first.camera, first.kind, first.value, first.timestamp) == (2, "media", "next", 12.5)
+    assert (second.kind, second.value, second.timestamp) == ("volume", 55, 12.6)
+
+
+def test_forward_backends_without_frame_time_use_send_time():
+    events = queue.Queue()
+    ForwardMediaBackend(0, events).send("stop")
+    assert events.get_nowait().timestamp > 0
@@ -0,0 +1,279 @@
+"""PulseAudioBackend contra un servidor PulseAudio simulado (y un null-sink real si hay servidor)"""
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import volume_control
+from volume_control import PulseAudioBackend, PulseLoopStop
+
+
+def wait_for(condition, timeout=2.0):
+    """Esperar a que `condition()` sea verdadera (los eventos llegan en otro hilo)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class FakeSink:
+    def __init__(self, name, index, volume):
+        self.name = name
+        self.index = index
+        self.volume = SimpleNamespace(value_flat=volume)
+
+
+class FakePulseServer:
+    """Sinks, sink por defecto y eventos como los entrega pulsectl (facility, t, index)"""
+
+    def __init__(self):
+        self.sinks = {}
+        self.default_sink_name = None
+        self.up = True
+        self.clients = []
+        self.lock = threading.Lock()
+
+    def add_sink(self, name, volume=0.5):
+        with self.lock:
+            sink = FakeSink(name, len(self.sinks) + 1, volume)
+            self.sinks[name] = sink
+        self.emit('sink', 'new', sink.index)
+        return sink
+
+    def remove_sink(self, name):
+        with self.lock:
+            sink = self.sinks.pop(name)
+        self.emit('sink', 'remove', sink.index)
+
+    def set_default(self, name):
+        self.default_sink_name = name
+        self.emit('server', 'change', None)
+
+    def set_volume(self, name, volume):
+        """Cambio de volumen desde otra aplicación"""
+        sink = self.sinks[name]
+        sink.volume.value_flat = volume
+        self.emit('sink', 'change', sink.index)
+
+    def emit(self, facility, t, index):
+        event = SimpleNamespace(facility=facility, t=t, index=index)
+        for client in list(self.clients):
+            client.events.put(event)
+
+    def go_down(self):
+        self.up = False
+        for client in list(self.clients):
+            client.events.put(None)
+
+    def connect(self, name):
+        if not self.up:
+            raise ConnectionRefusedError("servidor caído")
+        client = FakePulseClient(self, name)
+        self.clients.append(client)
+        return client
+
+
+class FakePulseClient:
+    """Cliente con la parte de la API de pulsectl.Pulse que usa el backend"""
+
+    def __init__(self, server, name):
+        self.server = server
+        self.name = name
+        self.events = queue.Queue()
+        self.callback = None
+        self.mask = ()
+        self.closed = False
+
+    def _check(self):
+        if self.closed or not self.server.up:
+            raise ConnectionError("conexión perdida")
+
+    def server_info(self):
+        self._check()
+        return SimpleNamespace(default_sink_name=self.server.default_sink_name)
+
+    def get_sink_by_name(self, name):
+        self._check()
+        return self.server.sinks[name]
+
+    def volume_set_all_chans(self, sink, volume):
+        self._check()
+        self.server.set_volume(sink.name, volume)
+
+    def mute(self, sink, muted):
+        self._check()
+
+    def event_mask_set(self, *facilities):
+        self.mask = facilities
+
+    def event_callback_set(self, callback):
+        self.callback = callback
+
+    def event_listen(self, timeout=None):
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            self._check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = self.events.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if event is None:  # event_listen_stop() o servidor caído
+                self._check()
+                return
+            if event.facility not in self.mask:
+                continue
+            try:
+                self.callback(event)
+            except PulseLoopStop:
+                return
+
+    def event_listen_stop(self):
+        self.events.put(None)
+
+    def close(self):
+        self.closed = True
+        if self in self.server.clients:
+            self.server.clients.remove(self)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(volume_control, "PULSE_RECONNECT_MIN_DELAY", 0.01)
+    monkeypatch.setattr(volume_control, "PULSE_RECONNECT_MAX_DELAY", 0.05)
+    server = FakePulseServer()
+    server.add_sink("speakers", 0.3)
+    server.add_sink("headphones", 0.8)
+    server.default_sink_name = "speakers"
+    return server
+
+
+@pytest.fixture
+def backend(server):
+    backend = PulseAudioBackend(connect=server.connect)
+    yield backend
+    backend.close()
+
+
+def test_resolves_default_sink_and_sets_volume(server, backend):
+    assert backend.sink_name == "speakers"
+    assert backend.get_volume() == 30
+
+    assert backend.set_volume(45)
+    assert server.sinks["speakers"].volume.value_flat == pytest.approx(0.45)
+    assert backend.get_volume() == 45
+
+
+def test_external_volume_change_updates_cache(server, backend):
+    server.set_volume("speakers", 0.62)
+    assert wait_for(lambda: backend.get_volume() == 62)
+
+    # Cambios en otros sinks no tocan la caché
+    server.set_volume("headphones", 0.1)
+    time.sleep(0.05)
+    assert backend.get_volume() == 62
+
+
+def test_follows_default_sink_changes(server, backend):
+    server.set_default("headphones")
+    assert wait_for(lambda: backend.sink_name == "headphones")
+    assert backend.get_volume() == 80
+
+    assert backend.set_volume(20)
+    assert server.sinks["headphones"].volume.value_flat == pytest.approx(0.2)
+    assert server.sinks["speakers"].volume.value_flat == pytest.approx(0.3)
+
+
+def test_removed_sink_is_resolved_again(server, backend):
+    server.default_sink_name = "headphones"  # El servidor mueve el defecto al quitar el sink
+    server.remove_sink("speakers")
+    assert wait_for(lambda: backend.sink_name == "headphones")
+    assert backend.get_volume() == 80
+
+
+def test_configured_sink_ignores_default_changes(server):
+    backend = PulseAudioBackend(sink_name="headphones", connect=server.connect)
+    try:
+        server.set_default("headphones")
+        server.set_default("speakers")
+        time.sleep(0.05)
+        assert backend.sink_name == "headphones"
+    finally:
+        backend.close()
+
+
+def test_reconnects_with_backoff_after_server_restart(server, backend):
+    server.go_down()
+    assert not backend.set_volume(40)
+    time.sleep(0.1)  # Varios reintentos fallidos mientras el servidor está caído
+    assert backend.reconnects == 0
+
+    server.default_sink_name = "headphones"
+    server.up = True
+    assert wait_for(lambda: backend.reconnects == 1)
+    assert backend.sink_name == "headphones"
+    assert backend.get_volume() == 80
+
+    # Los clientes nuevos siguen escuchando eventos y aplicando volumen
+    server.set_volume("headphones", 0.55)
+    assert wait_for(lambda: backend.get_volume() == 55)
+    assert backend.set_volume(35)
+    assert server.sinks["headphones"].volume.value_flat == pytest.approx(0.35)
+
+
+def test_close_interrupts_backoff(server, monkeypatch):
+    monkeypatch.setattr(volume_control, "PULSE_RECONNECT_MIN_DELAY", 30.0)
+    backend = PulseAudioBackend(connect=server.connect)
+    server.go_down()
+    time.sleep(0.05)
+
+    start = time.monotonic()
+    backend.close()
+    assert time.monotonic() - start < 1.0
+    assert not backend.thread.is_alive()
+
+
+def test_injected_clients_without_connect(server):
+    pulse, listener = server.connect("app"), server.connect("app-events")
+    backend = PulseAudioBackend(pulse=pulse, listener=listener, connect=server.connect)
+    try:
+        server.set_volume("speakers", 0.9)
+        assert wait_for(lambda: backend.get_volume() == 90)
+    finally:
+        backend.close()
+    assert pulse.closed and listener.closed
+
+
+@pytest.fixture
+def null_sink():
+    """Null-sink temporal en el servidor PulseAudio/PipeWire real (se omite si no hay)"""
+    pulsectl = pytest.importorskip("pulsectl")
+    try:
+        pulse = pulsectl.Pulse("gesture-control-tests")
+    except Exception as e:
+        pytest.skip(f"sin servidor PulseAudio: {e}")
+    module = pulse.module_load("module-null-sink", "sink_name=gesture_control_test")
+    try:
+        yield pulse, "gesture_control_test"
+    finally:
+        pulse.module_unload(module)
+        pulse.close()
+
+
+def test_null_sink_round_trip(null_sink):
+    pulse, name = null_sink
+    backend = PulseAudioBackend(sink_name=name)
+    try:
+        assert backend.set_volume(30)
+        assert pulse.get_sink_by_name(name).volume.value_flat == pytest.approx(0.3, abs=0.01)
+
+        pulse.volume_set_all_chans(pulse.get_sink_by_name(name), 0.7)
+        assert wait_for(lambda: backend.get_volume() == 70)
+    finally:
+        backend.close()
@@ -0,0 +1,149 @@
+"""
+Entrenar el clasificador de gestos a partir de grabaciones de landmarks
+
+Cada grabación (.glr de main.py --record) se etiqueta completa con un gesto:
+se graba una sesión manteniendo ese gesto (con la mano rotada, más cerca y
+más lejos) y todas sus manos pasan a ser ejemplos de esa clase. Las
+etiquetas son none (manos sin ningún gesto; conviene incluirla), palm,
+fist, cord, gun y peace. Las formas que el modelo no aprendió se siguen
+detectando con los umbrales de GestureDetector: para MEDIA_GESTURE_MODE
+"gun" o "peace" hay que grabar esa clase si se quiere que la decida el modelo.
+
+Uso:
+    python train_classifier.py none=otras.glr palm=palma.glr fist=puno.glr cord=cordon.glr \
+        gun=pistola.glr peace=paz.glr -o gestos.npz
+    python main.py --classifier gestos.npz
+
+La red se entrena con descenso por gradiente (Adam) en NumPy puro; una
+parte de los ejemplos se reserva para medir la precisión por clase.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from gesture_classifier import GESTURE_CLASSES, GestureClassifier, hand_features
+from landmark_recording import LandmarkRecording, HANDEDNESS_LABELS
+
+
+def load_labeled_hands(specs):
+    """Manos de las grabaciones ETIQUETA=ARCHIVO -> (manos (N, 21, 3), izquierdas (N,), etiquetas (N,))"""
+    hands, left, labels = [], [], []
+    for spec in specs:
+        label, sep, path = spec.partition("=")
+        if not sep or label not in GESTURE_CLASSES:
+            raise ValueError(f"Se esperaba ETIQUETA=ARCHIVO con ETIQUETA en {', '.join(GESTURE_CLASSES)}: {spec}")
+        recording = LandmarkRecording(path)
+        present = np.asarray(recording.hand_present)
+        hands.append(np.asarray(recording.hands)[present])
+        left.append(np.asarray(recording.handedness)[present] == HANDEDNESS_LABELS.index('Left'))
+        labels += [label] * int(present.sum())
+        print(f"📂 {path}: {int(present.sum())} manos de '{label}'")
+    if not labels:
+        raise ValueError("Las grabaciones no tienen manos")
+    return np.concatenate(hands), np.concatenate(left), np.array(labels)
+
+
+def train_mlp(features, targets, classes, hidden=32, epochs=200, batch_size=128, learning_rate=0.01,
+              weight_decay=1e-4, seed=0):
+    """Entrenar una red de una capa oculta con entropía cruzada y Adam; devuelve un GestureClassifier"""
+    rng = np.random.default_rng(seed)
+    mean = features.mean(axis=0)
+    std = features.std(axis=0) + 1e-3
+    x_all = (features - mean) / std
+    n, n_features = x_all.shape
+    n_classes = len(classes)
+
+    # Inicialización He para la capa ReLU
+    params = [
+        rng.normal(0.0, np.sqrt(2.0 / n_features), (n_features, hidden)).astype(np.float32),
+        np.zeros(hidden, dtype=np.float32),
+        rng.normal(0.0, np.sqrt(1.0 / hidden), (hidden, n_classes)).astype(np.float32),
+        np.zeros(n_classes, dtype=np.float32),
+    ]
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    beta1, beta2, step = 0.9, 0.999, 0
+
+    for epoch in range(epochs):
+        order = rng.permutation(n)
+        for start in range(0, n, batch_size):
+            batch = order[start:start + batch_size]
+            x, y = x_all[batch], targets[batch]
+            w1, b1, w2, b2 = params
+
+            hidden_pre = x @ w1 + b1
+            hidden_out = np.maximum(hidden_pre, 0.0)
+            logits = hidden_out @ w2 + b2
+            logits -= logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+            # Gradiente de la entropía cruzada media (+ decaimiento de pesos en las matrices)
+            d_logits = probabilities
+            d_logits[np.arange(len(batch)), y] -= 1.0
+            d_logits /= len(batch)
+            d_hidden = (d_logits @ w2.T) * (hidden_pre > 0)
+            grads = [x.T @ d_hidden + weight_decay * w1, d_hidden.sum(axis=0),
+                     hidden_out.T @ d_logits + weight_decay * w2, d_logits.sum(axis=0)]
+
+            step += 1
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                p -= (learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-8)).astype(p.dtype)
+
+    return GestureClassifier(classes, mean, std, params[0::2], params[1::2])
+
+
+def print_accuracy(classifier, features, labels, title):
+    """Precisión global y por clase"""
+    predicted = np.array(classifier.classes)[classifier.probabilities(features).argmax(axis=1)]
+    print(f"📊 {title}: {np.mean(predicted == labels):.1%} ({len(labels)} manos)")
+    for name in classifier.classes:
+        mask = labels == name
+        if mask.any():
+            print(f"   {name:<8}{np.mean(predicted[mask] == name):>8.1%}{int(mask.sum()):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrenar el clasificador de gestos con grabaciones etiquetadas")
+    parser.add_argument("recordings", nargs="+", metavar="ETIQUETA=ARCHIVO",
+                        help=f"Grabación .glr y el gesto que contiene ({', '.join(GESTURE_CLASSES)})")
+    parser.add_argument("-o", "--output", default="gestos.npz", help="Archivo del modelo (.npz)")
+    parser.add_argument("--hidden", type=int, default=32, help="Neuronas de la capa oculta")
+    parser.add_argument("--epochs", type=int, default=200, help="Pasadas sobre los datos de entrenamiento")
+    parser.add_argument("--validation", type=float, default=0.2, help="Fracción de manos reservada para validar")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla (mezcla y pesos iniciales)")
+    args = parser.parse_args()
+
+    try:
+        hands, left, labels = load_labeled_hands(args.recordings)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    classes = [name for name in GESTURE_CLASSES if name in set(labels)]
+    targets = np.array([classes.index(label) for label in labels])
+    features = hand_features(hands, left)
+
+    # Separar validación
+    order = np.random.default_rng(args.seed).permutation(len(labels))
+    n_validation = int(len(labels) * args.validation)
+    validation, train = order[:n_validation], order[n_validation:]
+
+    classifier = train_mlp(features[train], targets[train], classes, hidden=args.hidden, epochs=args.epochs,
+                           seed=args.seed)
+    print_accuracy(classifier, features[train], labels[train], "Entrenamiento")
+    if n_validation:
+        print_accuracy(classifier, features[validation], labels[validation], "Validación")
+
+    classifier.save(args.output)
+    print(f"💾 Modelo guardado: {args.output} (clases: {', '.join(classes)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Caché de la capa de UI (paneles de texto)
+
+Cada panel se dibuja directamente sobre una capa del tamaño del frame, sin
+reservar imágenes nuevas. Los paneles estáticos (instrucciones) se dibujan
+una vez por resolución y los dinámicos (información) solo cuando cambia su
+texto.
+En cada frame se copian sobre la imagen solo los rectángulos de los paneles
+(son opacos), en lugar de decenas de llamadas a getTextSize/rectangle/putText
+o de una copia con máscara de todo el frame.
+"""
+import cv2
+import numpy as np
+
+# Estilo común de los paneles (gris oscuro, borde gris, texto verde claro)
+PANEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+PANEL_FONT_SCALE = 0.4
+PANEL_THICKNESS = 1
+PANEL_LINE_HEIGHT = 18
+PANEL_PADDING = 8
+PANEL_BACKGROUND = (40, 40, 40)
+PANEL_BORDER = (100, 100, 100)
+PANEL_TEXT_COLOR = (150, 255, 150)   # Verde claro
+PANEL_WARNING_COLOR = (100, 100, 255)  # Rojo claro
+
+
+def panel_size(lines):
+    """(ancho, alto) de un panel, sin contar el píxel extra del borde"""
+    max_width = max(
+        (cv2.getTextSize(line, PANEL_FONT, PANEL_FONT_SCALE, PANEL_THICKNESS)[0][0] for line in lines),
+        default=0,
+    )
+    return max_width + PANEL_PADDING * 2, len(lines) * PANEL_LINE_HEIGHT + PANEL_PADDING * 2
+
+
+def draw_panel(image, lines, position, colors=None):
+    """Dibujar un panel (fondo, borde y una línea de texto por fila) sobre una imagen BGR
+
+    Se dibuja en el lugar, sin imágenes intermedias. Devuelve el rectángulo
+    (x1, y1, x2, y2) ocupado, recortado a los bordes de la imagen.
+    """
+    colors = colors or [PANEL_TEXT_COLOR] * len(lines)
+    panel_width, panel_height = panel_size(lines)
+    height, width = image.shape[:2]
+    x, y = position
+
+    # cv2.rectangle incluye el último píxel: el panel mide un píxel más por lado
+    x1, y1 = max(x, 0), max(y, 0)
+    x2, y2 = min(x + panel_width + 1, width), min(y + panel_height + 1, height)
+    if x1 >= x2 or y1 >= y2:
+        return (0, 0, 0, 0)
+
+    image[y1:y2, x1:x2] = PANEL_BACKGROUND
+    cv2.rectangle(image, (x, y), (x + panel_width, y + panel_height), PANEL_BORDER, 1)
+    for i, (line, color) in enumerate(zip(lines, colors)):
+        text_y = y + PANEL_PADDING + (i + 1) * PANEL_LINE_HEIGHT - 3
+        cv2.putText(image, line, (x + PANEL_PADDING, text_y), PANEL_FONT, PANEL_FONT_SCALE, color, PANEL_THICKNESS)
+    return (x1, y1, x2, y2)
+
+
+class OverlayCache:
+    """Capa BGR del tamaño del frame con los paneles ya dibujados"""
+
+    def __init__(self):
+        self.size = None
+        self.layer = None   # BGR de los paneles
+        self.panels = {}    # nombre -> (clave del contenido, (x1, y1, x2, y2) en la capa)
+        self.renders = 0    # Paneles dibujados (para comprobar que la caché funciona)
+
+    def _ensure_size(self, width, height):
+        if self.size == (width, height):
+            return
+        # Nueva resolución: capa vacía, todos los paneles se vuelven a dibujar
+        self.size = (width, height)
+        self.layer = np.zeros((height, width, 3), dtype=np.uint8)
+        self.panels = {}
+
+    def panel(self, name, lines, position, colors=None, frame_size=None):
+        """Declarar el contenido de un panel; solo se vuelve a dibujar si cambió
+
+        `frame_size` = (ancho, alto) del frame sobre el que se compondrá.
+        """
+        self._ensure_size(*frame_size)
+        key = (tuple(lines), tuple(colors) if colors else None, position)
+        cached = self.panels.get(name)
+        if cached is not None and cached[0] == key:
+            return
+
+        if cached is not None:
+            self._clear(cached[1])
+
+        rect = draw_panel(self.layer, lines, position, colors)
+        self.renders += 1
+        self.panels[name] = (key, rect)
+
+    def remove(self, name):
+        cached = self.panels.pop(name, None)
+        if cached is not None:
+            self._clear(cached[1])
+
+    def _clear(self, rect):
+        x1, y1, x2, y2 = rect
+        self.layer[y1:y2, x1:x2] = 0
+
+    def composite(self, frame):
+        """Copiar los rectángulos de los paneles sobre el frame (en el lugar)"""
+        h, w = frame.shape[:2]
+        if self.size != (w, h):
+            return frame
+        for _, (x1, y1, x2, y2) in self.panels.values():
+            frame[y1:y2, x1:x2] = self.layer[y1:y2, x1:x2]
+        return frame
@@ -6,78 +6,77 @@ try:
 except ImportError:
     PYCAW_AVAILABLE = False
 
+try:
+    import pulsectl
+    from pulsectl import PulseLoopStop
+    PULSECTL_AVAILABLE = True
+except ImportError:
+    PULSECTL_AVAILABLE = False
+
+    class PulseLoopStop(Exception):
+        """Sustituto de pulsectl.PulseLoopStop para clientes inyectados sin pulsectl"""
+
 import subprocess
+import sys
+import threading
 import time
+from config import GestureConfig
 
-class VolumeControl:
-    def __init__(self):
-        self.current_volume = 50
-        self.is_muted = False
-        self.last_mute_toggle = 0
-        self.mute_cooldown = 1.0  # 1 segundo entre toggles
-        
-        if PYCAW_AVAILABLE:
-            try:
-                devices = AudioUtilities.GetSpeakers()
-                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-                self.volume = cast(interface, POINTER(IAudioEndpointVolume))
-                self.vol_range = self.volume.GetVolumeRange()
-                self.min_vol = self.vol_range[0]
-                self.max_vol = self.vol_range[1]
-                self.pycaw_enabled = True
-            except:
-                self.pycaw_enabled = False
-        else:
-            self.pycaw_enabled = False
+# Espera entre reintentos de conexión con PulseAudio (se duplica hasta el máximo)
+PULSE_RECONNECT_MIN_DELAY = 0.5
+PULSE_RECONNECT_MAX_DELAY = 10.0
 
-    def map_distance_to_volume(self, distance, min_dist=0.05, max_dist=0.8):
-        """Mapear distancia entre manos a porcentaje de volumen"""
-        if distance < min_dist:
-            distance = min_dist
-        if distance > max_dist:
-            distance = max_dist
-        
-        volume_percent = ((distance - min_dist) / (max_dist - min_dist)) * 100
-        return int(volume_percent)
+
+class VolumeBackend:
+    """Interfaz común de los backends de volumen (valores en porcentaje 0-100)"""
+
+    name = "base"
 
     def set_volume(self, vol_percent):
-        """Establecer volumen del sistema"""
-        self.current_volume = max(0, min(100, vol_percent))
-        print(f"🔊 Volumen: {self.current_volume}%")  # Debug
-        
-        if self.pycaw_enabled:
-            try:
-                vol_db = self.min_vol + (self.current_volume / 100) * (self.max_vol - self.min_vol)
-                self.volume.SetMasterVolumeLevel(vol_db, None)
-                return True
-            except Exception as e:
-                print(f"❌ Error pycaw: {e}")
-                return self._fallback_volume_control(self.current_volume)
-        else:
-            return self._fallback_volume_control(self.current_volume)
+        """Aplicar el volumen; devuelve True si se pudo"""
+        raise NotImplementedError
 
-    def toggle_mute(self):
-        """Alternar mute/unmute con cooldown"""
-        current_time = time.time()
-        if current_time - self.last_mute_toggle > self.mute_cooldown:
-            self.is_muted = not self.is_muted
-            self.last_mute_toggle = current_time
-            
-            if self.pycaw_enabled:
-                try:
-                    self.volume.SetMute(self.is_muted, None)
-                except:
-                    self._fallback_mute()
-            else:
-                self._fallback_mute()
-            
-            return True
-        return False
+    def get_volume(self):
+        """Volumen actual en porcentaje, o None si el backend no lo conoce"""
+        return None
+
+    def set_mute(self, muted):
+        """Silenciar o reactivar el audio"""
+        raise NotImplementedError
+
+    def close(self):
+        """Liberar conexiones o hilos del backend"""
+        pass
 
-    def _fallback_volume_control(self, volume):
+
+class NullVolumeBackend(VolumeBackend):
+    """Sin backend de audio: solo recuerda el último valor (también para reproducir grabaciones)"""
+
+    name = "none"
+
+    def __init__(self):
+        self.volume = None
+
+    def set_volume(self, vol_percent):
+        self.volume = vol_percent
+        return True
+
+    def get_volume(self):
+        return self.volume
+
+    def set_mute(self, muted):
+        pass
+
+
+class PowerShellBackend(VolumeBackend):
+    """Control de volumen alternativo en Windows usando PowerShell y nircmd"""
+
+    name = "powershell"
+
+    def set_volume(self, vol_percent):
         """Control de volumen alternativo usando PowerShell"""
         try:
-            print(f"🔊 Fallback volumen: {volume}%")
+            print(f"🔊 Fallback volumen: {vol_percent}%")
             # Usar PowerShell para controlar volumen
             cmd = f'''
             Add-Type -TypeDefinition @"
@@ -90,31 +89,318 @@ class VolumeControl:
             "@
             $speakers = (New-Object -ComObject MMDeviceEnumerator).GetDefaultAudioEndpoint(0, 1)
             $volume = $speakers.Activate([System.Type]::GetTypeFromCLSID("5CDF2C82-841E-4546-9722-0CF74078229A"), $null, $null)
-            $volume.SetMasterVolumeLevelScalar({volume / 100}, [System.Guid]::Empty)
+            $volume.SetMasterVolumeLevelScalar({vol_percent / 100}, [System.Guid]::Empty)
             '''
-            subprocess.run(['powershell', '-Command', cmd], 
+            subprocess.run(['powershell', '-Command', cmd],
                          check=False, capture_output=True, timeout=3)
             return True
         except Exception as e:
             print(f"❌ Error fallback volumen: {e}")
             return False
 
-    def _fallback_mute(self):
+    def set_mute(self, muted):
         """Mute alternativo usando nircmd"""
         try:
-            subprocess.run(['nircmd.exe', 'mutesysvolume', '2'], 
+            subprocess.run(['nircmd.exe', 'mutesysvolume', '2'],
                          check=False, capture_output=True)
         except:
             pass
 
-    def get_current_volume(self):
-        """Obtener volumen actual"""
-        if self.pycaw_enabled:
+
+class PycawBackend(VolumeBackend):
+    """Volumen de Windows vía pycaw/COM, con PowerShell como respaldo ante errores"""
+
+    name = "pycaw"
+
+    def __init__(self):
+        if not PYCAW_AVAILABLE:
+            raise RuntimeError("pycaw no está instalado")
+
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        self.volume = cast(interface, POINTER(IAudioEndpointVolume))
+        self.vol_range = self.volume.GetVolumeRange()
+        self.min_vol = self.vol_range[0]
+        self.max_vol = self.vol_range[1]
+        self.fallback = PowerShellBackend()
+
+    def set_volume(self, vol_percent):
+        try:
+            vol_db = self.min_vol + (vol_percent / 100) * (self.max_vol - self.min_vol)
+            self.volume.SetMasterVolumeLevel(vol_db, None)
+            return True
+        except Exception as e:
+            print(f"❌ Error pycaw: {e}")
+            return self.fallback.set_volume(vol_percent)
+
+    def get_volume(self):
+        try:
+            current_vol_db = self.volume.GetMasterVolumeLevel()
+        except:
+            return None
+        volume_percent = ((current_vol_db - self.min_vol) / (self.max_vol - self.min_vol)) * 100
+        return max(0, min(100, int(volume_percent)))
+
+    def set_mute(self, muted):
+        try:
+            self.volume.SetMute(muted, None)
+        except:
+            self.fallback.set_mute(muted)
+
+
+class PulseAudioBackend(VolumeBackend):
+    """Volumen en Linux vía PulseAudio (o PipeWire con pipewire-pulse)
+
+    Mantiene una conexión persistente al servidor para los cambios de volumen
+    (sin lanzar pactl/amixer en cada actualización) y una segunda conexión en
+    un hilo que escucha los eventos del sink, así get_volume() responde desde
+    un valor en caché que el propio servidor mantiene al día.
+
+    `pulse` y `listener` permiten inyectar clientes ya abiertos (por ejemplo
+    contra un servidor de prueba o un null-sink); `sink_name` elige el sink
+    (por defecto, el sink por defecto del servidor). Si se pierde la conexión
+    (servidor reiniciado, cambio de sesión) el hilo de eventos reconecta
+    ambos clientes con `connect(nombre)` y una espera creciente, y vuelve a
+    resolver el sink por defecto y el volumen en caché. Sin `sink_name`
+    también sigue los cambios del sink por defecto (eventos del servidor) y
+    la desaparición del sink en uso. Los clientes inyectados detienen
+    event_listen() con volume_control.PulseLoopStop (el de pulsectl si está
+    instalado).
+    """
+
+    name = "pulse"
+
+    def __init__(self, sink_name=None, pulse=None, listener=None, client_name="multimedia-gesture-control",
+                 connect=None):
+        if connect is None and PULSECTL_AVAILABLE:
+            connect = pulsectl.Pulse
+        if pulse is None and connect is None:
+            raise RuntimeError("pulsectl no está instalado")
+
+        self.client_name = client_name
+        self.connect = connect
+        self.requested_sink = sink_name
+        self.lock = threading.Lock()
+        self.pulse = pulse if pulse is not None else self.connect(client_name)
+        self._resolve_sink(self.pulse)
+        self.sink_changed = False   # Cambió el volumen del sink en uso
+        self.sink_stale = False     # Hay que volver a resolver el sink (por defecto nuevo o sink eliminado)
+
+        # Conexión dedicada a eventos: pulsectl no permite otras llamadas mientras escucha
+        self.listener = listener if listener is not None else self.connect(f"{client_name}-events")
+        self.running = True
+        self.wakeup = threading.Event()  # Corta la espera entre reintentos al cerrar
+        self.reconnects = 0
+        self.thread = threading.Thread(target=self._event_loop, name="pulse-volume-events", daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def _sink_volume_percent(sink):
+        return max(0, min(100, int(round(sink.volume.value_flat * 100))))
+
+    def _resolve_sink(self, pulse):
+        """Sink configurado (o el sink por defecto actual del servidor) y su volumen en caché"""
+        sink_name = self.requested_sink or pulse.server_info().default_sink_name
+        sink = pulse.get_sink_by_name(sink_name)
+        with self.lock:
+            self.sink_name = sink_name
+            self.sink = sink
+            self.cached_volume = self._sink_volume_percent(sink)
+
+    def set_volume(self, vol_percent):
+        with self.lock:
+            pulse, sink = self.pulse, self.sink
+        try:
+            pulse.volume_set_all_chans(sink, vol_percent / 100)
+        except Exception as e:
+            print(f"❌ Error PulseAudio: {e}")
+            return False
+        with self.lock:
+            self.cached_volume = vol_percent
+        return True
+
+    def get_volume(self):
+        with self.lock:
+            return self.cached_volume
+
+    def set_mute(self, muted):
+        with self.lock:
+            pulse, sink = self.pulse, self.sink
+        try:
+            pulse.mute(sink, muted)
+        except Exception as e:
+            print(f"❌ Error PulseAudio: {e}")
+
+    def _on_event(self, event):
+        """Callback de pulsectl: solo marca qué cambió y corta la espera"""
+        if event.facility == 'server':
+            if self.requested_sink is None:
+                self.sink_stale = True  # Puede haber cambiado el sink por defecto
+                raise PulseLoopStop
+        elif event.index == self.sink.index:
+            if event.t == 'remove':
+                self.sink_stale = True
+                raise PulseLoopStop
+            if event.t == 'change':
+                self.sink_changed = True
+                raise PulseLoopStop
+
+    def _listen(self):
+        """Escuchar eventos hasta cerrar; las excepciones indican una conexión perdida"""
+        self.listener.event_mask_set('sink', 'server')
+        self.listener.event_callback_set(self._on_event)
+        while self.running:
+            self.listener.event_listen(timeout=1.0)
+            if self.sink_stale:
+                self.sink_stale = self.sink_changed = False
+                previous = self.sink_name
+                self._resolve_sink(self.listener)
+                if self.sink_name != previous:
+                    print(f"🔊 Sink de PulseAudio: {self.sink_name}")
+            elif self.sink_changed:
+                self.sink_changed = False
+                sink = self.listener.get_sink_by_name(self.sink_name)
+                with self.lock:
+                    self.cached_volume = self._sink_volume_percent(sink)
+
+    def _reconnect(self):
+        """Abrir clientes nuevos y volver a resolver el sink; reemplaza los anteriores"""
+        if self.connect is None:
+            raise RuntimeError("pulsectl no está instalado")
+        pulse = self.connect(self.client_name)
+        listener = None
+        try:
+            listener = self.connect(f"{self.client_name}-events")
+            self._resolve_sink(pulse)
+        except Exception:
+            for client in (pulse, listener):
+                if client is not None:
+                    client.close()
+            raise
+        with self.lock:
+            old = (self.pulse, self.listener)
+            self.pulse, self.listener = pulse, listener
+        for client in old:
             try:
-                current_vol_db = self.volume.GetMasterVolumeLevel()
-                volume_percent = ((current_vol_db - self.min_vol) / (self.max_vol - self.min_vol)) * 100
-                self.current_volume = max(0, min(100, int(volume_percent)))
-            except:
+                client.close()
+            except Exception:
                 pass
-        
+        self.reconnects += 1
+        print(f"🔊 Reconectado a PulseAudio (sink: {self.sink_name})")
+
+    def _event_loop(self):
+        delay = PULSE_RECONNECT_MIN_DELAY
+        while self.running:
+            try:
+                self._listen()
+                return
+            except Exception as e:
+                if not self.running:
+                    return
+                print(f"❌ Error escuchando eventos de PulseAudio: {e}")
+
+            # Conexión perdida: reintentar con espera creciente hasta reconectar o cerrar
+            while self.running:
+                self.wakeup.wait(delay)
+                if not self.running:
+                    return
+                try:
+                    self._reconnect()
+                    delay = PULSE_RECONNECT_MIN_DELAY
+                    break
+                except Exception as e:
+                    delay = min(delay * 2, PULSE_RECONNECT_MAX_DELAY)
+                    print(f"❌ No se pudo reconectar con PulseAudio ({e}); reintento en {delay:.1f} s")
+
+    def close(self):
+        self.running = False
+        self.wakeup.set()
+        try:
+            self.listener.event_listen_stop()
+        except Exception:
+            pass
+        self.thread.join(timeout=2.0)
+        self.listener.close()
+        self.pulse.close()
+
+
+def create_volume_backend(name=None):
+    """Crear el backend de volumen configurado ("auto" elige según la plataforma)"""
+    name = name or GestureConfig.VOLUME_BACKEND
+
+    if name == "pycaw":
+        return PycawBackend()
+    if name == "powershell":
+        return PowerShellBackend()
+    if name == "pulse":
+        return PulseAudioBackend(sink_name=GestureConfig.VOLUME_SINK)
+    if name == "none":
+        return NullVolumeBackend()
+    if name != "auto":
+        raise ValueError(f"Backend de volumen desconocido: {name}")
+
+    if sys.platform == "win32":
+        try:
+            return PycawBackend()
+        except Exception:
+            return PowerShellBackend()
+
+    if PULSECTL_AVAILABLE:
+        try:
+            return PulseAudioBackend(sink_name=GestureConfig.VOLUME_SINK)
+        except Exception as e:
+            print(f"❌ No se pudo conectar con PulseAudio: {e}")
+
+    print("⚠️ Sin backend de volumen disponible: el control de volumen no tendrá efecto")
+    return NullVolumeBackend()
+
+
+class VolumeControl:
+    def __init__(self, backend=None):
+        self.current_volume = 50
+        self.is_muted = False
+        self.last_mute_toggle = 0
+        self.mute_cooldown = 1.0  # 1 segundo entre toggles
+
+        self.backend = backend if backend is not None else create_volume_backend()
+
+    def map_distance_to_volume(self, distance, min_dist=0.05, max_dist=0.8):
+        """Mapear distancia entre manos a porcentaje de volumen"""
+        if distance < min_dist:
+            distance = min_dist
+        if distance > max_dist:
+            distance = max_dist
+
+        volume_percent = ((distance - min_dist) / (max_dist - min_dist)) * 100
+        return int(volume_percent)
+
+    def set_volume(self, vol_percent):
+        """Establecer volumen del sistema"""
+        self.current_volume = max(0, min(100, vol_percent))
+        print(f"🔊 Volumen: {self.current_volume}%")  # Debug
+
+        return self.backend.set_volume(self.current_volume)
+
+    def toggle_mute(self):
+        """Alternar mute/unmute con cooldown"""
+        current_time = time.time()
+        if current_time - self.last_mute_toggle > self.mute_cooldown:
+            self.is_muted = not self.is_muted
+            self.last_mute_toggle = current_time
+
+            self.backend.set_mute(self.is_muted)
+
+            return True
+        return False
+
+    def get_current_volume(self):
+        """Obtener volumen actual"""
+        volume = self.backend.get_volume()
+        if volume is not None:
+            self.current_volume = volume
+
         return self.current_volume
+
+    def close(self):
+        """Liberar el backend de audio"""
+        self.backend.close()